@@ -0,0 +1,110 @@
+"""Benchmark of the peak memory used by each stage of a streaming knitout-to-DAT conversion.
+
+A synthetic stockinette program is generated for each requested size and converted with Knitout_to_Dat_Converter.stream_dat_file.
+The peak memory traced while parsing and executing the program and while rasterizing, encoding, and writing the DAT file is reported separately.
+
+Streaming conversion is partial: only rasterizing, encoding, and writing have a memory bound.
+The benchmark fails if the peak memory of those stages grows by more than --tolerance MB from the shortest to the longest program.
+Parsing and executing the program is not bounded. Its peak grows linearly with the length of the program and is only reported.
+
+Usage:
+    python benchmarks/streaming_memory.py
+    python benchmarks/streaming_memory.py --instructions 10000 100000 1000000 --width 100
+
+Converting a hundred thousand instructions takes a few minutes and a million takes tens of minutes, because tracing memory makes the conversion several times slower.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from knitout_to_dat_python.dat_file_structure.knitout_to_dat_converter import (
+    Knitout_to_Dat_Converter,
+)
+
+
+def write_synthetic_program(knitout_filename: str, instruction_count: int, width: int = 100, carrier: int = 3) -> None:
+    """Write a stockinette knitout program with approximately the given number of needle instructions.
+
+    The program is written one line at a time so that generating it does not depend on its length.
+
+    Args:
+        knitout_filename (str): The path of the knitout file to write.
+        instruction_count (int): The number of knit instructions in the program, rounded up to a whole number of rows.
+        width (int, optional): The number of needles in each row. Defaults to 100.
+        carrier (int, optional): The carrier used to knit the program. Defaults to 3.
+    """
+    with open(knitout_filename, 'w') as knitout_file:
+        knitout_file.write(";!knitout-2\n;;Machine: SWG091N2\n;;Gauge: 15\n;;Position: Right\n;;Carriers: 1 2 3 4 5 6 7 8 9 10\n")
+        knitout_file.write(f"inhook {carrier}\n")
+        for needle in range(width - 1, -1, -2):
+            knitout_file.write(f"tuck - f{needle} {carrier}\n")
+        for needle in range(width % 2, width, 2):
+            knitout_file.write(f"tuck + f{needle} {carrier}\n")
+        knitout_file.write(f"releasehook {carrier}\n")
+        for row in range(-(-instruction_count // width)):
+            if row % 2 == 0:
+                knitout_file.writelines(f"knit - f{needle} {carrier}\n" for needle in range(width - 1, -1, -1))
+            else:
+                knitout_file.writelines(f"knit + f{needle} {carrier}\n" for needle in range(width))
+        knitout_file.write(f"outhook {carrier}\n")
+
+
+def measure_stages(knitout_filename: str, dat_filename: str) -> tuple[float, float, float]:
+    """Convert a knitout file by streaming and measure the peak memory of each stage.
+
+    Args:
+        knitout_filename (str): The path of the knitout file to convert.
+        dat_filename (str): The path of the DAT file to write.
+
+    Returns:
+        tuple[float, float, float]:
+            The peak MB traced while parsing and executing the program,
+            the peak MB traced while rasterizing, encoding, and writing above the memory held after execution,
+            and the total time of the conversion in seconds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        converter = Knitout_to_Dat_Converter(knitout_filename, dat_filename)
+        gc.collect()
+        executed, execution_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        converter.stream_dat_file()
+        _current, streaming_peak = tracemalloc.get_traced_memory()
+    duration = time.perf_counter() - start
+    tracemalloc.stop()
+    return execution_peak / 1e6, (streaming_peak - executed) / 1e6, duration
+
+
+def main() -> None:
+    """Run the benchmark for each requested program size and print a table of the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--instructions', type=int, nargs='+', default=[10_000, 100_000], help="The number of knit instructions in each synthetic program.")
+    arg_parser.add_argument('--width', type=int, default=100, help="The number of needles in each row of the synthetic programs.")
+    arg_parser.add_argument('--tolerance', type=float, default=1.0, help="The growth in MB of the raster+write peak allowed from the shortest to the longest program.")
+    args = arg_parser.parse_args()
+    print(f"{'instructions':>12} {'parse+execute MB':>17} {'raster+write MB':>16} {'seconds':>9}")
+    streaming_peaks: dict[int, float] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for instruction_count in sorted(args.instructions):
+            knitout_filename = os.path.join(directory, f"stockinette_{instruction_count}.k")
+            write_synthetic_program(knitout_filename, instruction_count, args.width)
+            execution_peak, streaming_peak, duration = measure_stages(knitout_filename, os.path.join(directory, f"stockinette_{instruction_count}.dat"))
+            print(f"{instruction_count:>12} {execution_peak:>17.1f} {streaming_peak:>16.1f} {duration:>9.1f}")
+            streaming_peaks[instruction_count] = streaming_peak
+            os.remove(knitout_filename)
+    shortest, longest = min(streaming_peaks), max(streaming_peaks)
+    growth = streaming_peaks[longest] - streaming_peaks[shortest]
+    if growth > args.tolerance:
+        raise SystemExit(f"The raster+write peak grew by {growth:.1f} MB from {shortest} to {longest} instructions, more than the {args.tolerance} MB tolerance")
+    print(f"The raster+write peak grew by {growth:.1f} MB from {shortest} to {longest} instructions, within the {args.tolerance} MB tolerance.")
+
+
+if __name__ == '__main__':
+    main()
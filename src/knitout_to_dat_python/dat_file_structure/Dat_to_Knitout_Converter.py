@@ -3,7 +3,7 @@
 This module provides functionality to convert Shima Seiki DAT files back into knitout instructions.
 It handles the complete reverse conversion pipeline including DAT file reading, pixel decoding, instruction reconstruction, and knitout file generation.
 """
-import struct
+from typing import BinaryIO
 
 from knitout_interpreter.knitout_execution_structures.Carriage_Pass import Carriage_Pass
 from knitout_interpreter.knitout_operations.carrier_instructions import (
@@ -21,6 +21,9 @@ from virtual_knitting_machine.Knitting_Machine import Knitting_Machine
 from knitout_to_dat_python.dat_file_structure.dat_codes.dat_file_color_codes import (
     WIDTH_SPECIFIER,
 )
+from knitout_to_dat_python.dat_file_structure.dat_file_reader import (
+    Dat_File_Reader,
+)
 from knitout_to_dat_python.dat_file_structure.raster_carriage_passes.Pixel_Carriage_Pass_Converter import (
     Pixel_Carriage_Pass_Converter,
 )
@@ -33,18 +36,18 @@ class Dat_to_Knitout_Converter:
     It handles the complete reverse conversion pipeline including pixel decoding, instruction reconstruction, and knitout file generation.
     """
 
-    def __init__(self, dat_filename: str, pattern_buffer: int = 4):
+    def __init__(self, dat_filename: str | bytes | bytearray | memoryview | BinaryIO, pattern_buffer: int = 4):
         """Initialize a Dat_to_Knitout_Converter.
 
         Args:
-            dat_filename (str): Path to the input DAT file to convert.
+            dat_filename (str | bytes | bytearray | memoryview | BinaryIO): Path to the input DAT file to convert, or the content of a DAT file as a bytes-like object or binary file-like object.
             pattern_buffer (int, optional): Buffer space around the pattern. Defaults to 4.
 
         Raises:
             ValueError: If DAT file format is invalid or cannot be processed.
             AssertionError: If raster pattern width exceeds expected pattern width.
         """
-        self._dat_filename: str = dat_filename
+        self._dat_filename: str | bytes | bytearray | memoryview | BinaryIO = dat_filename
         self._pixels: list[list[int]] = []
         self._read_dat_file_to_pixels()
         self._trim_pixels_to_pattern()
@@ -199,62 +202,12 @@ class Dat_to_Knitout_Converter:
             ValueError: If the DAT file has invalid magic numbers or format issues.
             AssertionError: If the number of decoded rows doesn't match the expected height from the header.
         """
-        with open(self._dat_filename, 'rb') as f:
-            # Read header (0x200 bytes)
-            header_data = f.read(0x200)
-
-            # Parse header using little-endian format
-            x_min, y_min, x_max, y_max, magic1 = struct.unpack('<HHHHH', header_data[:10])
-            magic2 = struct.unpack('<H', header_data[16:18])[0]
-
-            # Validate magic numbers
-            if magic1 != 1000 or magic2 != 1000:
-                raise ValueError(f"Invalid DAT file: magic numbers are {magic1}, {magic2}, expected 1000, 1000")
-
-            # Calculate dimensions
-            width = x_max - x_min + 1
-            height = y_max - y_min + 1
-
-            print(f"DAT file dimensions: {width} x {height}")
-
-            # Skip palette data (0x400 bytes = 3*256 RGB values)
-            _palette_data = f.read(0x400)
-
-            # Read run-length encoded data
-            rle_data = f.read()
-
-            # Decode run-length encoded data
-            self._pixels = []
-            current_row = []
-            pixels_in_current_row = 0
-
-            i = 0
-            while i < len(rle_data):
-                if i + 1 >= len(rle_data):
-                    break
+        with Dat_File_Reader(self._dat_filename) as reader:
+            print(f"DAT file dimensions: {reader.width} x {reader.height}")
+            self._pixels = reader.read_rows()
 
-                color_index = rle_data[i]
-                run_length = rle_data[i + 1]
-
-                # Add pixels to current row
-                for _ in range(run_length):
-                    current_row.append(color_index)
-                    pixels_in_current_row += 1
-
-                    # If we've filled a complete row, start a new one
-                    if pixels_in_current_row == width:
-                        self._pixels.append(current_row)
-                        current_row = []
-                        pixels_in_current_row = 0
-
-                i += 2
-
-            # Add any remaining partial row
-            if current_row:
-                self._pixels.append(current_row)
-
-            # Validate we got the expected number of rows
-            assert len(self._pixels) == height, f"Expected {height} rows, got {len(self._pixels)} rows"
+        # Validate we got the expected number of rows
+        assert len(self._pixels) == reader.height, f"Expected {reader.height} rows, got {len(self._pixels)} rows"
 
     def write_knitout(self, knitout_filename: str) -> None:
         """Write the knitout gathered from the dat file to the given knitout filename.
@@ -264,7 +217,13 @@ class Dat_to_Knitout_Converter:
         Args:
             knitout_filename (str): The name of the knitout file to write.
         """
-        header_lines = get_machine_header(Knitting_Machine())
         with open(knitout_filename, 'w') as f:
-            f.writelines([str(h) for h in header_lines])
-            f.writelines([str(e) for e in self._executed_instructions])
+            f.write(self.get_knitout())
+
+    def get_knitout(self) -> str:
+        """
+        Returns:
+            str: The knitout program gathered from the dat file, including machine headers.
+        """
+        header_lines = get_machine_header(Knitting_Machine())
+        return "".join([str(h) for h in header_lines] + [str(e) for e in self._executed_instructions])
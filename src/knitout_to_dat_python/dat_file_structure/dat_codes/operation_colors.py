@@ -6,6 +6,7 @@ The color codes represent different types of needle operations including knit, t
 from __future__ import annotations
 
 from enum import Enum
+from types import MappingProxyType
 
 from knitout_interpreter.knitout_operations.kick_instruction import Kick_Instruction
 from knitout_interpreter.knitout_operations.knitout_instruction import (
@@ -90,27 +91,8 @@ class Operation_Color(Enum):
         Raises:
             AssertionError: If the operation color code is not recognized or mapped to any operation type.
         """
-        if self is Operation_Color.TUCK_FRONT or self is Operation_Color.TUCK_BACK:
-            return Tuck_Instruction, None
-        elif self is Operation_Color.KNIT_FRONT or self is Operation_Color.KNIT_BACK:
-            return Knit_Instruction, None
-        elif self is Operation_Color.XFER_TO_BACK or self is Operation_Color.XFER_TO_FRONT:
-            return Xfer_Instruction, None
-        elif self is Operation_Color.SPLIT_TO_BACK or self is Operation_Color.SPLIT_TO_FRONT:
-            return Split_Instruction, None
-        elif self is Operation_Color.MISS_FRONT or self is Operation_Color.MISS_BACK:
-            return Miss_Instruction, None
-        elif self is Operation_Color.SOFT_MISS:
-            return Kick_Instruction, None
-        elif self is Operation_Color.KNIT_FRONT_KNIT_BACK:
-            return Knit_Instruction, Knit_Instruction
-        elif self is Operation_Color.TUCK_FRONT_TUCK_BACK:
-            return Tuck_Instruction, Tuck_Instruction
-        elif self is Operation_Color.TUCK_FRONT_KNIT_BACK:
-            return Tuck_Instruction, Knit_Instruction
-        elif self is Operation_Color.KNIT_FRONT_TUCK_BACK:
-            return Knit_Instruction, Tuck_Instruction
-        assert False, f"Couldn't identify operation type for {self}"
+        assert self._value_ in OPERATION_TYPES_BY_CODE, f"Couldn't identify operation type for {self}"
+        return OPERATION_TYPES_BY_CODE[self._value_]
 
     @property
     def is_front(self) -> bool:
@@ -119,7 +101,7 @@ class Operation_Color(Enum):
         Returns:
             bool: True if operation only occurs on front bed. False, otherwise.
         """
-        return self in [Operation_Color.KNIT_FRONT, Operation_Color.TUCK_FRONT, Operation_Color.MISS_FRONT, Operation_Color.SPLIT_TO_BACK, Operation_Color.XFER_TO_BACK]
+        return self._value_ in FRONT_OPERATION_CODES
 
     @property
     def is_back(self) -> bool:
@@ -128,7 +110,7 @@ class Operation_Color(Enum):
         Returns:
             bool: True if operation only occurs on back bed. False, otherwise.
         """
-        return self in [Operation_Color.KNIT_BACK, Operation_Color.TUCK_BACK, Operation_Color.MISS_BACK, Operation_Color.SPLIT_TO_FRONT, Operation_Color.XFER_TO_FRONT]
+        return self._value_ in BACK_OPERATION_CODES
 
     @property
     def can_convert_to_all_needle(self) -> bool:
@@ -137,7 +119,7 @@ class Operation_Color(Enum):
         Returns:
             bool: True if this operation can be converted to an all needle operation. False, otherwise.
         """
-        return self in [Operation_Color.KNIT_BACK, Operation_Color.KNIT_FRONT, Operation_Color.TUCK_BACK, Operation_Color.TUCK_FRONT]
+        return self._value_ in ALL_NEEDLE_CONVERTIBLE_CODES
 
     def can_be_opposite(self, other_color: Operation_Color) -> bool:
         """Check if two operations can be combined into an all needle operation.
@@ -148,8 +130,7 @@ class Operation_Color(Enum):
         Returns:
             bool: True if the two operations can be combined into an all needle operation, otherwise False.
         """
-        return (self.can_convert_to_all_needle and other_color.can_convert_to_all_needle and
-                ((self.is_front and other_color.is_back) or (self.is_back and other_color.is_front)))
+        return (self._value_, other_color._value_) in ALL_NEEDLE_CODES
 
     def get_all_needle(self, other_color: Operation_Color) -> Operation_Color | None:
         """Get the all-needle merged operation color from two operation colors.
@@ -161,29 +142,10 @@ class Operation_Color(Enum):
             Operation_Color | None: None if the operations cannot be combined for all needle knitting.
                 Otherwise, return a front-back knit/tuck operation for all-needle knitting.
         """
-        if not self.can_be_opposite(other_color):
+        all_needle_code = ALL_NEEDLE_CODES.get((self._value_, other_color._value_))
+        if all_needle_code is None:
             return None
-        if self.is_front:
-            if self is Operation_Color.KNIT_FRONT:
-                if other_color is Operation_Color.TUCK_BACK:
-                    return Operation_Color.KNIT_FRONT_TUCK_BACK
-                else:  # Other is knit back
-                    return Operation_Color.KNIT_FRONT_KNIT_BACK
-            else:  # Self is Tuck Front
-                if other_color is Operation_Color.TUCK_BACK:
-                    return Operation_Color.TUCK_FRONT_TUCK_BACK
-                else:  # other is knit back
-                    return Operation_Color.TUCK_FRONT_KNIT_BACK
-        elif self is Operation_Color.KNIT_BACK:  # Self is a back operation
-            if other_color is Operation_Color.TUCK_FRONT:
-                return Operation_Color.TUCK_FRONT_KNIT_BACK
-            else:  # other is Knit Front
-                return Operation_Color.KNIT_FRONT_KNIT_BACK
-        else:  # Self is Tuck Back
-            if other_color is Operation_Color.TUCK_FRONT:
-                return Operation_Color.TUCK_FRONT_TUCK_BACK
-            else:  # other is Knit Front
-                return Operation_Color.KNIT_FRONT_TUCK_BACK
+        return OPERATION_COLOR_BY_CODE[all_needle_code]
 
     def __str__(self) -> str:
         """Return string representation of the operation color.
@@ -232,17 +194,69 @@ class Operation_Color(Enum):
         Raises:
             ValueError: If no operation color corresponds to the given instruction type.
         """
-        if instruction.instruction_type == Knitout_Instruction_Type.Knit:
-            return Operation_Color.KNIT_FRONT if instruction.needle.is_front else Operation_Color.KNIT_BACK
-        elif instruction.instruction_type == Knitout_Instruction_Type.Tuck:
-            return Operation_Color.TUCK_FRONT if instruction.needle.is_front else Operation_Color.TUCK_BACK
-        elif instruction.instruction_type == Knitout_Instruction_Type.Miss:
-            if isinstance(instruction, Kick_Instruction):
-                return Operation_Color.SOFT_MISS
-            return Operation_Color.MISS_FRONT if instruction.needle.is_front else Operation_Color.MISS_BACK
-        elif instruction.instruction_type == Knitout_Instruction_Type.Split:
-            return Operation_Color.SPLIT_TO_BACK if instruction.needle.is_front else Operation_Color.SPLIT_TO_FRONT
-        elif instruction.instruction_type == Knitout_Instruction_Type.Xfer:
-            return Operation_Color.XFER_TO_BACK if instruction.needle.is_front else Operation_Color.XFER_TO_FRONT
-        else:
+        instruction_type = instruction.instruction_type
+        if instruction_type is Knitout_Instruction_Type.Miss and isinstance(instruction, Kick_Instruction):
+            return Operation_Color.SOFT_MISS
+        operation_color = OPERATION_COLOR_BY_INSTRUCTION.get((instruction_type, instruction.needle.is_front))
+        if operation_color is None:
             raise ValueError(f"No operation color corresponds to the instruction {instruction}.")
+        return operation_color
+
+
+# The lookup tables below are keyed by color code rather than by Operation_Color, because hashing an Operation_Color calls its __hash__ method.
+OPERATION_COLOR_BY_CODE: MappingProxyType[int, Operation_Color] = MappingProxyType({color.value: color for color in Operation_Color})
+"""MappingProxyType[int, Operation_Color]: The Operation_Color of each color code. Looking a code up here is much faster than calling Operation_Color(code)."""
+
+FRONT_OPERATION_CODES: frozenset[int] = frozenset(color.value for color in (Operation_Color.KNIT_FRONT, Operation_Color.TUCK_FRONT, Operation_Color.MISS_FRONT,
+                                                                            Operation_Color.SPLIT_TO_BACK, Operation_Color.XFER_TO_BACK))
+"""frozenset[int]: The color codes of operations that only occur on the front bed."""
+
+BACK_OPERATION_CODES: frozenset[int] = frozenset(color.value for color in (Operation_Color.KNIT_BACK, Operation_Color.TUCK_BACK, Operation_Color.MISS_BACK,
+                                                                           Operation_Color.SPLIT_TO_FRONT, Operation_Color.XFER_TO_FRONT))
+"""frozenset[int]: The color codes of operations that only occur on the back bed."""
+
+ALL_NEEDLE_CONVERTIBLE_CODES: frozenset[int] = frozenset(color.value for color in (Operation_Color.KNIT_FRONT, Operation_Color.KNIT_BACK,
+                                                                                   Operation_Color.TUCK_FRONT, Operation_Color.TUCK_BACK))
+"""frozenset[int]: The color codes of operations that can be combined with an operation on the opposite bed into an all needle operation."""
+
+ALL_NEEDLE_CODES: MappingProxyType[tuple[int, int], int] = MappingProxyType({
+    (front.value, back.value) if front_first else (back.value, front.value): all_needle.value
+    for front, back, all_needle in ((Operation_Color.KNIT_FRONT, Operation_Color.KNIT_BACK, Operation_Color.KNIT_FRONT_KNIT_BACK),
+                                    (Operation_Color.KNIT_FRONT, Operation_Color.TUCK_BACK, Operation_Color.KNIT_FRONT_TUCK_BACK),
+                                    (Operation_Color.TUCK_FRONT, Operation_Color.KNIT_BACK, Operation_Color.TUCK_FRONT_KNIT_BACK),
+                                    (Operation_Color.TUCK_FRONT, Operation_Color.TUCK_BACK, Operation_Color.TUCK_FRONT_TUCK_BACK))
+    for front_first in (True, False)})
+"""MappingProxyType[tuple[int, int], int]: The all needle color code that combines each pair of front and back color codes, in either order."""
+
+OPERATION_TYPES_BY_CODE: MappingProxyType[int, tuple[type, None | type]] = MappingProxyType({
+    Operation_Color.SOFT_MISS.value: (Kick_Instruction, None),
+    Operation_Color.MISS_FRONT.value: (Miss_Instruction, None),
+    Operation_Color.MISS_BACK.value: (Miss_Instruction, None),
+    Operation_Color.TUCK_FRONT.value: (Tuck_Instruction, None),
+    Operation_Color.TUCK_BACK.value: (Tuck_Instruction, None),
+    Operation_Color.KNIT_FRONT.value: (Knit_Instruction, None),
+    Operation_Color.KNIT_BACK.value: (Knit_Instruction, None),
+    Operation_Color.KNIT_FRONT_KNIT_BACK.value: (Knit_Instruction, Knit_Instruction),
+    Operation_Color.KNIT_FRONT_TUCK_BACK.value: (Knit_Instruction, Tuck_Instruction),
+    Operation_Color.TUCK_FRONT_KNIT_BACK.value: (Tuck_Instruction, Knit_Instruction),
+    Operation_Color.TUCK_FRONT_TUCK_BACK.value: (Tuck_Instruction, Tuck_Instruction),
+    Operation_Color.XFER_TO_BACK.value: (Xfer_Instruction, None),
+    Operation_Color.XFER_TO_FRONT.value: (Xfer_Instruction, None),
+    Operation_Color.SPLIT_TO_BACK.value: (Split_Instruction, None),
+    Operation_Color.SPLIT_TO_FRONT.value: (Split_Instruction, None),
+})
+"""MappingProxyType[int, tuple[type, None | type]]: The front and back operation types of each color code, as returned by Operation_Color.operation_types."""
+
+OPERATION_COLOR_BY_INSTRUCTION: MappingProxyType[tuple[Knitout_Instruction_Type, bool], Operation_Color] = MappingProxyType({
+    (Knitout_Instruction_Type.Knit, True): Operation_Color.KNIT_FRONT,
+    (Knitout_Instruction_Type.Knit, False): Operation_Color.KNIT_BACK,
+    (Knitout_Instruction_Type.Tuck, True): Operation_Color.TUCK_FRONT,
+    (Knitout_Instruction_Type.Tuck, False): Operation_Color.TUCK_BACK,
+    (Knitout_Instruction_Type.Miss, True): Operation_Color.MISS_FRONT,
+    (Knitout_Instruction_Type.Miss, False): Operation_Color.MISS_BACK,
+    (Knitout_Instruction_Type.Split, True): Operation_Color.SPLIT_TO_BACK,
+    (Knitout_Instruction_Type.Split, False): Operation_Color.SPLIT_TO_FRONT,
+    (Knitout_Instruction_Type.Xfer, True): Operation_Color.XFER_TO_BACK,
+    (Knitout_Instruction_Type.Xfer, False): Operation_Color.XFER_TO_FRONT,
+})
+"""MappingProxyType[tuple[Knitout_Instruction_Type, bool], Operation_Color]: The operation color of each needle instruction type on the front (True) or back (False) bed."""
@@ -6,6 +6,7 @@ along with utility functions for converting between different representations an
 from __future__ import annotations
 
 from enum import Enum
+from types import MappingProxyType
 
 from knitout_interpreter.knitout_execution_structures.Carriage_Pass import Carriage_Pass
 from virtual_knitting_machine.machine_components.carriage_system.Carriage_Pass_Direction import (
@@ -582,6 +583,44 @@ class Presser_Setting_Color(Enum):
             return int(Presser_Setting_Color.Off)
 
 
+def _carrier_ids_to_code(carrier_ids: tuple[int, ...]) -> int:
+    """Encode the ids of one or two carriers as the integer used in DAT files.
+
+    Args:
+        carrier_ids (tuple[int, ...]): The ids of the carriers, leading carrier first.
+
+    Returns:
+        int: The carrier ids concatenated with the leading carrier first, with special handling for carrier 10.
+    """
+    if len(carrier_ids) == 1:
+        return carrier_ids[0]
+    first_carrier, second_carrier = carrier_ids
+    if first_carrier == 10:
+        return int(f"10{second_carrier}")
+    elif second_carrier == 10 and first_carrier != 1:
+        return int(f"{first_carrier}0")
+    else:
+        return int(f"{first_carrier}{second_carrier}")
+
+
+_CARRIER_IDS = range(1, 11)  # The ids of the ten carriers of the knitting machine.
+
+CARRIER_SET_CODES: MappingProxyType[tuple[int, ...], int] = MappingProxyType({
+    carrier_ids: _carrier_ids_to_code(carrier_ids)
+    for carrier_ids in [(carrier,) for carrier in _CARRIER_IDS] + [(first, second) for first in _CARRIER_IDS for second in _CARRIER_IDS if first != second]})
+"""MappingProxyType[tuple[int, ...], int]: The DAT integer of every carrier set of one or two carriers, keyed by the carrier ids with the leading carrier first."""
+
+CARRIER_SETS_BY_CODE: MappingProxyType[int, Yarn_Carrier_Set | None] = MappingProxyType({
+    0: None, NO_CARRIERS: None,
+    # Codes of a carrier paired with itself are never written but have always been read as that carrier.
+    **{int(f"{carrier}{carrier}"): Yarn_Carrier_Set([carrier]) for carrier in _CARRIER_IDS if carrier != 10},
+    **{code: Yarn_Carrier_Set(list(carrier_ids)) for carrier_ids, code in CARRIER_SET_CODES.items()}})
+"""MappingProxyType[int, Yarn_Carrier_Set | None]: The carrier set decoded from every valid carrier pixel value, or None for pixel values that specify no carriers.
+
+The carrier sets are shared by every decoded pass and must not be modified.
+"""
+
+
 def carriers_to_int(carrier_set: Yarn_Carrier_Set | None) -> int:
     """Convert a carrier set to an integer representation for DAT files.
 
@@ -599,23 +638,13 @@ def carriers_to_int(carrier_set: Yarn_Carrier_Set | None) -> int:
     """
     if carrier_set is None or len(carrier_set) == 0:
         return NO_CARRIERS
-    if len(carrier_set.carrier_ids) == 1:
-        cid = carrier_set.carrier_ids[0]
-        assert isinstance(cid, int)
-        return cid
-    elif len(carrier_set.carrier_ids) == 2:
-        # Concatenate numbers with leading carrier first
-        if carrier_set.carrier_ids[0] == 10:
-            return int(f"10{carrier_set.carrier_ids[1]}")
-        elif carrier_set.carrier_ids[1] == 10 and carrier_set.carrier_ids[0] != 1:
-            return int(f"{carrier_set.carrier_ids[0]}0")
-        else:
-            return int(f"{carrier_set.carrier_ids[0]}{carrier_set.carrier_ids[1]}")
-    else:
+    carrier_code = CARRIER_SET_CODES.get(tuple(carrier_set.carrier_ids))
+    if carrier_code is None:
         # Default to first carrier for complex combinations
         cid = carrier_set.carrier_ids[0]
         assert isinstance(cid, int)
         return cid
+    return carrier_code
 
 
 def pixel_to_carriers(pixel_value: int) -> Yarn_Carrier_Set | None:
@@ -629,6 +658,7 @@ def pixel_to_carriers(pixel_value: int) -> Yarn_Carrier_Set | None:
 
     Returns:
         Yarn_Carrier_Set | None: Yarn carrier set containing the decoded carrier numbers (each 1-10), or None if no carriers are specified (pixel_value is 0 or 255).
+            The returned carrier set is shared by every pixel of the same value and must not be modified.
 
     Raises:
         ValueError: If the pixel value cannot be decoded to a valid carrier set.
@@ -639,35 +669,7 @@ def pixel_to_carriers(pixel_value: int) -> Yarn_Carrier_Set | None:
         * Single carriers: pixel value = carrier number (1-10)
         * Two carriers: decode concatenated numbers with special handling for carrier 10
     """
-    # Handle no carriers case
-    if pixel_value == 0 or pixel_value == 255:  # NO_CARRIERS
-        return None
-
-    # Handle single carriers (1-10)
-    if 1 <= pixel_value <= 10:
-        return Yarn_Carrier_Set([pixel_value])
-
-    # Handle two-carrier combinations
-    pixel_str = str(pixel_value)
-
-    # Case: carrier 10 is leading (format: "10X" where X is 1-9)
-    if pixel_str.startswith('10') and len(pixel_str) == 3:
-        second_carrier = int(pixel_str[2])
-        if 1 <= second_carrier <= 9:
-            return Yarn_Carrier_Set([10, second_carrier])
-
-    # Case: carrier 10 is following (format: "X0" where X is 2-9, not 1)
-    if pixel_str.endswith('0') and len(pixel_str) == 2:
-        first_carrier = int(pixel_str[0])
-        if 2 <= first_carrier <= 9:  # carrier_ids[0] != 1
-            return Yarn_Carrier_Set([first_carrier, 10])
-
-    # Case: regular two single-digit carriers (format: "XY" where X,Y are 1-9)
-    if len(pixel_str) == 2:
-        first_carrier = int(pixel_str[0])
-        second_carrier = int(pixel_str[1])
-        if 1 <= first_carrier <= 9 and 1 <= second_carrier <= 9:
-            return Yarn_Carrier_Set([first_carrier, second_carrier])
-
-    # If we can't decode it, return empty list and warn
-    raise ValueError(f"Could not decode carrier value {pixel_value} to carrier set")
+    try:
+        return CARRIER_SETS_BY_CODE[pixel_value]
+    except KeyError:
+        raise ValueError(f"Could not decode carrier value {pixel_value} to carrier set") from None
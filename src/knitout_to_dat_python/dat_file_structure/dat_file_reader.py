@@ -0,0 +1,233 @@
+"""Module containing the Dat_File_Reader class.
+
+This module provides random access to the raster rows of Shima Seiki DAT files.
+DAT files on disk are memory-mapped, DAT content already in memory is read in place, and rows are only decoded when they are requested, so inspecting a few rows of a large DAT file does not require decoding the whole raster.
+"""
+import mmap
+import os
+import struct
+from types import TracebackType
+from typing import BinaryIO
+
+from knitout_to_dat_python.dat_file_structure.dat_row_index import (
+    read_row_index,
+    row_index_filename,
+    write_row_index,
+)
+from knitout_to_dat_python.dat_file_structure.dat_run_length_encoding import (
+    run_length_decode_rows,
+    run_length_expand,
+    run_length_row_index,
+)
+
+
+class Dat_File_Reader:
+    """A class that reads the header and raster rows of a DAT file on demand.
+
+    The run-length encoded raster is indexed the first time a row is requested, either from a valid row index sidecar or by a single scan of the run lengths.
+    The index records, for each row, the byte offset of the run-length pair that contains the row's first pixel and the number of pixels of that run that belong to earlier rows.
+    Individual rows or ranges of rows are then decoded from only the pairs that cover them.
+
+    Attributes:
+        HEADER_SIZE (int): Size of the DAT file header in bytes.
+        DATA_OFFSET (int): Offset where the run-length encoded data begins in the DAT file.
+        MAGIC_NUMBER (int): The value expected at both magic number positions of a DAT header.
+    """
+    HEADER_SIZE: int = 0x200
+    DATA_OFFSET: int = 0x600
+    MAGIC_NUMBER: int = 1000
+
+    def __init__(self, dat_source: str | bytes | bytearray | memoryview | BinaryIO, use_row_index: bool = True, verify_row_index: bool = True):
+        """Initialize a Dat_File_Reader and validate the DAT header.
+
+        Args:
+            dat_source (str | bytes | bytearray | memoryview | BinaryIO):
+                Path to the DAT file to read, which is memory-mapped, or the content of a DAT file as a bytes-like object or a binary file-like object, which is read without touching the filesystem.
+            use_row_index (bool, optional): If True, the row index of a DAT file given by path is loaded from the file's sidecar when it is present and valid instead of scanning the raster data. Defaults to True.
+            verify_row_index (bool, optional):
+                If True, a row index sidecar is only used if the digest of the entire DAT file matches the sidecar. Otherwise, only the file size, raster data length, and a digest of the header, palette, and ends of the raster data are checked.
+                This skips reading the whole file, but it accepts a stale sidecar if the middle of the raster data was rewritten without changing the size of the file. Defaults to True.
+
+        Raises:
+            ValueError: If the content is too small to contain a DAT header or the header has invalid magic numbers.
+        """
+        self._dat_filename: str | None = None
+        self._file: BinaryIO | None = None
+        self._map: mmap.mmap | None = None
+        self._content: mmap.mmap | memoryview
+        if isinstance(dat_source, str):
+            self._dat_filename = dat_source
+            self._file = open(dat_source, 'rb')
+            try:
+                file_size = os.fstat(self._file.fileno()).st_size
+                if file_size < self.DATA_OFFSET:
+                    raise ValueError(f"Invalid DAT file: {file_size} bytes is smaller than the {self.DATA_OFFSET} byte header and palette")
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except BaseException:
+                self._file.close()
+                raise
+            self._content = self._map
+        else:
+            if not isinstance(dat_source, (bytes, bytearray, memoryview)):  # Read the content of a file-like object.
+                dat_source = dat_source.read()
+            self._content = memoryview(dat_source).cast('B')
+            if len(self._content) < self.DATA_OFFSET:
+                raise ValueError(f"Invalid DAT file: {len(self._content)} bytes is smaller than the {self.DATA_OFFSET} byte header and palette")
+        self._use_row_index: bool = use_row_index and self._dat_filename is not None
+        self._verify_row_index: bool = verify_row_index
+        x_min, y_min, x_max, y_max, magic1 = struct.unpack_from('<HHHHH', self._content, 0)
+        magic2 = struct.unpack_from('<H', self._content, 0x10)[0]
+        if magic1 != self.MAGIC_NUMBER or magic2 != self.MAGIC_NUMBER:
+            self.close()
+            raise ValueError(f"Invalid DAT file: magic numbers are {magic1}, {magic2}, expected 1000, 1000")
+        self._width: int = x_max - x_min + 1
+        self._height: int = y_max - y_min + 1
+        self._data_length: int = ((len(self._content) - self.DATA_OFFSET) // 2) * 2  # Ignore a trailing byte that does not complete a pair.
+        self._row_offsets: list[int] | None = None
+        self._row_skips: list[int] = []
+
+    @property
+    def dat_filename(self) -> str | None:
+        """
+        Returns:
+            str | None: Path to the DAT file being read or None if the DAT file content was given in memory.
+        """
+        return self._dat_filename
+
+    @property
+    def width(self) -> int:
+        """
+        Returns:
+            int: The width of the raster in pixels as specified by the header.
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+        Returns:
+            int: The height of the raster in rows as specified by the header.
+        """
+        return self._height
+
+    @property
+    def data_length(self) -> int:
+        """
+        Returns:
+            int: The number of bytes of complete run-length pairs in the raster data.
+        """
+        return self._data_length
+
+    @property
+    def row_count(self) -> int:
+        """
+        Returns:
+            int: The number of rows encoded in the raster data, including a partial last row. This matches the height of a well-formed DAT file.
+        """
+        return len(self._get_row_offsets())
+
+    def read_raster_data(self) -> bytes:
+        """
+        Returns:
+            bytes: The run-length encoded raster data of the file.
+        """
+        return bytes(self._content[self.DATA_OFFSET:self.DATA_OFFSET + self._data_length])
+
+    def read_row(self, index: int) -> list[int]:
+        """Decode a single row of the raster.
+
+        Args:
+            index (int): The index of the row in the order it is stored in the file. Negative indices count back from the last row.
+
+        Returns:
+            list[int]: The pixel color codes of the row.
+
+        Raises:
+            IndexError: If the index is outside the rows of the raster.
+        """
+        row_count = self.row_count
+        if index < 0:
+            index += row_count
+        if not 0 <= index < row_count:
+            raise IndexError(f"Row {index} is out of range of {row_count} rows in {self}")
+        return self.read_rows(index, index + 1)[0]
+
+    def read_rows(self, start: int = 0, stop: int | None = None) -> list[list[int]]:
+        """Decode a range of rows of the raster.
+
+        Args:
+            start (int, optional): The index of the first row to decode. Defaults to 0.
+            stop (int | None, optional): The index after the last row to decode. Defaults to the end of the raster.
+
+        Returns:
+            list[list[int]]: The pixel color codes of each row in the range. Ranges are clamped to the rows of the raster as in list slicing.
+        """
+        if start == 0 and stop is None and self._row_offsets is None:  # Decode the entire raster without building an index.
+            return run_length_decode_rows(self.read_raster_data(), self._width)
+        start, stop, _ = slice(start, stop).indices(self.row_count)
+        if start >= stop:
+            return []
+        row_offsets = self._get_row_offsets()
+        first_byte = self.DATA_OFFSET + row_offsets[start]
+        if stop < len(row_offsets):  # Include the pair that contains the first pixel of the following row.
+            last_byte = self.DATA_OFFSET + row_offsets[stop] + 2
+        else:
+            last_byte = self.DATA_OFFSET + self._data_length
+        pixels = run_length_expand(self._content[first_byte:last_byte])
+        skip = self._row_skips[start]
+        pixels = pixels[skip:skip + (stop - start) * self._width]
+        return [list(pixels[row_start:row_start + self._width]) for row_start in range(0, len(pixels), self._width)]
+
+    def _get_row_offsets(self) -> list[int]:
+        """
+        Returns:
+            list[int]: The byte offset, relative to the start of the raster data, of the run-length pair containing the first pixel of each row. The index is built on first use.
+        """
+        if self._row_offsets is None:
+            row_index = None
+            if self._use_row_index and self._dat_filename is not None:
+                row_index = read_row_index(row_index_filename(self._dat_filename), self._width, self._data_length, self._content, self._verify_row_index)
+            if row_index is None:  # No valid sidecar, so scan the raster data.
+                row_index = run_length_row_index(self.read_raster_data(), self._width)
+            self._row_offsets, self._row_skips = row_index
+        return self._row_offsets
+
+    def write_row_index(self) -> str:
+        """Write a row index sidecar for this DAT file so that later readers can skip scanning the raster data.
+
+        Returns:
+            str: Path to the written sidecar file.
+
+        Raises:
+            ValueError: If the DAT file content was given in memory and has no path to write a sidecar next to.
+        """
+        if self._dat_filename is None:
+            raise ValueError("Cannot write a row index sidecar for DAT content that was not read from a file")
+        index_filename = row_index_filename(self._dat_filename)
+        write_row_index(index_filename, self._width, self._data_length, self._content, self._get_row_offsets(), self._row_skips)
+        return index_filename
+
+    def close(self) -> None:
+        """Release the DAT content and close the memory map and underlying file, if any."""
+        if isinstance(self._content, memoryview):
+            self._content.release()
+        if self._map is not None and not self._map.closed:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> "Dat_File_Reader":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __str__(self) -> str:
+        source = "<memory>" if self._dat_filename is None else self._dat_filename
+        return f"Dat_File_Reader({source}: {self._width} x {self._height})"
+
+    def __repr__(self) -> str:
+        return str(self)
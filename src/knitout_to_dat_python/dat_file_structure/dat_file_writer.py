@@ -0,0 +1,232 @@
+"""Module containing the Dat_File_Writer class.
+
+This module provides a streaming writer for Shima Seiki DAT files.
+Rows are run-length encoded and written to the output file as they are produced, so the memory used by the writer depends on the raster width and not on its height.
+"""
+import mmap
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from types import TracebackType
+from typing import BinaryIO
+
+from knitout_to_dat_python.dat_file_structure.dat_row_index import (
+    row_index_filename,
+    write_row_index,
+)
+from knitout_to_dat_python.dat_file_structure.dat_run_length_encoding import (
+    run_length_encode_rows,
+)
+
+
+class Dat_File_Writer:
+    """A class that writes the rows of a DAT raster to a file as they are produced.
+
+    The header and palette are written when the writer is opened, with placeholder raster dimensions.
+    Each appended row is encoded and written immediately, and the header's x-max and y-max are patched once the writer is closed and the raster height is known.
+    The encodings of recently written rows are cached so that repeated rows are only encoded once.
+
+    Attributes:
+        ENCODED_ROW_CACHE_SIZE (int): The number of distinct recently written rows whose encoding is cached.
+    """
+    ENCODED_ROW_CACHE_SIZE: int = 256
+
+    def __init__(self, dat_file: str | BinaryIO, width: int, dat_prefix: bytes | bytearray, write_index: bool = False):
+        """Initialize a Dat_File_Writer and write the header and palette sections.
+
+        Args:
+            dat_file (str | BinaryIO): Path to the DAT file to write, or a seekable binary file-like object to write the DAT file into from its current position.
+            width (int): The number of pixels in each row of the raster.
+            dat_prefix (bytes | bytearray): The header and padded palette sections of the DAT file. The raster dimensions in the header are overwritten when the writer is closed.
+            write_index (bool, optional): If True, a row index sidecar is written next to the DAT file when the writer is closed. Requires a path to the DAT file. Defaults to False.
+
+        Raises:
+            ValueError: If a row index is requested for a DAT file that is not given by path.
+        """
+        self._dat_filename: str | None = dat_file if isinstance(dat_file, str) else None
+        if write_index and self._dat_filename is None:
+            raise ValueError("A row index sidecar can only be written for a DAT file given by path")
+        self._file: BinaryIO = open(dat_file, 'w+b') if isinstance(dat_file, str) else dat_file
+        self._start: int = self._file.tell()
+        self._file.write(dat_prefix)
+        self._data_offset: int = len(dat_prefix)
+        self._width: int = width
+        self._height: int = 0
+        self._data_length: int = 0
+        self._row_offsets: array | None = array('I') if write_index else None
+        self._encoded_rows: OrderedDict[bytes, bytes] = OrderedDict()
+        self._closed: bool = False
+
+    @property
+    def width(self) -> int:
+        """
+        Returns:
+            int: The number of pixels in each row of the raster.
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+        Returns:
+            int: The number of rows written so far.
+        """
+        return self._height
+
+    @property
+    def data_length(self) -> int:
+        """
+        Returns:
+            int: The number of bytes of run-length encoded raster data written so far.
+        """
+        return self._data_length
+
+    @property
+    def file_size(self) -> int:
+        """
+        Returns:
+            int: The number of bytes of the DAT file written so far.
+        """
+        return self._data_offset + self._data_length
+
+    def _encode_row(self, row_content: bytes) -> bytes:
+        """
+        Args:
+            row_content (bytes): The pixel color codes of a row.
+
+        Returns:
+            bytes: The run-length encoding of the row, taken from the cache of recently written rows when possible.
+        """
+        encoded = self._encoded_rows.get(row_content)
+        if encoded is None:
+            encoded = run_length_encode_rows([row_content], self._width, use_numpy=False)
+            self._encoded_rows[row_content] = encoded
+            if len(self._encoded_rows) > self.ENCODED_ROW_CACHE_SIZE:
+                self._encoded_rows.popitem(last=False)
+        else:
+            self._encoded_rows.move_to_end(row_content)
+        return encoded
+
+    def cache_encoded_rows(self, encoded_rows: Iterable[tuple[bytes, bytes]]) -> None:
+        """Add rows whose run-length encodings are already known to the cache of encoded rows.
+
+        Args:
+            encoded_rows (Iterable[tuple[bytes, bytes]]): Pairs of the pixel color codes of a row and the run-length encoding of that row.
+        """
+        for row_content, encoded in encoded_rows:
+            self._encoded_rows[row_content] = encoded
+            self._encoded_rows.move_to_end(row_content)
+            if len(self._encoded_rows) > self.ENCODED_ROW_CACHE_SIZE:
+                self._encoded_rows.popitem(last=False)
+
+    def _write_encoded_row(self, encoded: bytes) -> None:
+        """Write the encoding of a row to the raster data.
+
+        Args:
+            encoded (bytes): The run-length encoding of the row.
+        """
+        if self._row_offsets is not None:
+            self._row_offsets.append(self._data_length)
+        self._file.write(encoded)
+        self._data_length += len(encoded)
+        self._height += 1
+
+    def append_row(self, row: Sequence[int]) -> None:
+        """Encode and write a single row to the top of the raster.
+
+        Args:
+            row (Sequence[int]): The pixel color codes of the row.
+
+        Raises:
+            AssertionError: If the row length doesn't match the raster width.
+            ValueError: If the writer is closed or a pixel value cannot be represented in a single byte.
+        """
+        if self._closed:
+            raise ValueError("Cannot write rows to a closed Dat_File_Writer")
+        assert len(row) == self._width, f"Expected row of width {self._width}, got width {len(row)}"
+        self._write_encoded_row(self._encode_row(bytes(row)))
+
+    def extend_rows(self, rows: Iterable[Sequence[int]]) -> None:
+        """Encode and write multiple rows to the top of the raster.
+
+        Args:
+            rows (Iterable[Sequence[int]]): The rows to write.
+
+        Raises:
+            AssertionError: If any row length doesn't match the raster width.
+            ValueError: If the writer is closed or a pixel value cannot be represented in a single byte.
+        """
+        for row in rows:
+            self.append_row(row)
+
+    def append_empty_rows(self, row_count: int, color: int = 0) -> None:
+        """Write rows filled with a single color to the top of the raster.
+
+        Args:
+            row_count (int): The number of rows to write.
+            color (int, optional): The color code to fill the rows with. Defaults to 0, the empty background color.
+        """
+        for _ in range(row_count):
+            self.append_row(bytes((color,)) * self._width)
+
+    def close(self) -> None:
+        """Patch the raster dimensions into the header, write the row index sidecar if requested, and close the file if it was opened by the writer.
+
+        Raises:
+            ValueError: If no rows were written.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._height == 0:
+                raise ValueError("No raster rows were written to the DAT file")
+            end = self._file.tell()
+            self._file.seek(self._start + 0x04)
+            self._file.write(struct.pack('<HH', self._width - 1, self._height - 1))
+            self._file.seek(end)
+            if self._row_offsets is not None and self._dat_filename is not None:
+                self._file.flush()
+                with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as dat_content:
+                    write_row_index(row_index_filename(self._dat_filename), self._width, self._data_length, dat_content, self._row_offsets.tolist(), [0] * self._height)
+        finally:
+            if self._dat_filename is not None:
+                self._file.close()
+            else:
+                self._file.flush()
+
+    def abort(self) -> None:
+        """Discard the partially written DAT file without finalizing it.
+
+        A DAT file given by path is closed and removed along with its row index sidecar.
+        A DAT file written into a file-like object is truncated back to the position the writer started from.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._dat_filename is None:
+            self._file.seek(self._start)
+            self._file.truncate()
+            return
+        self._file.close()
+        for filename in (self._dat_filename, row_index_filename(self._dat_filename)):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def __enter__(self) -> "Dat_File_Writer":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __str__(self) -> str:
+        target = "<stream>" if self._dat_filename is None else self._dat_filename
+        return f"Dat_File_Writer({target}: {self._width} x {self._height})"
+
+    def __repr__(self) -> str:
+        return str(self)
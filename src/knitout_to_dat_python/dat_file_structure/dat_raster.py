@@ -0,0 +1,226 @@
+"""Module containing the Dat_Raster class.
+
+A Dat_Raster stores the pixels of a DAT raster as one byte per pixel.
+Identical rows are interned: each distinct row is stored once and the raster records which distinct row appears at each height.
+Knitting programs repeat the same carriage passes many times, so the number of distinct rows is usually far smaller than the height of the raster.
+
+Distinct rows are stored in a 2D NumPy uint8 array when NumPy is installed and in an ``array('B')`` otherwise.
+"""
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+
+from knitout_to_dat_python.dat_file_structure.dat_run_length_encoding import (
+    NUMPY_AVAILABLE,
+    run_length_encode_rows_numpy,
+    run_length_encode_rows_parallel,
+    run_length_encode_rows_python,
+    run_length_row_index,
+)
+
+if NUMPY_AVAILABLE:  # NumPy is an optional accelerator. An array('B') buffer is used without it.
+    import numpy as np
+
+
+class Dat_Raster:
+    """A growable raster of fixed-width rows of pixel color codes that stores each distinct row once.
+
+    Distinct rows are written directly into a preallocated buffer whose capacity doubles as new rows are added.
+    The raster itself is an array of distinct-row ids, so appending a repeated row only costs the lookup of its content.
+    Run-length encoding is computed once per distinct row and the encoded rows are reused for every repetition.
+    """
+
+    def __init__(self, width: int, initial_capacity: int = 64, use_numpy: bool = True):
+        """Initialize an empty Dat_Raster.
+
+        Args:
+            width (int): The number of pixels in each row of the raster.
+            initial_capacity (int, optional): The number of distinct rows to preallocate. Defaults to 64.
+            use_numpy (bool, optional): If True, distinct rows are stored in a NumPy array when NumPy is available. Defaults to True.
+        """
+        self._width: int = width
+        self._row_ids: array = array('I')  # The id of the distinct row at each height of the raster.
+        self._distinct_row_ids: dict[bytes, int] = {}  # Maps the content of each distinct row to its id.
+        self._uses_numpy: bool = use_numpy and NUMPY_AVAILABLE
+        if self._uses_numpy:
+            self._distinct_array: np.ndarray = np.zeros((max(initial_capacity, 1), width), dtype=np.uint8)
+        else:
+            self._distinct_buffer: array = array('B')
+        self._encoded_rows: list[bytes] = []  # The run-length encoding of each distinct row that has been encoded.
+
+    @property
+    def width(self) -> int:
+        """
+        Returns:
+            int: The number of pixels in each row of the raster.
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+        Returns:
+            int: The number of rows in the raster.
+        """
+        return len(self._row_ids)
+
+    @property
+    def unique_row_count(self) -> int:
+        """
+        Returns:
+            int: The number of distinct rows in the raster.
+        """
+        return len(self._distinct_row_ids)
+
+    def _intern_row(self, row_content: bytes) -> int:
+        """Find the id of the distinct row with the given content, storing it as a new distinct row if it has not been seen.
+
+        Args:
+            row_content (bytes): The pixel color codes of the row.
+
+        Returns:
+            int: The id of the distinct row.
+        """
+        row_id = self._distinct_row_ids.get(row_content)
+        if row_id is None:
+            row_id = len(self._distinct_row_ids)
+            self._distinct_row_ids[row_content] = row_id
+            if self._uses_numpy:
+                capacity = self._distinct_array.shape[0]
+                if row_id >= capacity:  # Double the capacity of the distinct row buffer.
+                    grown = np.zeros((capacity * 2, self._width), dtype=np.uint8)
+                    grown[:row_id] = self._distinct_array[:row_id]
+                    self._distinct_array = grown
+                self._distinct_array[row_id] = np.frombuffer(row_content, dtype=np.uint8)
+            else:
+                self._distinct_buffer.frombytes(row_content)
+        return row_id
+
+    def append_row(self, row: Sequence[int]) -> None:
+        """Append a single row to the top of the raster.
+
+        Args:
+            row (Sequence[int]): The pixel color codes of the row.
+
+        Raises:
+            AssertionError: If the row length doesn't match the raster width.
+            ValueError: If a pixel value cannot be represented in a single byte.
+        """
+        assert len(row) == self._width, f"Expected row of width {self._width}, got width {len(row)}"
+        self._row_ids.append(self._intern_row(bytes(row)))
+
+    def extend_rows(self, rows: Iterable[Sequence[int]]) -> None:
+        """Append multiple rows to the top of the raster.
+
+        Args:
+            rows (Iterable[Sequence[int]]): The rows to append.
+
+        Raises:
+            AssertionError: If any row length doesn't match the raster width.
+            ValueError: If a pixel value cannot be represented in a single byte.
+        """
+        for row in rows:
+            self.append_row(row)
+
+    def append_empty_rows(self, row_count: int, color: int = 0) -> None:
+        """Append rows filled with a single color to the top of the raster.
+
+        Args:
+            row_count (int): The number of rows to append.
+            color (int, optional): The color code to fill the rows with. Defaults to 0, the empty background color.
+        """
+        row_id = self._intern_row(bytes((color,)) * self._width)
+        self._row_ids.extend([row_id] * row_count)
+
+    def _distinct_row(self, row_id: int) -> bytes:
+        """
+        Args:
+            row_id (int): The id of a distinct row.
+
+        Returns:
+            bytes: The pixel color codes of the distinct row.
+        """
+        if self._uses_numpy:
+            return bytes(self._distinct_array[row_id].tobytes())
+        return self._distinct_buffer[row_id * self._width:(row_id + 1) * self._width].tobytes()
+
+    def get_row(self, index: int) -> list[int]:
+        """
+        Args:
+            index (int): The index of the row from the bottom of the raster. Negative indices count down from the top row.
+
+        Returns:
+            list[int]: The pixel color codes of the row.
+
+        Raises:
+            IndexError: If the index is outside the rows of the raster.
+        """
+        if not -self.height <= index < self.height:
+            raise IndexError(f"Row {index} is out of range of {self.height} rows")
+        return list(self._distinct_row(self._row_ids[index]))
+
+    def tobytes(self) -> bytes:
+        """
+        Returns:
+            bytes: The pixels of the raster row by row from the bottom of the raster, one byte per pixel.
+        """
+        distinct_rows = [self._distinct_row(row_id) for row_id in range(self.unique_row_count)]
+        return b"".join(distinct_rows[row_id] for row_id in self._row_ids)
+
+    def _encode_new_distinct_rows(self, use_numpy: bool = True, parallel: bool = False, max_workers: int | None = None) -> None:
+        """Run-length encode each distinct row that has not been encoded yet.
+
+        Args:
+            use_numpy (bool, optional): If True, the vectorized NumPy encoder is used when distinct rows are stored in a NumPy array. Defaults to True.
+            parallel (bool, optional): If True, chunks of distinct rows are encoded in parallel worker processes. Defaults to False.
+            max_workers (int | None, optional): The maximum number of worker processes used for parallel encoding. Defaults to None, which uses the number of processors.
+        """
+        first_new, unique_count = len(self._encoded_rows), self.unique_row_count
+        if first_new == unique_count:
+            return
+        new_rows: np.ndarray | list[bytes]
+        if self._uses_numpy:
+            new_rows = self._distinct_array[first_new:unique_count]
+        else:
+            new_rows = [self._distinct_row(row_id) for row_id in range(first_new, unique_count)]
+        if parallel:
+            encoded = run_length_encode_rows_parallel(new_rows, self._width, max_workers=max_workers, use_numpy=use_numpy)
+        elif use_numpy and self._uses_numpy:
+            encoded = run_length_encode_rows_numpy(new_rows, self._width)
+        else:
+            encoded = run_length_encode_rows_python(new_rows)
+        # Runs never cross rows, so the row index splits the encoding into the pairs of each distinct row.
+        row_offsets, _row_skips = run_length_row_index(encoded, self._width, use_numpy=use_numpy)
+        row_offsets.append(len(encoded))
+        self._encoded_rows.extend(encoded[start:end] for start, end in zip(row_offsets, row_offsets[1:]))
+
+    def run_length_encode(self, use_numpy: bool = True, parallel: bool = False, max_workers: int | None = None) -> bytes:
+        """Run-length encode the raster into the color-index and run-length pairs of a DAT file.
+
+        Each distinct row is encoded once, and the encoding is cached and reused for every repetition of the row.
+
+        Args:
+            use_numpy (bool, optional): If True, the vectorized NumPy encoder is used when the raster is stored in a NumPy array. Defaults to True.
+            parallel (bool, optional): If True, chunks of distinct rows are encoded in parallel worker processes. Defaults to False.
+            max_workers (int | None, optional): The maximum number of worker processes used for parallel encoding. Defaults to None, which uses the number of processors.
+
+        Returns:
+            bytes: The alternating color indices and run lengths of the encoded rows.
+        """
+        if self._width == 0:
+            return b""
+        self._encode_new_distinct_rows(use_numpy=use_numpy, parallel=parallel, max_workers=max_workers)
+        encoded_rows = self._encoded_rows
+        return b"".join([encoded_rows[row_id] for row_id in self._row_ids])
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self) -> Iterator[list[int]]:
+        for index in range(self.height):
+            yield self.get_row(index)
+
+    def __str__(self) -> str:
+        return f"Dat_Raster({self._width} x {self.height}, {self.unique_row_count} unique rows)"
+
+    def __repr__(self) -> str:
+        return str(self)
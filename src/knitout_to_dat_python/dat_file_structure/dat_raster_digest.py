@@ -0,0 +1,92 @@
+"""Module containing the Dat_Raster_Digest class.
+
+A Dat_Raster_Digest accepts the rows of a DAT raster like a Dat_Raster or a Dat_File_Writer, but only keeps a running hash of their pixels.
+It is used to compare the rasters produced from knitout programs without storing or writing the raster.
+"""
+import hashlib
+from collections.abc import Iterable, Sequence
+
+
+class Dat_Raster_Digest:
+    """A sink for the rows of a DAT raster that hashes each row as it is appended and then discards it.
+
+    Two digests are equal only if their rasters have the same width and the same pixels in every row.
+    """
+
+    def __init__(self, width: int):
+        """Initialize an empty Dat_Raster_Digest.
+
+        Args:
+            width (int): The number of pixels in each row of the raster.
+        """
+        self._width: int = width
+        self._height: int = 0
+        self._hash = hashlib.blake2b()
+        self._hash.update(width.to_bytes(4, 'little'))
+
+    @property
+    def width(self) -> int:
+        """
+        Returns:
+            int: The number of pixels in each row of the raster.
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+        Returns:
+            int: The number of rows hashed so far.
+        """
+        return self._height
+
+    def append_row(self, row: Sequence[int]) -> None:
+        """Hash a single row at the top of the raster.
+
+        Args:
+            row (Sequence[int]): The pixel color codes of the row.
+
+        Raises:
+            AssertionError: If the row length doesn't match the raster width.
+            ValueError: If a pixel value cannot be represented in a single byte.
+        """
+        assert len(row) == self._width, f"Expected row of width {self._width}, got width {len(row)}"
+        self._hash.update(bytes(row))
+        self._height += 1
+
+    def extend_rows(self, rows: Iterable[Sequence[int]]) -> None:
+        """Hash multiple rows at the top of the raster.
+
+        Args:
+            rows (Iterable[Sequence[int]]): The rows to hash.
+
+        Raises:
+            AssertionError: If any row length doesn't match the raster width.
+            ValueError: If a pixel value cannot be represented in a single byte.
+        """
+        for row in rows:
+            self.append_row(row)
+
+    def append_empty_rows(self, row_count: int, color: int = 0) -> None:
+        """Hash rows filled with a single color at the top of the raster.
+
+        Args:
+            row_count (int): The number of rows to hash.
+            color (int, optional): The color code to fill the rows with. Defaults to 0, the empty background color.
+        """
+        row = bytes((color,)) * self._width
+        for _ in range(row_count):
+            self.append_row(row)
+
+    def hexdigest(self) -> str:
+        """
+        Returns:
+            str: The hexadecimal digest of the raster width and the pixels of every row hashed so far.
+        """
+        return self._hash.hexdigest()
+
+    def __str__(self) -> str:
+        return f"Dat_Raster_Digest({self._width} x {self._height}: {self.hexdigest()})"
+
+    def __repr__(self) -> str:
+        return str(self)
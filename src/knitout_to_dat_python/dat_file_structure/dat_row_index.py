@@ -0,0 +1,150 @@
+"""Module containing functions to write and read the row-offset index sidecar of DAT files.
+
+A row index lets a reader decode any row of a DAT file without first scanning the run-length encoded raster.
+The index is stored next to the DAT file in a sidecar file named by appending ROW_INDEX_SUFFIX to the DAT filename.
+
+The sidecar has the following little-endian binary layout:
+
+======  ===========  ===========================================================================
+Offset  Type         Content
+======  ===========  ===========================================================================
+0       4 bytes      Magic bytes ``b"DRIX"``.
+4       uint16       Layout version (currently 2).
+6       uint16       Reserved, always 0.
+8       uint32       Raster width in pixels.
+12      uint32       Number of indexed rows (N).
+16      uint32       Length in bytes of the complete run-length pairs of the raster data.
+20      uint32       Size in bytes of the DAT file.
+24      32 bytes     BLAKE2b digest (32 byte digest size) of the first and last DIGEST_SAMPLE_SIZE bytes of the DAT file.
+56      32 bytes     BLAKE2b digest (32 byte digest size) of the entire DAT file.
+88      N x uint32   Byte offset, relative to the start of the raster data, of the pair containing the first pixel of each row.
+88+4N   N x uint8    Number of pixels of that pair's run that belong to earlier rows.
+======  ===========  ===========================================================================
+
+An index is only used if its header matches the size and raster data length of the DAT file and its digests match the file content, so a stale sidecar is ignored rather than trusted.
+Readers can opt in to checking only the sample digest, which covers the header, the palette, and the ends of the raster data, so that the whole file is not read.
+A sample-only check accepts a stale sidecar if the DAT file was rewritten with the same size and the same sampled bytes.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+ROW_INDEX_SUFFIX: str = ".idx"
+"""str: The suffix appended to a DAT filename to name its row index sidecar."""
+
+ROW_INDEX_MAGIC: bytes = b"DRIX"
+"""bytes: The magic bytes that begin a row index sidecar."""
+
+ROW_INDEX_VERSION: int = 2
+"""int: The version of the row index layout written by this module."""
+
+ROW_INDEX_HEADER: struct.Struct = struct.Struct('<4sHHIIII32s32s')
+"""struct.Struct: The layout of the fixed-size header of a row index sidecar."""
+
+DIGEST_SIZE: int = 32
+"""int: The size in bytes of the BLAKE2b digests of the DAT file stored in the sidecar."""
+
+DIGEST_SAMPLE_SIZE: int = 8192
+"""int: The number of bytes at each end of the DAT file covered by the sample digest. The leading bytes include the header and palette."""
+
+
+def row_index_filename(dat_filename: str) -> str:
+    """
+    Args:
+        dat_filename (str): Path to a DAT file.
+
+    Returns:
+        str: Path to the row index sidecar of the given DAT file.
+    """
+    return dat_filename + ROW_INDEX_SUFFIX
+
+
+def dat_content_digest(dat_content: bytes | bytearray | memoryview | mmap.mmap) -> bytes:
+    """
+    Args:
+        dat_content (bytes | bytearray | memoryview | mmap.mmap): The complete content of a DAT file.
+
+    Returns:
+        bytes: The BLAKE2b digest of the DAT file content used to detect stale row indices.
+    """
+    return hashlib.blake2b(dat_content, digest_size=DIGEST_SIZE).digest()
+
+
+def dat_sample_digest(dat_content: bytes | bytearray | memoryview | mmap.mmap) -> bytes:
+    """
+    Args:
+        dat_content (bytes | bytearray | memoryview | mmap.mmap): The complete content of a DAT file.
+
+    Returns:
+        bytes: The BLAKE2b digest of the first and last DIGEST_SAMPLE_SIZE bytes of the DAT file content, used to cheaply detect stale row indices.
+    """
+    digest = hashlib.blake2b(dat_content[:DIGEST_SAMPLE_SIZE], digest_size=DIGEST_SIZE)
+    digest.update(dat_content[max(DIGEST_SAMPLE_SIZE, len(dat_content) - DIGEST_SAMPLE_SIZE):])
+    return digest.digest()
+
+
+def write_row_index(index_filename: str, width: int, data_length: int, dat_content: bytes | bytearray | memoryview | mmap.mmap, row_offsets: list[int], row_skips: list[int]) -> None:
+    """Write a row index sidecar file.
+
+    Args:
+        index_filename (str): Path to the sidecar file to write.
+        width (int): The width of the raster in pixels.
+        data_length (int): The length in bytes of the complete run-length pairs of the raster data.
+        dat_content (bytes | bytearray | memoryview | mmap.mmap): The complete content of the DAT file the index describes.
+        row_offsets (list[int]): The byte offset of the pair containing the first pixel of each row.
+        row_skips (list[int]): The number of pixels of each row's first pair that belong to earlier rows.
+
+    Raises:
+        ValueError: If the offsets and skips do not describe the same number of rows.
+    """
+    if len(row_offsets) != len(row_skips):
+        raise ValueError(f"Expected a skip for each of {len(row_offsets)} row offsets, got {len(row_skips)} skips")
+    offsets = array('I', row_offsets)
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    with open(index_filename, 'wb') as f:
+        f.write(ROW_INDEX_HEADER.pack(ROW_INDEX_MAGIC, ROW_INDEX_VERSION, 0, width, len(row_offsets), data_length, len(dat_content),
+                                      dat_sample_digest(dat_content), dat_content_digest(dat_content)))
+        f.write(offsets.tobytes())
+        f.write(bytes(row_skips))
+
+
+def read_row_index(index_filename: str, width: int, data_length: int, dat_content: bytes | bytearray | memoryview | mmap.mmap,
+                   verify_content: bool = True) -> tuple[list[int], list[int]] | None:
+    """Read a row index sidecar file if it exists and matches the given DAT file.
+
+    Args:
+        index_filename (str): Path to the sidecar file to read.
+        width (int): The width of the raster in pixels.
+        data_length (int): The length in bytes of the complete run-length pairs of the raster data.
+        dat_content (bytes | bytearray | memoryview | mmap.mmap): The complete content of the DAT file the index should describe.
+        verify_content (bool, optional):
+            If True, the digest of the entire DAT file is also checked. Otherwise, only the size and sampled bytes of the file are checked, which does not detect changes to the middle of the raster data. Defaults to True.
+
+    Returns:
+        tuple[list[int], list[int]] | None: The row offsets and row skips of the index, or None if the sidecar is missing, malformed, or stale.
+    """
+    if not os.path.isfile(index_filename):
+        return None
+    with open(index_filename, 'rb') as f:
+        index_data = f.read()
+    if len(index_data) < ROW_INDEX_HEADER.size:
+        return None
+    magic, version, _reserved, index_width, row_count, index_data_length, file_size, sample_digest, content_digest = ROW_INDEX_HEADER.unpack_from(index_data)
+    if magic != ROW_INDEX_MAGIC or version != ROW_INDEX_VERSION or index_width != width or index_data_length != data_length or file_size != len(dat_content):
+        return None
+    skips_start = ROW_INDEX_HEADER.size + (4 * row_count)
+    if len(index_data) != skips_start + row_count:
+        return None
+    if sample_digest != dat_sample_digest(dat_content):
+        return None
+    if verify_content and content_digest != dat_content_digest(dat_content):
+        return None
+    offsets = array('I')
+    offsets.frombytes(index_data[ROW_INDEX_HEADER.size:skips_start])
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    return offsets.tolist(), list(index_data[skips_start:])
@@ -0,0 +1,344 @@
+"""Module containing the run-length encoding and decoding functions used by the raster section of DAT files.
+
+DAT files store their raster as a sequence of (color-index, run-length) byte pairs.
+Runs never cross the end of a raster row and are split every 255 pixels so that each run length fits in a single byte.
+
+The encoders and decoders in this module use NumPy when it is installed and fall back to a pure-Python implementation otherwise.
+Both implementations produce identical output.
+"""
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+from itertools import groupby
+from multiprocessing import shared_memory
+
+NUMPY_AVAILABLE: bool = find_spec("numpy") is not None
+"""bool: True if NumPy is installed and the vectorized encoders and decoders can be used."""
+
+if NUMPY_AVAILABLE:  # NumPy is an optional accelerator. The pure-Python implementations are used without it.
+    import numpy as np
+
+MAX_RUN_LENGTH: int = 255
+"""int: The longest run of pixels that can be represented by a single run-length pair."""
+
+PARALLEL_CHUNK_ROWS: int = 4096
+"""int: The default number of rows encoded by each task of the parallel encoder."""
+
+
+def run_length_encode_rows(rows: "Sequence[Sequence[int]] | np.ndarray", width: int, use_numpy: bool = True) -> bytes:
+    """Run-length encode raster rows into the color-index and run-length pairs of a DAT file.
+
+    Args:
+        rows (Sequence[Sequence[int]] | numpy.ndarray): The rows of pixel color codes to encode, ordered from the bottom of the raster to the top.
+        width (int): The number of pixels in each row.
+        use_numpy (bool, optional): If True, the vectorized NumPy encoder is used when NumPy is available. Defaults to True.
+
+    Returns:
+        bytes: The alternating color indices and run lengths of the encoded rows.
+
+    Raises:
+        ValueError: If a pixel value cannot be represented in a single byte.
+    """
+    if use_numpy and NUMPY_AVAILABLE:
+        return run_length_encode_rows_numpy(rows, width)
+    return run_length_encode_rows_python(rows)
+
+
+def run_length_encode_rows_parallel(rows: "Sequence[Sequence[int]] | np.ndarray", width: int, max_workers: int | None = None, chunk_rows: int = PARALLEL_CHUNK_ROWS,
+                                    use_numpy: bool = True) -> bytes:
+    """Run-length encode raster rows in parallel by splitting them into chunks of rows that are encoded in separate processes.
+
+    The raster is copied once into a shared memory block that every worker process reads its chunk from, and the encoded chunks are concatenated in row order.
+    Rasters that fit in a single chunk are encoded in this process.
+
+    Args:
+        rows (Sequence[Sequence[int]] | numpy.ndarray): The rows of pixel color codes to encode. This may be a 2D NumPy array.
+        width (int): The number of pixels in each row.
+        max_workers (int | None, optional): The maximum number of worker processes. Defaults to None, which uses the number of processors.
+        chunk_rows (int, optional): The number of rows encoded by each task. Defaults to PARALLEL_CHUNK_ROWS.
+        use_numpy (bool, optional): If True, the workers use the vectorized NumPy encoder when NumPy is available. Defaults to True.
+
+    Returns:
+        bytes: The alternating color indices and run lengths of the encoded rows.
+
+    Raises:
+        ValueError: If a pixel value cannot be represented in a single byte.
+    """
+    row_count = len(rows)
+    if row_count <= chunk_rows or width <= 0:
+        return run_length_encode_rows(rows, width, use_numpy=use_numpy)
+    shared_raster = shared_memory.SharedMemory(create=True, size=row_count * width)
+    try:
+        shared_buffer = shared_raster.buf
+        assert shared_buffer is not None
+        if use_numpy and NUMPY_AVAILABLE:
+            np.ndarray((row_count, width), dtype=np.uint8, buffer=shared_buffer)[:] = _as_uint8_raster(rows, width)
+        else:
+            for index, row in enumerate(rows):
+                shared_buffer[index * width:(index + 1) * width] = bytes(row)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunks = [executor.submit(_run_length_encode_shared_chunk, shared_raster.name, width, start, min(start + chunk_rows, row_count), use_numpy)
+                      for start in range(0, row_count, chunk_rows)]
+            return b"".join(chunk.result() for chunk in chunks)
+    finally:
+        shared_raster.close()
+        shared_raster.unlink()
+
+
+def _run_length_encode_shared_chunk(shared_name: str, width: int, start_row: int, stop_row: int, use_numpy: bool) -> bytes:
+    """Run-length encode a chunk of rows of a raster stored in shared memory. This is run in worker processes of run_length_encode_rows_parallel.
+
+    Args:
+        shared_name (str): The name of the shared memory block containing the raster.
+        width (int): The number of pixels in each row.
+        start_row (int): The index of the first row of the chunk.
+        stop_row (int): The index after the last row of the chunk.
+        use_numpy (bool): If True, the vectorized NumPy encoder is used when NumPy is available.
+
+    Returns:
+        bytes: The alternating color indices and run lengths of the encoded chunk.
+    """
+    shared_raster = shared_memory.SharedMemory(name=shared_name)
+    try:
+        assert shared_raster.buf is not None
+        chunk = bytes(shared_raster.buf[start_row * width:stop_row * width])
+    finally:
+        shared_raster.close()
+    if use_numpy and NUMPY_AVAILABLE:
+        return run_length_encode_rows_numpy(np.frombuffer(chunk, dtype=np.uint8).reshape(-1, width), width)
+    return run_length_encode_rows_python([chunk[start:start + width] for start in range(0, len(chunk), width)])
+
+
+def run_length_encode_rows_python(rows: "Sequence[Sequence[int]] | np.ndarray") -> bytes:
+    """Run-length encode raster rows with a pure-Python implementation.
+
+    Args:
+        rows (Sequence[Sequence[int]] | numpy.ndarray): The rows of pixel color codes to encode.
+
+    Returns:
+        bytes: The alternating color indices and run lengths of the encoded rows.
+
+    Raises:
+        ValueError: If a pixel value cannot be represented in a single byte.
+    """
+    encoded = bytearray()
+    for row in rows:
+        for color, run in groupby(row):
+            run_length = sum(1 for _ in run)
+            while run_length > MAX_RUN_LENGTH:  # Split long runs into maximum length runs of the same color.
+                encoded.extend((color, MAX_RUN_LENGTH))
+                run_length -= MAX_RUN_LENGTH
+            encoded.extend((color, run_length))
+    return bytes(encoded)
+
+
+def run_length_encode_rows_numpy(rows: "Sequence[Sequence[int]] | np.ndarray", width: int) -> bytes:
+    """Run-length encode raster rows by finding the run boundaries of every row with array operations.
+
+    Args:
+        rows (Sequence[Sequence[int]] | numpy.ndarray): The rows of pixel color codes to encode. This may be a 2D NumPy array.
+        width (int): The number of pixels in each row.
+
+    Returns:
+        bytes: The alternating color indices and run lengths of the encoded rows.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If a pixel value cannot be represented in a single byte.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for the vectorized run-length encoder")
+    pixels = _as_uint8_raster(rows, width)
+    if pixels.size == 0:
+        return b""
+    # A run starts at the beginning of every row and wherever a pixel differs from the pixel to its left.
+    run_starts_mask = np.ones(pixels.shape, dtype=bool)
+    run_starts_mask[:, 1:] = pixels[:, 1:] != pixels[:, :-1]
+    run_starts = np.flatnonzero(run_starts_mask)
+    run_lengths = np.diff(np.append(run_starts, pixels.size))
+    run_colors = pixels.ravel()[run_starts]
+    # Split runs longer than the maximum run length into full runs followed by the remainder.
+    split_counts = (run_lengths + MAX_RUN_LENGTH - 1) // MAX_RUN_LENGTH
+    pair_colors = np.repeat(run_colors, split_counts)
+    pair_lengths = np.full(pair_colors.size, MAX_RUN_LENGTH, dtype=np.uint8)
+    pair_lengths[np.cumsum(split_counts) - 1] = run_lengths - (MAX_RUN_LENGTH * (split_counts - 1))
+    encoded = np.empty(pair_colors.size * 2, dtype=np.uint8)
+    encoded[0::2] = pair_colors
+    encoded[1::2] = pair_lengths
+    return bytes(encoded.tobytes())
+
+
+def _as_uint8_raster(rows: "Sequence[Sequence[int]] | np.ndarray", width: int) -> "np.ndarray":
+    """Convert raster rows into a 2D uint8 NumPy array.
+
+    Args:
+        rows (Sequence[Sequence[int]] | numpy.ndarray): The rows of pixel color codes to convert.
+        width (int): The number of pixels in each row.
+
+    Returns:
+        numpy.ndarray: A (height, width) array of the pixel values.
+
+    Raises:
+        ValueError: If a pixel value cannot be represented in a single byte.
+    """
+    if not isinstance(rows, np.ndarray) and len(rows) > 0 and isinstance(rows[0], (bytes, bytearray, memoryview)):
+        # NumPy would read bytes rows as strings, so byte rows are joined into a single buffer instead.
+        return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(-1, width)  # type: ignore[arg-type]
+    pixels = np.asarray(rows)
+    if pixels.dtype != np.uint8:
+        if pixels.size > 0 and (pixels.min() < 0 or pixels.max() > 255):
+            raise ValueError("byte must be in range(0, 256)")
+        pixels = pixels.astype(np.uint8)
+    return pixels.reshape(-1, width)
+
+
+def run_length_decode_rows(encoded: bytes | bytearray | memoryview, width: int, use_numpy: bool = True) -> list[list[int]]:
+    """Decode the color-index and run-length pairs of a DAT raster into rows of pixels.
+
+    A trailing byte that does not complete a pair is ignored.
+    If the decoded pixels do not fill the last row, that partial row is still returned so that callers can report the mismatch against the expected raster height.
+
+    Args:
+        encoded (bytes | bytearray | memoryview): The alternating color indices and run lengths of the raster.
+        width (int): The number of pixels in each row.
+        use_numpy (bool, optional): If True, the vectorized NumPy decoder is used when NumPy is available. Defaults to True.
+
+    Returns:
+        list[list[int]]: The rows of pixel color codes, ordered from the bottom of the raster to the top.
+    """
+    return split_pixels_into_rows(run_length_expand(encoded, use_numpy=use_numpy), width)
+
+
+def run_length_decode_rows_python(encoded: bytes | bytearray | memoryview, width: int) -> list[list[int]]:
+    """Decode the color-index and run-length pairs of a DAT raster with a pure-Python implementation.
+
+    Args:
+        encoded (bytes | bytearray | memoryview): The alternating color indices and run lengths of the raster.
+        width (int): The number of pixels in each row.
+
+    Returns:
+        list[list[int]]: The rows of pixel color codes, ordered from the bottom of the raster to the top.
+    """
+    return split_pixels_into_rows(run_length_expand_python(encoded), width)
+
+
+def run_length_decode_rows_numpy(encoded: bytes | bytearray | memoryview, width: int) -> list[list[int]]:
+    """Decode the color-index and run-length pairs of a DAT raster by repeating each color by its run length with array operations.
+
+    Args:
+        encoded (bytes | bytearray | memoryview): The alternating color indices and run lengths of the raster.
+        width (int): The number of pixels in each row.
+
+    Returns:
+        list[list[int]]: The rows of pixel color codes, ordered from the bottom of the raster to the top.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    return split_pixels_into_rows(run_length_expand_numpy(encoded), width)
+
+
+def run_length_expand(encoded: bytes | bytearray | memoryview, use_numpy: bool = True) -> bytes:
+    """Expand color-index and run-length pairs into the flat sequence of pixels they encode, ignoring any trailing byte that does not complete a pair.
+
+    Args:
+        encoded (bytes | bytearray | memoryview): The alternating color indices and run lengths to expand.
+        use_numpy (bool, optional): If True, the vectorized NumPy implementation is used when NumPy is available. Defaults to True.
+
+    Returns:
+        bytes: The pixel color codes encoded by the pairs.
+    """
+    if use_numpy and NUMPY_AVAILABLE:
+        return run_length_expand_numpy(encoded)
+    return run_length_expand_python(encoded)
+
+
+def run_length_expand_python(encoded: bytes | bytearray | memoryview) -> bytes:
+    """Expand color-index and run-length pairs with a pure-Python implementation.
+
+    Args:
+        encoded (bytes | bytearray | memoryview): The alternating color indices and run lengths to expand.
+
+    Returns:
+        bytes: The pixel color codes encoded by the pairs.
+    """
+    encoded = bytes(encoded)
+    pair_bytes = (len(encoded) // 2) * 2
+    pixels = bytearray()
+    for color, run_length in zip(encoded[0:pair_bytes:2], encoded[1:pair_bytes:2]):
+        pixels += bytes((color,)) * run_length
+    return bytes(pixels)
+
+
+def run_length_expand_numpy(encoded: bytes | bytearray | memoryview) -> bytes:
+    """Expand color-index and run-length pairs by repeating each color by its run length with array operations.
+
+    Args:
+        encoded (bytes | bytearray | memoryview): The alternating color indices and run lengths to expand.
+
+    Returns:
+        bytes: The pixel color codes encoded by the pairs.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for the vectorized run-length decoder")
+    data = np.frombuffer(encoded, dtype=np.uint8)
+    pairs = data[:(data.size // 2) * 2].reshape(-1, 2)
+    return bytes(np.repeat(pairs[:, 0], pairs[:, 1]).tobytes())
+
+
+def split_pixels_into_rows(pixels: bytes, width: int) -> list[list[int]]:
+    """Split a flat sequence of pixels into rows, keeping any remaining partial row.
+
+    Args:
+        pixels (bytes): The pixel color codes to split.
+        width (int): The number of pixels in each row.
+
+    Returns:
+        list[list[int]]: The rows of pixel color codes.
+    """
+    if width <= 0:  # No row can be completed, so all pixels belong to a single partial row.
+        return [list(pixels)] if len(pixels) > 0 else []
+    # Building lists from byte slices is faster than converting an array with tolist().
+    return [list(pixels[start:start + width]) for start in range(0, len(pixels), width)]
+
+
+def run_length_row_index(encoded: bytes | bytearray | memoryview, width: int, use_numpy: bool = True) -> tuple[list[int], list[int]]:
+    """Find where each row of a run-length encoded raster begins with a single scan of the run lengths.
+
+    Args:
+        encoded (bytes | bytearray | memoryview): The alternating color indices and run lengths of the raster.
+        width (int): The number of pixels in each row.
+        use_numpy (bool, optional): If True, the vectorized NumPy implementation is used when NumPy is available. Defaults to True.
+
+    Returns:
+        tuple[list[int], list[int]]:
+            The byte offset of the pair that contains the first pixel of each row and the number of pixels of that pair's run that belong to earlier rows.
+            A partial last row is included.
+    """
+    run_lengths = bytes(encoded)[1:(len(encoded) // 2) * 2:2]
+    if width <= 0:  # No row can be completed, so any pixels belong to a single partial row.
+        return ([0], [0]) if any(run_lengths) else ([], [])
+    if use_numpy and NUMPY_AVAILABLE:
+        lengths = np.frombuffer(run_lengths, dtype=np.uint8)
+        run_ends = np.cumsum(lengths, dtype=np.int64)
+        pixel_count = int(run_ends[-1]) if run_ends.size > 0 else 0
+        row_starts = np.arange(0, pixel_count, width, dtype=np.int64)
+        # The pair containing a pixel is the first pair that ends after it, which skips any empty runs at a row boundary.
+        pair_indices = np.searchsorted(run_ends, row_starts, side='right')
+        run_starts = run_ends[pair_indices] - lengths[pair_indices]
+        return (pair_indices * 2).tolist(), (row_starts - run_starts).tolist()
+    row_offsets: list[int] = []
+    row_skips: list[int] = []
+    next_row_start = 0
+    run_start = 0
+    for pair_index, run_length in enumerate(run_lengths):
+        run_end = run_start + run_length
+        while next_row_start < run_end:  # This run contains the first pixel of one or more rows.
+            row_offsets.append(pair_index * 2)
+            row_skips.append(next_row_start - run_start)
+            next_row_start += width
+        run_start = run_end
+    return row_offsets, row_skips
@@ -7,9 +7,11 @@ The implementation is based on the CMU Textile Lab's knitout-to-dat.js functiona
 
 import os
 import struct
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from functools import cache
 
 from knitout_interpreter.knitout_execution_structures.Carriage_Pass import Carriage_Pass
-from knitout_interpreter.knitout_language.Knitout_Parser import parse_knitout
 from knitout_interpreter.knitout_operations.carrier_instructions import (
     Inhook_Instruction,
     Outhook_Instruction,
@@ -20,7 +22,6 @@ from knitout_interpreter.knitout_operations.kick_instruction import Kick_Instruc
 from knitout_interpreter.knitout_operations.knitout_instruction import (
     Knitout_Instruction,
 )
-from knitout_interpreter.knitout_operations.Knitout_Line import Knitout_Line
 from knitout_interpreter.knitout_operations.Pause_Instruction import Pause_Instruction
 from virtual_knitting_machine.Knitting_Machine import Knitting_Machine
 from virtual_knitting_machine.Knitting_Machine_Specification import (
@@ -46,6 +47,21 @@ from knitout_to_dat_python.dat_file_structure.dat_codes.option_value_colors impo
     Hook_Operation_Color,
     Knit_Cancel_Color,
 )
+from knitout_to_dat_python.dat_file_structure.dat_file_writer import (
+    Dat_File_Writer,
+)
+from knitout_to_dat_python.dat_file_structure.dat_raster import Dat_Raster
+from knitout_to_dat_python.dat_file_structure.dat_raster_digest import (
+    Dat_Raster_Digest,
+)
+from knitout_to_dat_python.dat_file_structure.dat_row_index import (
+    row_index_filename,
+    write_row_index,
+)
+from knitout_to_dat_python.dat_file_structure.dat_run_length_encoding import (
+    run_length_encode_rows,
+    run_length_row_index,
+)
 from knitout_to_dat_python.dat_file_structure.raster_carriage_passes.Outhook_Raster import (
     Outhook_Raster_Pass,
 )
@@ -59,8 +75,10 @@ from knitout_to_dat_python.dat_file_structure.raster_carriage_passes.Releasehook
     Releasehook_Raster_Pass,
 )
 from knitout_to_dat_python.kickback_injection.kickback_execution import (
+    Hook_State,
     Knitout_Executer_With_Kickbacks,
 )
+from knitout_to_dat_python.knitout_streaming import iter_knitout_lines
 
 
 class Knitout_to_Dat_Converter:
@@ -114,12 +132,19 @@ class Knitout_to_Dat_Converter:
 
     DATA_OFFSET = 0x600  # int: Offset where the run-length encoded data begins in the DAT file.
 
-    def __init__(self, knitout: str, dat_filename: str, knitout_in_file: bool = True):
+    BOOKEND_REFERENCE_WIDTH = 2  # int: The width of the bookend carriage passes whose option lines and operation colors are used to synthesize the bookend rows.
+
+    BOOKEND_ROW_CACHE_SIZE = 32  # int: The number of sets of rendered startup and ending rows that are kept for later conversions.
+
+    # The rendered startup and ending rows, paired with their run-length encodings, keyed by pattern width, buffers, and machine specification. Ordered from least to most recently used.
+    _bookend_row_cache: OrderedDict[tuple[int, int, int, str], tuple[tuple[tuple[bytes, bytes], ...], tuple[tuple[bytes, bytes], ...]]] = OrderedDict()
+
+    def __init__(self, knitout: str, dat_filename: str | None = None, knitout_in_file: bool = True):
         """Initialize a Dat_File instance.
 
         Args:
             knitout (str): Path to the input knitout file or knitout content string.
-            dat_filename (str): Name for the output DAT file.
+            dat_filename (str | None, optional): Name for the output DAT file. May be None if the DAT file is only produced in memory with get_dat_file_bytes(). Defaults to None.
             knitout_in_file (bool, optional): Whether knitout parameter is a file path (True) or content string (False). Defaults to True.
 
         Raises:
@@ -134,19 +159,20 @@ class Knitout_to_Dat_Converter:
         self._knitout_is_file: bool = knitout_in_file
         if self._knitout_is_file and not os.path.exists(self._knitout):
             raise FileNotFoundError(f"Knitout file not found: {self._knitout}")
-        self._dat_filename: str = dat_filename
+        self._dat_filename: str | None = dat_filename
         # Knitout parsing results
-        self._knitout_lines: list[Knitout_Line] = parse_knitout(self._knitout, pattern_is_file=self._knitout_is_file)
-        self._knitout_executer: Knitout_Executer_With_Kickbacks = Knitout_Executer_With_Kickbacks(self._knitout_lines, Knitting_Machine())
-        self._leftmost_slot: int = 0
-        self._rightmost_slot: int = 0
-        self._set_slot_range()
+        # The knitout program is parsed lazily as it is executed, so the parsed lines are only kept in the executed process.
+        self._knitout_executer: Knitout_Executer_With_Kickbacks = Knitout_Executer_With_Kickbacks(iter_knitout_lines(self._knitout, self._knitout_is_file), Knitting_Machine())
+        # The slot range is tracked by the executer as carriage passes are added. Programs without carriage passes use slot 0.
+        self._leftmost_slot: int = self._knitout_executer.leftmost_slot if self._knitout_executer.leftmost_slot is not None else 0
+        self._rightmost_slot: int = self._knitout_executer.rightmost_slot if self._knitout_executer.rightmost_slot is not None else 0
+        self._pattern_slot_offset: int = self._get_pattern_slot_offset()
         print(f"Needle bed specified as {self.specified_needle_bed_width} needles at gauge {self.specified_gauge} needles per inch.")
         # Pattern positioning info (derived from headers)
         self._position_offset: int = 0  # Offset for positioning the pattern on the needle bed.
         self._calculate_positioning()
         # Initialize properties that will be set during processing
-        self._raster_data: list[list[int]] = []  # 2D array of pixel values representing the complete DAT raster.
+        self._raster_data: Dat_Raster = Dat_Raster(0)  # 2D array of pixel values representing the complete DAT raster.
 
     @property
     def dat_width(self) -> int:
@@ -158,7 +184,7 @@ class Knitout_to_Dat_Converter:
         if len(self._raster_data) == 0:
             return 0
         else:
-            return len(self._raster_data[0])
+            return self._raster_data.width
 
     @property
     def dat_height(self) -> int:
@@ -169,31 +195,14 @@ class Knitout_to_Dat_Converter:
         """
         return len(self._raster_data)
 
-    def _set_slot_range(self) -> None:
-        """Set the leftmost and rightmost slot ranges used in the knitout process.
+    @property
+    def unique_row_count(self) -> int:
+        """Get the number of distinct rows in the raster of the dat file.
 
-        Analyzes all carriage passes to determine the minimum and maximum needle positions used, accounting for racking offsets to determine the effective slot range.
+        Returns:
+            int: The number of distinct rows in the raster. Repeated rows are stored and encoded once.
         """
-
-        def _carriage_pass_range(carriage_pass: Carriage_Pass) -> tuple[int, int]:
-            """Get the leftmost and rightmost needle positions in the carriage pass.
-
-            Returns:
-                tuple[int, int]: Left most and Right most needle positions in the carriage pass.
-            """
-            sorted_needles = carriage_pass.rightward_sorted_needles()
-            return int(sorted_needles[0].racked_position_on_front(cp.rack)), int(sorted_needles[-1].racked_position_on_front(cp.rack))
-
-        min_left, max_right = 1000, -1
-        for cp in self._knitout_executer.process:
-            if isinstance(cp, Carriage_Pass):
-                left, right = _carriage_pass_range(cp)
-                if left < min_left:
-                    min_left = left
-                if right > max_right:
-                    max_right = right
-        self._leftmost_slot = min_left
-        self._rightmost_slot = max_right
+        return self._raster_data.unique_row_count
 
     @property
     def leftmost_slot(self) -> int:
@@ -203,7 +212,6 @@ class Knitout_to_Dat_Converter:
             int: The minimum needle position of operations in the knitout code. If the knitout never uses a needle position, this will be set to 0.
         """
         return self._leftmost_slot
-        # return self.knitout_executer.left_most_position if self.knitout_executer.left_most_position is not None else 0
 
     @property
     def rightmost_slot(self) -> int:
@@ -213,7 +221,18 @@ class Knitout_to_Dat_Converter:
             int: The maximum needle position of operations in the knitout code. If the knitout never uses a needle position, this will be set to 0.
         """
         return self._rightmost_slot
-        # return self.knitout_executer.right_most_position if self.knitout_executer.right_most_position is not None else 0
+
+    @property
+    def pattern_slot_offset(self) -> int:
+        """Get the translation from the slots of knitout carriage passes to the slots of the DAT raster.
+
+        Patterns with operations left of slot 0 are shifted right so that their leftmost slot is 0.
+        Patterns whose raster passes, including the passes of hook operations, do not use slot 0 are offset 1 to the left.
+
+        Returns:
+            int: The amount added to each slot of a knitout carriage pass when it is rendered into the DAT raster.
+        """
+        return self._pattern_slot_offset
 
     @property
     def slot_range(self) -> tuple[int, int]:
@@ -338,102 +357,97 @@ class Knitout_to_Dat_Converter:
             pattern_horizontal_buffer (int, optional): Horizontal spacing buffer around the pattern. Defaults to 4.
             option_horizontal_buffer (int, optional): Horizontal spacing buffer around option lines. Defaults to 10.
         """
-        # Create empty lower padding and startup sequence raster
-        startup_sequence = self._get_startup_rasters()
-        startup_rasters = [cp.get_raster_row(self.knitting_width, option_horizontal_buffer, pattern_horizontal_buffer) for cp in startup_sequence]
-        dat_width = len(startup_rasters[0])
-        base_spacer = [[0 for _ in range(dat_width)] for _ in range(pattern_vertical_buffer)]
-        self._raster_data: list[list[int]] = base_spacer
-        self._extend_raster_data(startup_rasters)
+        self._raster_data = Dat_Raster(Raster_Carriage_Pass.raster_width(self.knitting_width, option_horizontal_buffer, pattern_horizontal_buffer))
+        self.write_raster_rows(self._raster_data, pattern_vertical_buffer, pattern_horizontal_buffer, option_horizontal_buffer)
 
-        # Add rasters for the knitout process.
-        knitting_sequence = self._get_pattern_rasters()
-        has_0_slot = False
-        for cp in knitting_sequence:
-            if 0 in cp.slot_colors:
-                has_0_slot = True
-                break
-        if not has_0_slot:
-            offset_slots = -1
-        else:
-            offset_slots = 0
-        self._extend_raster_data([cp.get_raster_row(self.knitting_width, option_horizontal_buffer, pattern_horizontal_buffer, offset_slots=offset_slots) for cp in knitting_sequence])
+    def write_raster_rows(self, row_sink: Dat_Raster | Dat_File_Writer | Dat_Raster_Digest,
+                          pattern_vertical_buffer: int = 5, pattern_horizontal_buffer: int = 4, option_horizontal_buffer: int = 10) -> None:
+        """Pull each row of the raster of the parsed knitout instructions into the given sink as it is generated.
 
-        # Create ending sequence
-        end_sequence = self._get_end_rasters()
-        self._extend_raster_data([cp.get_raster_row(self.knitting_width, option_horizontal_buffer, pattern_horizontal_buffer) for cp in end_sequence])
+        Rows are generated lazily, so only the sink determines how much of the raster is kept in memory.
 
-        # Add pattern spacing buffer
-        empty_line = [0] * self.dat_width
-        self._append_to_raster_data(empty_line)
-        width_line = self._get_knitting_width_raster(pattern_horizontal_buffer, option_horizontal_buffer)
-        self._append_to_raster_data(width_line)
+        Args:
+            row_sink (Dat_Raster | Dat_File_Writer | Dat_Raster_Digest): The raster, DAT file writer, or raster digest that receives the rows. Its width must match the raster width of the buffers.
+            pattern_vertical_buffer (int, optional): Vertical spacing buffer around the pattern. Defaults to 5.
+            pattern_horizontal_buffer (int, optional): Horizontal spacing buffer around the pattern. Defaults to 4.
+            option_horizontal_buffer (int, optional): Horizontal spacing buffer around option lines. Defaults to 10.
 
-        # Add top buffer
-        base_spacer = [[0 for _ in range(dat_width)] for _ in range(pattern_vertical_buffer + 1)]
-        self._extend_raster_data(base_spacer)
+        Raises:
+            AssertionError: If the width of the sink does not match the raster width.
+        """
+        row_sink.extend_rows(self.generate_raster_rows(pattern_vertical_buffer, pattern_horizontal_buffer, option_horizontal_buffer))
 
-    def _append_to_raster_data(self, row: list[int]) -> None:
-        """Append a single row to the raster data.
+    def raster_digest(self, pattern_vertical_buffer: int = 5, pattern_horizontal_buffer: int = 4, option_horizontal_buffer: int = 10) -> str:
+        """Hash the raster of the parsed knitout instructions without storing or writing it.
 
         Args:
-            row (list[int]): The row to append to the raster data.
+            pattern_vertical_buffer (int, optional): Vertical spacing buffer around the pattern. Defaults to 5.
+            pattern_horizontal_buffer (int, optional): Horizontal spacing buffer around the pattern. Defaults to 4.
+            option_horizontal_buffer (int, optional): Horizontal spacing buffer around option lines. Defaults to 10.
 
-        Raises:
-            AssertionError: If the row length doesn't match the expected DAT width.
+        Returns:
+            str: The hexadecimal digest of the raster width and every pixel of the raster.
         """
-        assert len(row) == self.dat_width
-        self._raster_data.append(row)
+        digest = Dat_Raster_Digest(Raster_Carriage_Pass.raster_width(self.knitting_width, option_horizontal_buffer, pattern_horizontal_buffer))
+        self.write_raster_rows(digest, pattern_vertical_buffer, pattern_horizontal_buffer, option_horizontal_buffer)
+        return digest.hexdigest()
 
-    def _extend_raster_data(self, rows: list[list[int]]) -> None:
-        """Extend the raster data with multiple rows.
+    def generate_raster_rows(self, pattern_vertical_buffer: int = 5, pattern_horizontal_buffer: int = 4, option_horizontal_buffer: int = 10) -> Iterator[Sequence[int]]:
+        """Generate the rows of the raster of the parsed knitout instructions from the bottom of the raster to the top.
 
         Args:
-            rows (list[list[int]]): The rows to extend the raster data with.
+            pattern_vertical_buffer (int, optional): Vertical spacing buffer around the pattern. Defaults to 5.
+            pattern_horizontal_buffer (int, optional): Horizontal spacing buffer around the pattern. Defaults to 4.
+            option_horizontal_buffer (int, optional): Horizontal spacing buffer around option lines. Defaults to 10.
 
-        Raises:
-            AssertionError: If any row length doesn't match the expected DAT width.
+        Yields:
+            Sequence[int]: Each row of the raster, all of the same width. Rows of the startup and ending sequences are shared bytes objects.
         """
-        for row in rows:
-            self._append_to_raster_data(row)
+        dat_width = Raster_Carriage_Pass.raster_width(self.knitting_width, option_horizontal_buffer, pattern_horizontal_buffer)
+        startup_rows, end_rows = self._get_bookend_rows(pattern_horizontal_buffer, option_horizontal_buffer)
+        # Create empty lower padding and startup sequence raster
+        for _ in range(pattern_vertical_buffer):
+            yield [0] * dat_width
+        for row, _encoded in startup_rows:
+            yield row
+
+        # Add rasters for the knitout process.
+        pattern_slot_offset = self.pattern_slot_offset
+        for cp in self._iter_pattern_rasters():
+            yield cp.get_raster_row(self.knitting_width, option_horizontal_buffer, pattern_horizontal_buffer, offset_slots=pattern_slot_offset)
+
+        # Create ending sequence
+        for row, _encoded in end_rows:
+            yield row
 
-    def run_length_encode(self) -> list[int]:
+        # Add pattern spacing buffer
+        yield [0] * dat_width
+        yield self._get_knitting_width_raster(pattern_horizontal_buffer, option_horizontal_buffer)
+
+        # Add top buffer
+        for _ in range(pattern_vertical_buffer + 1):
+            yield [0] * dat_width
+
+    def run_length_encode(self, use_numpy: bool = True, parallel: bool = False, max_workers: int | None = None) -> bytes:
         """Run-length encode the raster data into index-length pairs.
 
         Compresses the raster data using run-length encoding where consecutive pixels of the same color are represented as color-index and run-length pairs.
         This is the standard compression method used in DAT files.
 
+        Args:
+            use_numpy (bool, optional): If True, the vectorized NumPy encoder is used when NumPy is installed. Otherwise, the pure-Python encoder is used. Defaults to True.
+            parallel (bool, optional): If True, chunks of rows are encoded in parallel worker processes that share the raster through shared memory. Defaults to False.
+            max_workers (int | None, optional): The maximum number of worker processes used for parallel encoding. Defaults to None, which uses the number of processors.
+
         Returns:
-            list[int]: List of alternating color indices and run lengths.
+            bytes: Alternating color indices and run lengths.
 
         Raises:
             ValueError: If no raster data exists to encode.
         """
         if not self._raster_data:
             raise ValueError("No raster data to encode. Call create_empty_raster() first.")
-
-        index_length_pairs = []
-
-        for y in range(self.dat_height):
-            current_color = self._raster_data[y][0]
-            run_length = 0
-            assert len(self._raster_data[y]) == self.dat_width
-            for x in range(self.dat_width):
-                pixel = self._raster_data[y][x]
-
-                if pixel == current_color and run_length < 255:
-                    run_length += 1
-                else:
-                    # Output the current run
-                    index_length_pairs.extend([current_color, run_length])
-                    current_color = pixel
-                    run_length = 1
-
-                # Handle end of row
-                if x == self.dat_width - 1:
-                    index_length_pairs.extend([current_color, run_length])
-
-        return index_length_pairs
+        return self._raster_data.run_length_encode(use_numpy=use_numpy, parallel=parallel, max_workers=max_workers)
 
     def create_dat_header(self) -> bytearray:
         """Create the DAT file header.
@@ -443,17 +457,7 @@ class Knitout_to_Dat_Converter:
         Returns:
             bytearray: Header as a bytearray of HEADER_SIZE bytes.
         """
-        header = bytearray(self.HEADER_SIZE)
-
-        # Write header values in little-endian format
-        struct.pack_into('<H', header, 0x00, 0)  # x-min
-        struct.pack_into('<H', header, 0x02, 0)  # y-min
-        struct.pack_into('<H', header, 0x04, self.dat_width - 1)  # x-max
-        struct.pack_into('<H', header, 0x06, self.dat_height - 1)  # y-max
-        struct.pack_into('<H', header, 0x08, 1000)  # magic number 1
-        struct.pack_into('<H', header, 0x10, 1000)  # magic number 2
-
-        return header
+        return self._create_dat_prefix()[:self.HEADER_SIZE]
 
     @staticmethod
     def create_palette_section() -> bytearray:
@@ -464,29 +468,123 @@ class Knitout_to_Dat_Converter:
         Returns:
             bytearray: Palette section as a bytearray (padded to PALETTE_SIZE).
         """
-        palette_section = bytearray(Knitout_to_Dat_Converter.PALETTE_SIZE)
-        palette_section[:len(Knitout_to_Dat_Converter._PALETTE_BYTES)] = Knitout_to_Dat_Converter._PALETTE_BYTES
-        return palette_section
+        return bytearray(Knitout_to_Dat_Converter._dat_prefix_template()[Knitout_to_Dat_Converter.HEADER_SIZE:])
+
+    @staticmethod
+    @cache
+    def _dat_prefix_template() -> bytes:
+        """Build the header and palette sections that precede the raster data of every DAT file.
+
+        The template is built once and shared by all DAT files. Its x-max and y-max header values are left as 0 to be filled in for each file.
+
+        Returns:
+            bytes: The DATA_OFFSET bytes of the header and padded palette sections.
+        """
+        prefix = bytearray(Knitout_to_Dat_Converter.DATA_OFFSET)
+        # Write header values in little-endian format. x-min and y-min are always 0.
+        struct.pack_into('<H', prefix, 0x08, 1000)  # magic number 1
+        struct.pack_into('<H', prefix, 0x10, 1000)  # magic number 2
+        palette_start = Knitout_to_Dat_Converter.HEADER_SIZE
+        prefix[palette_start:palette_start + len(Knitout_to_Dat_Converter._PALETTE_BYTES)] = Knitout_to_Dat_Converter._PALETTE_BYTES
+        return bytes(prefix)
+
+    def _create_dat_prefix(self) -> bytearray:
+        """Create the header and palette sections of this DAT file.
+
+        Returns:
+            bytearray: A copy of the shared prefix template with the x-max and y-max of this raster written into the header.
+        """
+        prefix = bytearray(self._dat_prefix_template())
+        struct.pack_into('<HH', prefix, 0x04, self.dat_width - 1, self.dat_height - 1)  # x-max, y-max
+        return prefix
+
+    def _get_bookend_rows(self, pattern_buffer: int = 4, option_buffer: int = 10) -> tuple[tuple[tuple[bytes, bytes], ...], tuple[tuple[bytes, bytes], ...]]:
+        """Get the rendered rows of the startup and ending sequences with their run-length encodings.
+
+        The rows only depend on the pattern width, the buffers, and the machine specification.
+        They are synthesized once and kept in a least-recently-used cache shared by all converters, so conversions of the same width do not rebuild the bookend carriage passes.
+
+        Args:
+            pattern_buffer (int, optional): Buffer space around the pattern. Defaults to 4.
+            option_buffer (int, optional): Buffer space around option lines. Defaults to 10.
+
+        Returns:
+            tuple[tuple[tuple[bytes, bytes], ...], tuple[tuple[bytes, bytes], ...]]:
+            The startup rows and the ending rows, from the bottom of the raster up. Each row is paired with its run-length encoding.
+        """
+        key = (self.knitting_width, pattern_buffer, option_buffer, repr(self.machine_specification))
+        row_cache = Knitout_to_Dat_Converter._bookend_row_cache
+        bookend_rows = row_cache.get(key)
+        if bookend_rows is None:
+            dat_width = Raster_Carriage_Pass.raster_width(self.knitting_width, option_buffer, pattern_buffer)
+
+            def _encode(rows: list[list[int]]) -> tuple[tuple[bytes, bytes], ...]:
+                return tuple((bytes(row), run_length_encode_rows([bytes(row)], dat_width, use_numpy=False)) for row in rows)
+
+            startup_rows, end_rows = self._synthesize_bookend_rows(pattern_buffer, option_buffer)
+            bookend_rows = _encode(startup_rows), _encode(end_rows)
+            row_cache[key] = bookend_rows
+            if len(row_cache) > self.BOOKEND_ROW_CACHE_SIZE:
+                row_cache.popitem(last=False)
+        else:
+            row_cache.move_to_end(key)
+        return bookend_rows
+
+    def _synthesize_bookend_rows(self, pattern_buffer: int = 4, option_buffer: int = 10) -> tuple[list[list[int]], list[list[int]]]:
+        """Render the rows of the startup and ending sequences without building their carriage passes at the full pattern width.
+
+        Every bookend pass performs the same operation on every slot of the pattern, so only its operation color and option lines are needed.
+        These are taken from the bookend passes of a BOOKEND_REFERENCE_WIDTH pattern, and the operation color is painted across the full width.
+        The startup_knit_sequence and finish_knit_sequence passes at the full width remain the reference for these rows.
 
-    def _get_startup_rasters(self) -> list[Raster_Carriage_Pass]:
+        Args:
+            pattern_buffer (int, optional): Buffer space around the pattern. Defaults to 4.
+            option_buffer (int, optional): Buffer space around option lines. Defaults to 10.
+
+        Returns:
+            tuple[list[list[int]], list[list[int]]]: The startup rows and the ending rows, from the bottom of the raster up.
+
+        Raises:
+            ValueError: If a reference bookend pass does not perform the same operation on every slot.
+        """
+        pattern_width = self.knitting_width
+        reference_width = min(pattern_width, self.BOOKEND_REFERENCE_WIDTH)
+        bookend_rows: tuple[list[list[int]], list[list[int]]] = ([], [])
+        for rows, carriage_passes in zip(bookend_rows, (self._get_startup_rasters(reference_width), self._get_end_rasters(reference_width))):
+            for cp in carriage_passes:
+                if reference_width < pattern_width:
+                    operation_color = cp.slot_colors[0]
+                    if any(color is not operation_color for color in cp.slot_colors.values()):
+                        raise ValueError(f"Expected a uniform bookend pass, got {cp.slot_colors}")
+                    cp.slot_colors = dict.fromkeys(range(pattern_width), operation_color)
+                rows.append(cp.get_raster_row(pattern_width, option_buffer, pattern_buffer))
+        return bookend_rows
+
+    def _get_startup_rasters(self, pattern_width: int | None = None) -> list[Raster_Carriage_Pass]:
         """Get the list of raster carriage passes for the startup knitting sequences.
 
+        Args:
+            pattern_width (int | None, optional): The width of the startup passes. Defaults to None, which uses the knitting width.
+
         Returns:
             list[Raster_Carriage_Pass]: The list of raster carriage passes for the startup knitting sequences of the pattern width.
         """
-        startup_sequence = startup_knit_sequence(self.knitting_width)
+        startup_sequence = startup_knit_sequence(self.knitting_width if pattern_width is None else pattern_width)
         return [Raster_Carriage_Pass(cp, self.machine_specification, min_knitting_slot=self.leftmost_slot, max_knitting_slot=self.rightmost_slot, stitch_number=0)
                 for cp in startup_sequence]
 
-    def _get_end_rasters(self) -> list[Raster_Carriage_Pass]:
+    def _get_end_rasters(self, pattern_width: int | None = None) -> list[Raster_Carriage_Pass]:
         """Get the list of raster carriage passes for the ending knitting sequences.
 
         Creates the ending sequence rasters with the final pass configured for drop sinker operation to properly complete the knitting process.
 
+        Args:
+            pattern_width (int | None, optional): The width of the ending passes. Defaults to None, which uses the knitting width.
+
         Returns:
             list[Raster_Carriage_Pass]: The list of raster carriage passes for the ending knitting sequences.
         """
-        ending_sequence = finish_knit_sequence(self.knitting_width)
+        ending_sequence = finish_knit_sequence(self.knitting_width if pattern_width is None else pattern_width)
         rasters = [Raster_Carriage_Pass(cp, self.machine_specification, min_knitting_slot=self.leftmost_slot, max_knitting_slot=self.rightmost_slot, stitch_number=0) for cp in ending_sequence[:-1]]
         sinker_raster = Raster_Carriage_Pass(ending_sequence[-1], self.machine_specification, min_knitting_slot=self.leftmost_slot, max_knitting_slot=self.rightmost_slot, stitch_number=0,
                                              drop_sinker=True)
@@ -508,51 +606,124 @@ class Knitout_to_Dat_Converter:
         Raises:
             AssertionError: If the generated raster width doesn't match the expected DAT width.
         """
+        dat_width = Raster_Carriage_Pass.raster_width(self.knitting_width, option_buffer, pattern_buffer)
         option_buffer = Raster_Carriage_Pass.get_option_margin_width(option_buffer)
         raster = [0] * option_buffer  # Left black space of the row
         width_specifier = self.knitting_width + (2 * pattern_buffer) + 2  # Knitting width + left and right buffer + 2 stop markers
         raster.extend([WIDTH_SPECIFIER] * width_specifier)
         raster.extend([0] * option_buffer)
-        assert len(raster) == self.dat_width, f"Raster is {len(raster)} pixels wide, but expected {self.dat_width}"
+        assert len(raster) == dat_width, f"Raster is {len(raster)} pixels wide, but expected {dat_width}"
         return raster
 
+    def _get_pattern_slot_offset(self) -> int:
+        """Get the pattern slot offset from the slots recorded while the program was executed.
+
+        A pattern with negative slots uses slot 0 once it is shifted, because its leftmost slot is operated by a carriage pass.
+        Otherwise, slot 0 is used if a carriage pass operates on it or if a releasehook or outhook is rastered at a carrier on slot 0.
+
+        Returns:
+            int: The amount added to each slot of a knitout carriage pass when it is rendered into the DAT raster.
+        """
+        if self._leftmost_slot < 0:
+            return -self._leftmost_slot
+        elif self._knitout_executer.passes_use_slot_0 or self._hook_rasters_use_slot_0():
+            return 0
+        else:
+            return -1
+
+    def _hook_rasters_use_slot_0(self) -> bool:
+        """Check if the raster passes of a releasehook or outhook are placed on slot 0.
+
+        Hook rasters are placed at the carrier position recorded in the hook state.
+        As in _iter_pattern_rasters, an outhook that follows a rightward pass of only its carrier is set on that pass and is not rastered on its own.
+        Only the process steps between hook instructions and the carriage passes before them are read, so the program is not rasterized.
+
+        Returns:
+            bool: True if a releasehook or outhook raster pass is placed on slot 0.
+        """
+        process = self._knitout_executer.process
+        last_carriers: tuple[int, ...] | None = None  # The carriers of the most recent raster pass if it is a rightward pass with carriers.
+        previous_step = -1
+        for step, hook_state in sorted(self._knitout_executer.hook_states.items()):
+            for prior_step in range(step - 1, previous_step, -1):
+                execution = process[prior_step]
+                if isinstance(execution, Carriage_Pass):
+                    carrier_set = execution.carrier_set
+                    last_carriers = tuple(carrier_set.carrier_ids) if execution.direction is Carriage_Pass_Direction.Rightward and carrier_set is not None else None
+                    break
+            previous_step = step
+            hook_instruction = process[step]
+            if isinstance(hook_instruction, Outhook_Instruction) and last_carriers == (hook_instruction.carrier_id,):
+                continue  # The outhook is set on the last pass.
+            if hook_state.carrier_position == 0:
+                return True
+            last_carriers = (hook_instruction.carrier_id,) if isinstance(hook_instruction, Outhook_Instruction) else None  # Outhook passes are rightward passes of the carrier.
+        return False
+
     def _get_pattern_rasters(self) -> list[Raster_Carriage_Pass]:
         """Get list of raster carriage passes for each carriage pass in the program.
 
-        Processes each instruction and carriage pass in the knitout execution, handling carrier management, hook operations, pause instructions, and carriage movement optimization.
-        Updates carriage move settings based on repeated direction changes.
-
         Returns:
             list[Raster_Carriage_Pass]: List of raster carriage passes for each carriage pass in the program.
+        """
+        return list(self._iter_pattern_rasters())
+
+    def _iter_pattern_rasters(self) -> Iterator[Raster_Carriage_Pass]:
+        """Generate the raster carriage passes for each carriage pass in the program, in order.
+
+        Processes each instruction and carriage pass in the knitout execution, handling carrier management, hook operations, pause instructions, and carriage movement optimization.
+        Outhook and pause instructions can change the most recent raster pass, so each pass is held back until the next pass is created.
+        Carriage move settings are set based on repeated direction changes as each pass is completed.
+        The slots of the passes are not offset. The pattern_slot_offset is applied when each pass is rendered.
+        Releasehook and outhook passes are rastered from the hook states recorded by the knitout executer, so the program is not executed again.
+
+        Yields:
+            Raster_Carriage_Pass: The completed raster carriage pass of each carriage pass in the program.
 
         Raises:
-            AssertionError: If inhook operation is attempted on a rightward knitting pass or if a carriage pass cannot be executed on the machine state.
+            AssertionError: If inhook operation is attempted on a rightward knitting pass or if an outhook precedes all carriage passes.
         """
-        raster_passes: list[Raster_Carriage_Pass] = []
         inhook_carriers: set[int] = set()
-        current_machine_state = Knitting_Machine(self.machine_specification)
+        hook_states = self._knitout_executer.hook_states
+        last_color = Carriage_Pass_Direction_Color.Unspecified
+
+        def _complete_pass(raster_pass: Raster_Carriage_Pass) -> Raster_Carriage_Pass:
+            """Update the carriage move (knit-cancel) value of a raster pass that will no longer change.
+
+            Args:
+                raster_pass (Raster_Carriage_Pass): The raster pass to complete.
+
+            Returns:
+                Raster_Carriage_Pass: The completed raster pass.
+            """
+            nonlocal last_color
+            direction_color = raster_pass.direction_color
+            if direction_color is not Carriage_Pass_Direction_Color.Unspecified:
+                if last_color == direction_color:
+                    raster_pass.knit_cancel = Knit_Cancel_Color.Carriage_Move  # Move carriage to return for repeated movement in same direction.
+                last_color = direction_color
+            return raster_pass
 
+        last_raster_pass: Raster_Carriage_Pass | None = None  # The most recent raster pass, which has not been yielded yet.
         pause_after_next_pass: bool = False
-        for execution in self._knitout_executer.process:
+        for step, execution in enumerate(self._knitout_executer.process):
+            new_passes: list[Raster_Carriage_Pass] = []
             if isinstance(execution, Knitout_Instruction):
                 instruction = execution
                 if isinstance(instruction, Inhook_Instruction):
                     inhook_carriers.add(instruction.carrier_id)
                 elif isinstance(instruction, Releasehook_Instruction):
-                    release_passes = self._raster_releasehook(current_machine_state, instruction)
-                    raster_passes.extend(release_passes)
+                    new_passes.extend(self._raster_releasehook(hook_states[step], instruction))
                 elif isinstance(instruction, Outhook_Instruction):
-                    last_raster_pass = raster_passes[-1]
+                    assert last_raster_pass is not None, f"Knitout Error: Cannot outhook carrier {instruction.carrier_id} before any carriage pass."
                     if (last_raster_pass.carriage_pass.direction is Carriage_Pass_Direction.Rightward
                             and last_raster_pass.carriage_pass.carrier_set is not None and
                             len(last_raster_pass.carriage_pass.carrier_set.carrier_ids) == 1 and last_raster_pass.carriage_pass.carrier_set.carrier_ids[0] == instruction.carrier_id):
                         last_raster_pass.hook_operation = Hook_Operation_Color.Out_Hook_Operation
                     else:
-                        outhook_passes = self._raster_outhook(current_machine_state, instruction)
-                        raster_passes.extend(outhook_passes)
+                        new_passes.extend(self._raster_outhook(hook_states[step], instruction))
                 elif isinstance(instruction, Pause_Instruction):
                     pause_after_next_pass = True
-                instruction.execute(current_machine_state)  # update machine state as the raster progresses.
             elif isinstance(execution, Carriage_Pass):
                 carriage_pass = execution
                 hook_operation = Hook_Operation_Color.No_Hook_Operation
@@ -564,32 +735,23 @@ class Knitout_to_Dat_Converter:
                 raster_pass = Raster_Carriage_Pass(carriage_pass, self.machine_specification, min_knitting_slot=self.leftmost_slot, max_knitting_slot=self.rightmost_slot,
                                                    hook_operation=hook_operation, pause=pause_after_next_pass)
                 pause_after_next_pass = False  # reset pause after it has been applied to an instruction.
-                raster_passes.append(raster_pass)
-                carriage_pass.execute(current_machine_state)  # update teh machine state as the raster progresses
-        if pause_after_next_pass:  # if pause after next pass is still set, add it to the last operation.
-            raster_passes[-1].pause = True
-
-        if self._leftmost_slot < 0:
-            for raster_pass in raster_passes:
-                raster_pass.shift_slot_colors(abs(self._leftmost_slot))
-
-        # update carriage move (knit-cancel) values based on carriage pass directions.
-        last_color = Carriage_Pass_Direction_Color.Unspecified
-        for raster_pass in raster_passes:
-            direction_color = raster_pass.direction_color
-            if direction_color is not Carriage_Pass_Direction_Color.Unspecified:
-                if last_color == direction_color:
-                    raster_pass.knit_cancel = Knit_Cancel_Color.Carriage_Move  # Move carriage to return for repeated movement in same direction.
-                last_color = direction_color
-        return raster_passes
-
-    def _raster_outhook(self, current_machine_state: Knitting_Machine, outhook_instruction: Outhook_Instruction) -> list[Soft_Miss_Raster_Pass]:
+                new_passes.append(raster_pass)
+            for raster_pass in new_passes:
+                if last_raster_pass is not None:
+                    yield _complete_pass(last_raster_pass)
+                last_raster_pass = raster_pass
+        if last_raster_pass is not None:
+            if pause_after_next_pass:  # if pause after next pass is still set, add it to the last operation.
+                last_raster_pass.pause = True
+            yield _complete_pass(last_raster_pass)
+
+    def _raster_outhook(self, hook_state: Hook_State, outhook_instruction: Outhook_Instruction) -> list[Soft_Miss_Raster_Pass]:
         """Create raster passes for outhook operations.
 
         Generates the necessary raster passes to perform an outhook operation, including an optional preliminary kick pass if the carriage is in the wrong direction.
 
         Args:
-            current_machine_state (Knitting_Machine): The current state of the knitting machine.
+            hook_state (Hook_State): The state of the knitting machine recorded before the outhook instruction was executed.
             outhook_instruction (Outhook_Instruction): The outhook instruction to convert to raster passes.
 
         Returns:
@@ -599,9 +761,9 @@ class Knitout_to_Dat_Converter:
             AssertionError: If the carrier to be outhooked has no position.
         """
         outhook_passes = []
-        carrier_position = current_machine_state.carrier_system[outhook_instruction.carrier_id].position
+        carrier_position = hook_state.carrier_position
         assert isinstance(carrier_position, int), f"Cannot outhook a carrier that has no position: {outhook_instruction.carrier_id}"
-        if current_machine_state.carriage.last_direction is Carriage_Pass_Direction.Rightward:  # Need to reset carriage pass so that release is on its own pass.
+        if hook_state.carriage_direction is Carriage_Pass_Direction.Rightward:  # Need to reset carriage pass so that release is on its own pass.
             kick_for_out = Kick_Instruction(carrier_position, Carriage_Pass_Direction.Leftward, Yarn_Carrier_Set([outhook_instruction.carrier_id]), comment="Kick to outhook rightward on new pass.")
             soft_miss_pass = Soft_Miss_Raster_Pass(kick_for_out, self.machine_specification, min_knitting_slot=self.leftmost_slot, max_knitting_slot=self.rightmost_slot)
             outhook_passes.append(soft_miss_pass)
@@ -610,7 +772,7 @@ class Knitout_to_Dat_Converter:
         outhook_passes.append(outhook_pass)
         return outhook_passes
 
-    def _raster_releasehook(self, current_machine_state: Knitting_Machine, release_instruction: Releasehook_Instruction) -> list[Soft_Miss_Raster_Pass]:
+    def _raster_releasehook(self, hook_state: Hook_State, release_instruction: Releasehook_Instruction) -> list[Soft_Miss_Raster_Pass]:
         """Create raster passes for releasehook operations.
 
         Generates the necessary raster passes to perform a releasehook operation.
@@ -618,7 +780,7 @@ class Knitout_to_Dat_Converter:
         If the carriage's last move was in the release direction, a Soft-Miss pass is added with knit-cancel for carriage movement.
 
         Args:
-            current_machine_state (Knitting_Machine): The current state of the knitting process that is being rendered. Used to get carrier and carriage position data.
+            hook_state (Hook_State): The state of the knitting machine recorded before the releasehook instruction was executed. Used to get carrier and carriage position data.
             release_instruction (Releasehook_Instruction): The release hook instruction to raster.
 
         Returns:
@@ -628,10 +790,11 @@ class Knitout_to_Dat_Converter:
             AssertionError: If the carrier to be released has no position.
         """
         release_passes = []
-        release_carrier_position = current_machine_state.carrier_system[release_instruction.carrier_id].position
+        release_carrier_position, hook_input_direction = hook_state.carrier_position, hook_state.hook_input_direction
         assert isinstance(release_carrier_position, int), f"Cannot release a carrier that has no position: {release_instruction.carrier_id}"
-        if current_machine_state.carrier_system.hook_input_direction is current_machine_state.carriage.last_direction:  # Add a miss pass to align the carriage for correct release direction.
-            kick_to_release = Kick_Instruction(release_carrier_position, ~current_machine_state.carrier_system.hook_input_direction, comment="Kick to set release direction.")
+        if hook_input_direction is hook_state.carriage_direction:  # Add a miss pass to align the carriage for correct release direction.
+            assert hook_input_direction is not None
+            kick_to_release = Kick_Instruction(release_carrier_position, ~hook_input_direction, comment="Kick to set release direction.")
             soft_miss_pass = Soft_Miss_Raster_Pass(kick_to_release, self.machine_specification, min_knitting_slot=self.leftmost_slot, max_knitting_slot=self.rightmost_slot)
             release_passes.append(soft_miss_pass)
         releasehook_pass = Releasehook_Raster_Pass(release_carrier_position, self.machine_specification,
@@ -639,10 +802,15 @@ class Knitout_to_Dat_Converter:
         release_passes.append(releasehook_pass)
         return release_passes
 
-    def write_dat_file(self) -> None:
-        """Write the complete DAT file to disk.
+    def get_dat_file_bytes(self, parallel: bool = False, max_workers: int | None = None) -> bytes:
+        """Create the complete content of the DAT file in memory.
 
-        Creates the complete binary DAT file including header, palette, and run-length encoded raster data. Outputs file information including size and dimensions upon successful completion.
+        Args:
+            parallel (bool, optional): If True, chunks of rows are encoded in parallel worker processes. Defaults to False.
+            max_workers (int | None, optional): The maximum number of worker processes used for parallel encoding. Defaults to None, which uses the number of processors.
+
+        Returns:
+            bytes: The header, palette, and run-length encoded raster data of the DAT file.
 
         Raises:
             ValueError: If no raster data exists to write.
@@ -650,37 +818,76 @@ class Knitout_to_Dat_Converter:
         if not self._raster_data:
             raise ValueError("No raster data to write. Create raster data first.")
 
-        # Encode the raster data
-        encoded_data = self.run_length_encode()
-
-        # Calculate total file size
-        total_size = self.HEADER_SIZE + self.PALETTE_SIZE + len(encoded_data)
+        # Assemble the header, palette, and encoded data into a single buffer.
+        buffer = self._create_dat_prefix()
+        buffer += self.run_length_encode(parallel=parallel, max_workers=max_workers)
+        return bytes(buffer)
 
-        # Create the complete buffer
-        buffer = bytearray(total_size)
+    def write_dat_file(self, write_index: bool = False, parallel: bool = False, max_workers: int | None = None) -> None:
+        """Write the complete DAT file to disk.
 
-        # Write header
-        header = self.create_dat_header()
-        buffer[:self.HEADER_SIZE] = header
+        Creates the complete binary DAT file including header, palette, and run-length encoded raster data. Outputs file information including size and dimensions upon successful completion.
 
-        # Write palette
-        palette_section = self.create_palette_section()
-        buffer[self.HEADER_SIZE:self.HEADER_SIZE + self.PALETTE_SIZE] = palette_section
+        Args:
+            write_index (bool, optional): If True, also writes a row index sidecar next to the DAT file so that readers can decode rows without scanning the raster data. Defaults to False.
+            parallel (bool, optional): If True, chunks of rows are encoded in parallel worker processes. Defaults to False.
+            max_workers (int | None, optional): The maximum number of worker processes used for parallel encoding. Defaults to None, which uses the number of processors.
 
-        # Write encoded data
-        data_start = self.DATA_OFFSET
-        for i, value in enumerate(encoded_data):
-            buffer[data_start + i] = value
+        Raises:
+            ValueError: If no raster data exists to write or no DAT filename was given.
+        """
+        if self._dat_filename is None:
+            raise ValueError("No DAT filename to write to. Use get_dat_file_bytes() to create the DAT file in memory.")
+        dat_content = self.get_dat_file_bytes(parallel=parallel, max_workers=max_workers)
+        encoded_data = memoryview(dat_content)[self.DATA_OFFSET:]
 
         # Write to file
         with open(self._dat_filename, 'wb') as f:
-            f.write(buffer)
+            f.write(dat_content)
 
         print(f"✓ DAT file written: {self._dat_filename}")
-        print(f"  File size: {len(buffer)} bytes")
+        print(f"  File size: {len(dat_content)} bytes")
         print(f"  Raster: {self.dat_width} x {self.dat_height}")
+        print(f"  Unique rows: {self.unique_row_count}")
         print(f"  Encoded data: {len(encoded_data)} bytes")
 
+        if write_index:
+            row_offsets, row_skips = run_length_row_index(encoded_data, self.dat_width)
+            index_filename = row_index_filename(self._dat_filename)
+            write_row_index(index_filename, self.dat_width, len(encoded_data), dat_content, row_offsets, row_skips)
+            print(f"✓ Row index written: {index_filename}")
+
+    def stream_dat_file(self, write_index: bool = False, pattern_vertical_buffer: int = 5, pattern_horizontal_buffer: int = 4, option_horizontal_buffer: int = 10) -> None:
+        """Write the DAT file to disk while the raster rows are generated, without keeping the raster in memory.
+
+        Each row is run-length encoded and written as soon as it is produced, and the raster dimensions are patched into the header once the raster is complete.
+        The raster data of this converter is not set by streaming.
+        Only the raster is streamed. The executed program is held by the converter, so the memory used still grows with the length of the program.
+
+        Args:
+            write_index (bool, optional): If True, also writes a row index sidecar next to the DAT file. Defaults to False.
+            pattern_vertical_buffer (int, optional): Vertical spacing buffer around the pattern. Defaults to 5.
+            pattern_horizontal_buffer (int, optional): Horizontal spacing buffer around the pattern. Defaults to 4.
+            option_horizontal_buffer (int, optional): Horizontal spacing buffer around option lines. Defaults to 10.
+
+        Raises:
+            ValueError: If no DAT filename was given.
+        """
+        if self._dat_filename is None:
+            raise ValueError("No DAT filename to write to. Use get_dat_file_bytes() to create the DAT file in memory.")
+        dat_width = Raster_Carriage_Pass.raster_width(self.knitting_width, option_horizontal_buffer, pattern_horizontal_buffer)
+        with Dat_File_Writer(self._dat_filename, dat_width, self._dat_prefix_template(), write_index=write_index) as writer:
+            startup_rows, end_rows = self._get_bookend_rows(pattern_horizontal_buffer, option_horizontal_buffer)
+            writer.cache_encoded_rows(startup_rows + end_rows)
+            self.write_raster_rows(writer, pattern_vertical_buffer, pattern_horizontal_buffer, option_horizontal_buffer)
+
+        print(f"✓ DAT file written: {self._dat_filename}")
+        print(f"  File size: {writer.file_size} bytes")
+        print(f"  Raster: {writer.width} x {writer.height}")
+        print(f"  Encoded data: {writer.data_length} bytes")
+        if write_index:
+            print(f"✓ Row index written: {row_index_filename(self._dat_filename)}")
+
     def create_empty_raster(self, width: int, height: int) -> None:
         """Create an empty raster filled with background color (0).
 
@@ -688,7 +895,8 @@ class Knitout_to_Dat_Converter:
             width (int): Width of the raster in pixels.
             height (int): Height of the raster in pixels.
         """
-        self._raster_data = [[0 for _ in range(width)] for _ in range(height)]
+        self._raster_data = Dat_Raster(width, initial_capacity=height)
+        self._raster_data.append_empty_rows(height)
         print(f"Created empty raster: {width} x {height}")
 
     def create_empty_dat(self, width: int = 50, height: int = 10) -> None:
@@ -703,17 +911,25 @@ class Knitout_to_Dat_Converter:
         self.create_empty_raster(width, height)
         self.write_dat_file()
 
-    def process_knitout_to_dat(self) -> None:
+    def process_knitout_to_dat(self, write_index: bool = False, stream: bool = False) -> None:
         """Complete workflow: parse knitout file and create DAT file.
 
         Executes the complete conversion pipeline from knitout parsing through DAT file generation, including raster creation and file writing with progress reporting.
+
+        Args:
+            write_index (bool, optional): If True, also writes a row index sidecar next to the DAT file. Defaults to False.
+            stream (bool, optional): If True, raster rows are written to the DAT file as they are generated instead of creating the raster in memory first. Defaults to False.
         """
         print("Starting knitout to DAT conversion...")
+        if stream:
+            self.stream_dat_file(write_index=write_index)
+            print("✓ Knitout to DAT conversion completed successfully!")
+            return
 
         # Step 2: Create raster from knitout data
         self.create_raster_from_knitout()
 
         # Step 3: Write the DAT file
-        self.write_dat_file()
+        self.write_dat_file(write_index=write_index)
 
         print("✓ Knitout to DAT conversion completed successfully!")
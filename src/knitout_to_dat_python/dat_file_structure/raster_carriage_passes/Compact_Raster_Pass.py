@@ -0,0 +1,184 @@
+"""Compact_Raster_Pass class that stores only the pixels needed to render a raster carriage pass.
+
+A Raster_Carriage_Pass keeps the wrapped Carriage_Pass, the machine settings it was built from, and enum-keyed dictionaries of its option lines and slot operations.
+A Compact_Raster_Pass is converted from a finished Raster_Carriage_Pass and keeps the same raster row in a few small byte arrays, so callers that hold many passes can hold them cheaply.
+The knitout-to-DAT conversion does not use it: each raster pass is rendered as soon as it is generated, so the conversion never holds the passes of a program.
+"""
+from __future__ import annotations
+
+from array import array
+
+from knitout_to_dat_python.dat_file_structure.dat_codes.dat_file_color_codes import (
+    OPTION_LINE_COUNT,
+    STOPPING_MARK,
+)
+from knitout_to_dat_python.dat_file_structure.dat_codes.operation_colors import (
+    OPERATION_COLOR_BY_CODE,
+    Operation_Color,
+)
+from knitout_to_dat_python.dat_file_structure.raster_carriage_passes.Raster_Carriage_Pass import (
+    Raster_Carriage_Pass,
+)
+
+
+class Compact_Raster_Pass:
+    """Immutable, array-backed record of the option line values and needle operations of a raster carriage pass.
+
+    Option values are stored in arrays indexed by option line number.
+    Slot operations are stored as a dense segment of operation color codes that begins at the leftmost operated slot, with 0 marking slots without an operation.
+    """
+    __slots__ = ('_left_options', '_right_options', '_slot_operations', '_min_slot', '_max_slot')
+
+    def __init__(self, left_options: array[int], right_options: array[int], slot_operations: array[int], min_slot: int | None):
+        """Initialize a Compact_Raster_Pass from its arrays.
+
+        Args:
+            left_options (array[int]): The value of each left option line, indexed by line number. Index 0 is unused.
+            right_options (array[int]): The value of each right option line, indexed by line number. Index 0 is unused.
+            slot_operations (array[int]): The operation color code of each slot from min_slot to the rightmost operated slot, 0 where a slot is not operated.
+            min_slot (int | None): The leftmost operated slot, or None if the pass has no slot operations.
+
+        Raises:
+            AssertionError: If the option arrays do not have an entry for every option line, or if the slot operations do not match min_slot.
+        """
+        assert len(left_options) == len(right_options) == OPTION_LINE_COUNT + 1, f"Expected {OPTION_LINE_COUNT + 1} option values on each side"
+        assert (min_slot is None) == (len(slot_operations) == 0), f"Expected slot operations to start at slot {min_slot}"
+        self._left_options: array[int] = left_options
+        self._right_options: array[int] = right_options
+        self._slot_operations: array[int] = slot_operations
+        self._min_slot: int | None = min_slot
+        self._max_slot: int | None = None if min_slot is None else min_slot + len(slot_operations) - 1
+
+    @classmethod
+    def from_raster_pass(cls, raster_pass: Raster_Carriage_Pass) -> Compact_Raster_Pass:
+        """Convert a Raster_Carriage_Pass into a Compact_Raster_Pass that renders the same raster rows.
+
+        Later changes to the raster pass, such as setting its pause or knit-cancel options, are not reflected in the compact pass.
+
+        Args:
+            raster_pass (Raster_Carriage_Pass): The raster pass to convert.
+
+        Returns:
+            Compact_Raster_Pass: The compact record of the raster pass's option values and slot operations.
+
+        Raises:
+            OverflowError: If an option value or operation color cannot be represented in a single byte.
+        """
+        left_options = array('B', bytes(OPTION_LINE_COUNT + 1))
+        for left_line, left_value in raster_pass.left_option_line_settings.items():
+            left_options[int(left_line)] = left_value
+        right_options = array('B', bytes(OPTION_LINE_COUNT + 1))
+        for right_line, right_value in raster_pass.right_option_line_settings.items():
+            right_options[int(right_line)] = right_value
+        if not raster_pass.slot_colors:
+            return cls(left_options, right_options, array('B'), None)
+        min_slot = min(raster_pass.slot_colors)
+        slot_operations = array('B', bytes(max(raster_pass.slot_colors) - min_slot + 1))
+        for slot, color in raster_pass.slot_colors.items():
+            slot_operations[slot - min_slot] = color.value
+        return cls(left_options, right_options, slot_operations, min_slot)
+
+    @property
+    def min_slot(self) -> int | None:
+        """
+        Returns:
+            int | None: The leftmost operated slot, or None if the pass has no slot operations.
+        """
+        return self._min_slot
+
+    @property
+    def max_slot(self) -> int | None:
+        """
+        Returns:
+            int | None: The rightmost operated slot, or None if the pass has no slot operations.
+        """
+        return self._max_slot
+
+    @property
+    def operation_count(self) -> int:
+        """
+        Returns:
+            int: The number of operated slots in the pass.
+        """
+        return len(self._slot_operations) - self._slot_operations.count(0)
+
+    def slot_color(self, slot: int) -> Operation_Color | None:
+        """
+        Args:
+            slot (int): The slot to look up.
+
+        Returns:
+            Operation_Color | None: The operation on the given slot, or None if the slot is not operated.
+        """
+        if self._min_slot is None or not (0 <= slot - self._min_slot < len(self._slot_operations)):
+            return None
+        color = self._slot_operations[slot - self._min_slot]
+        return OPERATION_COLOR_BY_CODE[color] if color != 0 else None
+
+    def left_option_value(self, line_number: int) -> int:
+        """
+        Args:
+            line_number (int): The number of a left option line.
+
+        Returns:
+            int: The value set beside the left option line.
+        """
+        return self._left_options[line_number]
+
+    def right_option_value(self, line_number: int) -> int:
+        """
+        Args:
+            line_number (int): The number of a right option line.
+
+        Returns:
+            int: The value set beside the right option line.
+        """
+        return self._right_options[line_number]
+
+    def get_raster_row(self, pattern_width: int, option_space: int = 10, pattern_space: int = 4, offset_slots: int = 0) -> list[int]:
+        """Generate the complete raster row for this carriage pass.
+
+        Produces the same row as the get_raster_row method of the Raster_Carriage_Pass this pass was converted from.
+
+        Args:
+            pattern_width (int): The width of the knitting pattern.
+            option_space (int, optional): The spacing around the option lines. Defaults to 10.
+            pattern_space (int, optional): The spacing between option lines and the pattern. Defaults to 4.
+            offset_slots (int, optional): The amount to offset the slots. Used in patterns with no 0-needles, to offset everything 1 to left (-1 offset). Defaults to 0.
+
+        Returns:
+            list[int]: The list of color-codes that correspond to a row of the DAT raster for this carriage pass.
+        """
+        raster_row = list(Raster_Carriage_Pass.raster_row_template(pattern_width, option_space, pattern_space))
+        left_band_end = Raster_Carriage_Pass.get_option_margin_width(option_space) - 1
+        for left_line, left_position in Raster_Carriage_Pass.LEFT_OPTION_POSITIONS.items():
+            raster_row[left_band_end - left_position] = self._left_options[int(left_line)]
+        right_band_start = len(raster_row) - Raster_Carriage_Pass.get_option_margin_width(option_space)
+        for right_line, right_position in Raster_Carriage_Pass.RIGHT_OPTION_POSITIONS.items():
+            raster_row[right_band_start + right_position] = self._right_options[int(right_line)]
+        slot_start = left_band_end + 1 + pattern_space  # The index in the raster row of slot -1, the first slot of the pattern.
+        slot_end = slot_start + pattern_width + 2
+        first_slot = slot_start + 1 + offset_slots  # The index of slot 0 of the carriage pass in the raster row.
+        if self._min_slot is None:  # Passes without slot operations place both stopping marks on slot 0.
+            if slot_start <= first_slot < slot_end:
+                raster_row[first_slot] = STOPPING_MARK
+            return raster_row
+        # The pattern of the template is empty, so the dense segment of operations can be copied in place after clipping it to the pattern.
+        segment_start = first_slot + self._min_slot
+        copy_start, copy_end = max(segment_start, slot_start), min(segment_start + len(self._slot_operations), slot_end)
+        if copy_start < copy_end:
+            raster_row[copy_start:copy_end] = self._slot_operations[copy_start - segment_start:copy_end - segment_start]
+        for stop_position in (segment_start - 1, segment_start + len(self._slot_operations)):
+            if slot_start <= stop_position < slot_end:
+                raster_row[stop_position] = STOPPING_MARK
+        return raster_row
+
+    def __str__(self) -> str:
+        """
+        Returns:
+            str: String representation showing the slot range and operation count.
+        """
+        return f"Compact_Raster_Pass(slots=({self._min_slot}, {self._max_slot}), operations={self.operation_count})"
+
+    def __repr__(self) -> str:
+        return str(self)
@@ -35,6 +35,7 @@ from knitout_to_dat_python.dat_file_structure.dat_codes.dat_file_color_codes imp
     STOPPING_MARK,
 )
 from knitout_to_dat_python.dat_file_structure.dat_codes.operation_colors import (
+    OPERATION_COLOR_BY_CODE,
     Operation_Color,
 )
 from knitout_to_dat_python.dat_file_structure.dat_codes.option_lines import (
@@ -207,10 +208,9 @@ class Pixel_Carriage_Pass_Converter:
                 else:  # Found right stop
                     break
             elif found_left_stop:  # Inside pattern
-                try:
-                    self._add_slot(slot, Operation_Color(pixel))
-                except ValueError as _e:
-                    continue
+                operation_color = OPERATION_COLOR_BY_CODE.get(pixel)
+                if operation_color is not None:
+                    self._add_slot(slot, operation_color)
 
     @property
     def hook_operation(self) -> Hook_Operation_Color | None:
@@ -4,6 +4,8 @@ This module provides the Raster_Carriage_Pass class, which wraps Carriage_Pass o
 It converts knitout operations into colored pixels and option line settings based on the original knitout-to-dat.js raster generation logic.
 """
 
+from functools import cache
+
 from knitout_interpreter.knitout_execution_structures.Carriage_Pass import Carriage_Pass
 from knitout_interpreter.knitout_operations.knitout_instruction import (
     Knitout_Instruction_Type,
@@ -47,7 +49,16 @@ class Raster_Carriage_Pass:
 
     This class converts knitout operations into colored pixels and option line settings that can be used to generate DAT file raster data.
     It processes carriage pass instructions and machine settings to create the appropriate pixel representation.
+
+    Attributes:
+        LEFT_OPTION_POSITIONS (dict[Left_Option_Lines, int]): The position of each left option value in the left option band, counted from option line 1 outward.
+        RIGHT_OPTION_POSITIONS (dict[Right_Option_Lines, int]): The position of each right option value in the right option band, counted from option line 1 outward.
     """
+    # The L1 and R1 options to specify carriage direction are set on the option line instead of beside it.
+    LEFT_OPTION_POSITIONS: dict[Left_Option_Lines, int] = {line: (int(line) - 1) * 2 + (0 if line is Left_Option_Lines.Direction_Specification else 1)
+                                                            for line in Left_Option_Lines}
+    RIGHT_OPTION_POSITIONS: dict[Right_Option_Lines, int] = {line: (int(line) - 1) * 2 + (0 if line is Right_Option_Lines.Direction_Specification else 1)
+                                                             for line in Right_Option_Lines}
 
     def __init__(self, carriage_pass: Carriage_Pass, machine_specification: Knitting_Machine_Specification, min_knitting_slot: int, max_knitting_slot: int,
                  hook_operation: Hook_Operation_Color = Hook_Operation_Color.No_Hook_Operation,
@@ -489,40 +500,68 @@ class Raster_Carriage_Pass:
         Raises:
             AssertionError: If the generated raster row length doesn't match the expected width.
         """
-        raster_row = self._raster_left_option_raster(option_space)
-        raster_row.extend(self._raster_needle_operations(pattern_width, offset_slots, pattern_space))
-        raster_row.extend(self._raster_right_option_raster(option_space))
+        raster_row = list(self.raster_row_template(pattern_width, option_space, pattern_space))
+        # The left option band is reversed, so option line 1 is the last pixel before the pattern space.
+        left_band_end = self.get_option_margin_width(option_space) - 1
+        for option_line, option_color in self.left_option_line_settings.items():
+            raster_row[left_band_end - self.LEFT_OPTION_POSITIONS[option_line]] = option_color
+        right_band_start = len(raster_row) - self.get_option_margin_width(option_space)
+        for option_line, option_color in self.right_option_line_settings.items():
+            raster_row[right_band_start + self.RIGHT_OPTION_POSITIONS[option_line]] = option_color
+        self._set_needle_operations(raster_row, left_band_end + 1 + pattern_space, pattern_width, offset_slots)
         assert len(raster_row) == self.raster_width(pattern_width, option_space, pattern_space)
         return raster_row
 
-    def _raster_needle_operations(self, pattern_width: int, offset_slots: int, pattern_space: int = 4) -> list[int]:
-        """Generate the needle operations portion of the raster row.
+    @staticmethod
+    @cache
+    def raster_row_template(pattern_width: int, option_space: int = 10, pattern_space: int = 4) -> tuple[int, ...]:
+        """Build the raster row shared by every carriage pass before its option values and needle operations are set.
 
-        Creates the central portion of the raster row containing needle operations, stopping marks, and pattern spacing.
+        The template is built once for each raster width and contains the option line numbers with empty option values, the option spacing, and an empty pattern.
 
         Args:
             pattern_width (int): The width of the knitting pattern.
-            offset_slots (int): The amount to offset the slots.
-            pattern_space (int, optional): Buffer space around the pattern. Defaults to 4.
+            option_space (int, optional): The spacing around the option lines. Defaults to 10.
+            pattern_space (int, optional): The spacing between option lines and the pattern. Defaults to 4.
 
         Returns:
-            list[int]: The pixel values representing needle operations and spacing.
-        """
-        # initiate with left side pattern spacing
-        pattern_raster = [0] * pattern_space
-        left_stop_mark, right_stop_mark = self._get_stopping_marks()
-        left_stop_mark += offset_slots
-        right_stop_mark += offset_slots
-        for slot_index in range(-1, pattern_width + 1):  # Add needle operations for each index.
-            if slot_index == left_stop_mark or slot_index == right_stop_mark:  # A stopping mark index has been found.
-                pattern_raster.append(STOPPING_MARK)
-            elif (slot_index - offset_slots) in self.slot_colors:  # An operation is specified for this slot
-                pattern_raster.append(int(self.slot_colors[slot_index - offset_slots]))
-            else:  # No operation or stopping point specified. Fill with a no-op
-                pattern_raster.append(0)
-        # add right side pattern spacing
-        pattern_raster.extend([0] * pattern_space)
-        return pattern_raster
+            tuple[int, ...]: The immutable template row of raster_width pixels.
+        """
+        option_band = []
+        for option_index in range(1, OPTION_LINE_COUNT + 1):
+            option_band.append(option_index)  # make the option lines
+            option_band.append(0)  # add a placeholder 0 option
+        template = [0] * option_space
+        template.extend(reversed(option_band))
+        template.extend([0] * (pattern_space + pattern_width + 2 + pattern_space))
+        template.extend(option_band)
+        template.extend([0] * option_space)
+        assert len(template) == Raster_Carriage_Pass.raster_width(pattern_width, option_space, pattern_space)
+        return tuple(template)
+
+    def _set_needle_operations(self, raster_row: list[int], slot_start: int, pattern_width: int, offset_slots: int) -> None:
+        """Write the needle operations and stopping marks of this carriage pass into the empty pattern of a raster row.
+
+        The color of each operated slot is scattered to its position in the row, so the cost depends on the number of operations and not on the pattern width.
+        Stopping marks are written last and replace any operation color at the same position.
+        Slots outside the pattern are ignored.
+
+        Args:
+            raster_row (list[int]): The raster row to write into. The pattern must be filled with 0s.
+            slot_start (int): The index in the raster row of slot -1, the first slot of the pattern.
+            pattern_width (int): The width of the knitting pattern.
+            offset_slots (int): The amount to offset the slots.
+        """
+        first_slot = slot_start + 1 + offset_slots  # The index of slot 0 of the carriage pass in the raster row.
+        slot_end = slot_start + pattern_width + 2
+        for slot, color in self.slot_colors.items():
+            position = first_slot + slot
+            if slot_start <= position < slot_end:
+                raster_row[position] = color.value
+        for stop_mark in self._get_stopping_marks():
+            position = first_slot + stop_mark
+            if slot_start <= position < slot_end:
+                raster_row[position] = STOPPING_MARK
 
     @staticmethod
     def get_option_margin_width(option_buffer: int = 10) -> int:
@@ -536,59 +575,6 @@ class Raster_Carriage_Pass:
         """
         return option_buffer + (2 * OPTION_LINE_COUNT)  # left buffer, space for left option lines
 
-    def _raster_left_option_raster(self, left_space: int = 10) -> list[int]:
-        """Generate the left option lines portion of the raster row.
-
-        Creates the left side of the raster row containing option line numbers and their corresponding values, with appropriate spacing and reversal.
-
-        Args:
-            left_space (int, optional): Left side spacing buffer. Defaults to 10.
-
-        Returns:
-            list[int]: The pixel values representing left option lines and spacing.
-
-        Note:
-            The L1 option to specify carriage direction is set on the option line instead of beside it.
-        """
-        option_raster = []
-        for option_index in range(1, OPTION_LINE_COUNT + 1):
-            option_raster.append(option_index)  # make the option lines
-            option_raster.append(0)  # add a placeholder 0 option
-        for option_line, option_color in self.left_option_line_settings.items():
-            option_line_position = (int(option_line) - 1) * 2  # adjust option line numbers to be 0 offset and multiply by 2 for spacing
-            option_position = option_line_position + 1 if option_line is not Left_Option_Lines.Direction_Specification else option_line_position
-            # The L1 option to specify carriage direction is set on the option line instead of beside it.
-            option_raster[option_position] = option_color
-        leftward_raster = [0 for _ in range(left_space)]
-        leftward_raster.extend(reversed(option_raster))
-        return leftward_raster
-
-    def _raster_right_option_raster(self, right_space: int = 10) -> list[int]:
-        """Generate the right option lines portion of the raster row.
-
-        Creates the right side of the raster row containing option line numbers and their corresponding values, with appropriate spacing.
-
-        Args:
-            right_space (int, optional): Right side spacing buffer. Defaults to 10.
-
-        Returns:
-            list[int]: The pixel values representing right option lines and spacing.
-
-        Note:
-            The R1 option to specify carriage direction is set on the option line instead of beside it.
-        """
-        option_raster = []
-        for option_index in range(1, OPTION_LINE_COUNT + 1):
-            option_raster.append(option_index)  # make the option lines
-            option_raster.append(0)  # add a placeholder 0 option
-        for option_line, option_color in self.right_option_line_settings.items():
-            option_line_position = (int(option_line) - 1) * 2  # adjust option line numbers to be 0 offset and multiply by 2 for spacing
-            option_position = option_line_position + 1 if option_line is not Right_Option_Lines.Direction_Specification else option_line_position
-            # The R1 option to specify carriage direction is set on the option line instead of beside it.
-            option_raster[option_position] = option_color
-        option_raster.extend(0 for _ in range(right_space))
-        return option_raster
-
     def __str__(self) -> str:
         """Return string representation of the raster pass.
 
@@ -4,10 +4,25 @@ This module provides enhanced knitout execution with automatic kickback injectio
 It prevents carrier conflicts by automatically inserting kick instructions to move carriers out of the way of incoming carriage passes, ensuring smooth operation during DAT file generation.
 """
 
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import NamedTuple
+
 from knitout_interpreter.knitout_execution import Knitout_Executer
 from knitout_interpreter.knitout_execution_structures.Carriage_Pass import Carriage_Pass
+from knitout_interpreter.knitout_operations.carrier_instructions import (
+    Hook_Instruction,
+    Outhook_Instruction,
+    Releasehook_Instruction,
+)
+from knitout_interpreter.knitout_operations.Header_Line import Knitout_Header_Line
 from knitout_interpreter.knitout_operations.kick_instruction import Kick_Instruction
-from knitout_interpreter.knitout_operations.Knitout_Line import Knitout_Line
+from knitout_interpreter.knitout_operations.Knitout_Line import (
+    Knitout_Comment_Line,
+    Knitout_Line,
+    Knitout_Version_Line,
+)
 from knitout_interpreter.knitout_operations.needle_instructions import (
     Needle_Instruction,
 )
@@ -51,37 +66,216 @@ class Negative_Kick_Instruction(Kick_Instruction):
         self._needle = Needle(is_front=True, position=self._position)  # correct the position to the negative value.
 
 
+class Hook_State(NamedTuple):
+    """The machine state needed to raster a releasehook or outhook instruction, recorded before the instruction is executed.
+
+    Attributes:
+        carrier_position (int | None): The position of the carrier of the hook instruction, or None if the carrier is not active.
+        carriage_direction (Carriage_Pass_Direction): The direction of the last movement of the carriage.
+        hook_input_direction (Carriage_Pass_Direction | None): The direction the yarn-inserting hook was input in, or None if the hook is not active.
+    """
+    carrier_position: int | None
+    carriage_direction: Carriage_Pass_Direction
+    hook_input_direction: Carriage_Pass_Direction | None
+
+
+class Planned_Kick(NamedTuple):
+    """A kick in a Kick_Plan, positioned relative to the leftmost slot of the planned conflict zone.
+
+    Attributes:
+        position (int): The slot the carriers are kicked to.
+        direction (Carriage_Pass_Direction): The direction of the kick.
+        carrier_ids (tuple[int, ...]): The ids of the kicked carriers.
+        zone (tuple[int, int]): The leftmost and rightmost slots of the conflict zone the carriers are kicked out of.
+        exempt_count (int): The number of carriers of the plan's exempt ids that were exempt when the kick was planned.
+    """
+    position: int
+    direction: Carriage_Pass_Direction
+    carrier_ids: tuple[int, ...]
+    zone: tuple[int, int]
+    exempt_count: int
+
+
+class Kick_Plan(NamedTuple):
+    """The kicks that move carriers out of a conflict zone, planned from the layout of the carriers around the zone.
+
+    Attributes:
+        kicks (tuple[Planned_Kick, ...]): The kicks in the order they are executed.
+        exempt_ids (tuple[int, ...]): The ids of the kicked carriers in the order they became exempt from later conflicts.
+    """
+    kicks: tuple[Planned_Kick, ...]
+    exempt_ids: tuple[int, ...]
+
+
 class Knitout_Executer_With_Kickbacks(Knitout_Executer):
     """Subclass of the Knitout_Executer that introduces kickback logic for carrier management before each carriage pass.
 
     This class extends the standard Knitout_Executer to automatically inject kick instructions that prevent carrier conflicts during knitting operations.
     It tracks carrier positions, manages carrier buffers, and generates appropriate kickback sequences to ensure carriers don't interfere with carriage pass execution.
+    Kickbacks are added as the instructions are organized into carriage passes, so the program is only executed once.
 
     Attributes:
+        instructions (Iterable[Knitout_Line]): The knitout instructions given to the executer.
+            A generator, such as the lines streamed by iter_knitout_lines, is exhausted once the executer is constructed and cannot be re-read. Use executed_instructions or process to revisit the program.
         process (list[Knitout_Line | Carriage_Pass]): The processed instruction list including injected kickbacks.
         executed_instructions (list[Knitout_Line]): The list of executed instruction lines.
-        kickback_machine (Knitting_Machine): Separate machine instance for tracking kickback state.
+        hook_states (dict[int, Hook_State]): The machine state before each releasehook and outhook instruction, keyed by the index of the instruction in the process.
         _last_carrier_movement (Carriage_Pass | None): The most recent carriage pass that involved carrier movement.
+        _leftmost_slot (int | None): The leftmost racked slot operated by a carriage pass in the process, or None if the process has no carriage passes.
+        _rightmost_slot (int | None): The rightmost racked slot operated by a carriage pass in the process, or None if the process has no carriage passes.
+        _passes_use_slot_0 (bool): True if a carriage pass in the process operates on racked slot 0.
+        _carrier_slot_index (list[tuple[int, int]]): The conflicting needle slot and id of each positioned carrier, sorted by slot then id.
+        _indexed_carrier_slots (dict[int, int]): The conflicting needle slot of each carrier in the carrier slot index, keyed by carrier id.
+        _active_carrier_ranks (dict[int, int]): The index of each active carrier in the iteration order of the carrier system's active carriers, keyed by carrier id.
+        KICK_PLAN_CACHE_SIZE (int): The number of kick plans kept for carrier layouts that repeat.
     """
+    KICK_PLAN_CACHE_SIZE: int = 1024
+
+    # Kick plans keyed by the relative carrier layout, zone width, and allowed directions. Ordered from least to most recently used.
+    _kick_plan_cache: OrderedDict[tuple[tuple[tuple[int, int, int], ...], int, bool, bool], Kick_Plan] = OrderedDict()
 
-    def __init__(self, instructions: list[Knitout_Line], knitting_machine: Knitting_Machine):
+    def __init__(self, instructions: Iterable[Knitout_Line], knitting_machine: Knitting_Machine, accepted_error_types: list | None = None):
         """Initialize a Knitout_Executer_With_Kickbacks.
 
         Creates an enhanced knitout executor that automatically manages carrier conflicts through kickback injection.
         Sets up carrier tracking systems and processes the instruction list with automatic conflict resolution.
 
         Args:
-            instructions (list[Knitout_Line]): The list of knitout instructions to execute.
+            instructions (Iterable[Knitout_Line]): The knitout instructions to execute. May be a generator, which is consumed once as the instructions are organized and is exhausted after construction.
             knitting_machine (Knitting_Machine): The knitting machine to execute instructions on.
+            accepted_error_types (list | None, optional): A list of exceptions that instructions may throw that can be resolved by commenting them out. Defaults to None.
+        """
+        self.hook_states: dict[int, Hook_State] = {}
+        self._hook_steps_after_last_pass: list[int] = []  # Process indices of the hook states recorded after the last carriage pass in the process.
+        self._last_carrier_movement: None | Carriage_Pass = None
+        self._leftmost_slot: int | None = None
+        self._rightmost_slot: int | None = None
+        self._passes_use_slot_0: bool = False
+        self._carrier_slot_index: list[tuple[int, int]] = []
+        self._indexed_carrier_slots: dict[int, int] = {}
+        self._active_carrier_ranks: dict[int, int] = {}
+        self._kick_plan_hits: int = 0
+        self._kick_plan_misses: int = 0
+        super().__init__(instructions, knitting_machine, accepted_error_types)
+
+    @property
+    def kickback_machine(self) -> Knitting_Machine:
+        """
+        Returns:
+            Knitting_Machine: The machine that the program and its kickbacks are executed on.
+        """
+        return self.knitting_machine
+
+    @property
+    def leftmost_slot(self) -> int | None:
+        """
+        Returns:
+            int | None: The leftmost slot, on the front bed at the racking of each pass, operated by a carriage pass in the process. None if the process has no carriage passes.
+        """
+        return self._leftmost_slot
+
+    @property
+    def rightmost_slot(self) -> int | None:
+        """
+        Returns:
+            int | None: The rightmost slot, on the front bed at the racking of each pass, operated by a carriage pass in the process. None if the process has no carriage passes.
+        """
+        return self._rightmost_slot
+
+    @property
+    def passes_use_slot_0(self) -> bool:
+        """
+        Returns:
+            bool: True if a carriage pass in the process operates on slot 0, on the front bed at the racking of the pass.
+        """
+        return self._passes_use_slot_0
+
+    @property
+    def kick_plan_cache_hits(self) -> int:
+        """
+        Returns:
+            int: The number of conflict zones whose kicks this executer took from the kick plan cache.
+        """
+        return self._kick_plan_hits
+
+    @property
+    def kick_plan_cache_misses(self) -> int:
+        """
+        Returns:
+            int: The number of conflict zones whose kicks this executer had to plan.
+        """
+        return self._kick_plan_misses
+
+    def _include_slots(self, left_slot: int, right_slot: int, uses_slot_0: bool) -> None:
+        """Extend the slot range of the process to include the given slots.
+
+        Args:
+            left_slot (int): The leftmost slot to include.
+            right_slot (int): The rightmost slot to include.
+            uses_slot_0 (bool): True if the included slots contain slot 0.
+        """
+        if uses_slot_0:
+            self._passes_use_slot_0 = True
+        if self._leftmost_slot is None or left_slot < self._leftmost_slot:
+            self._leftmost_slot = left_slot
+        if self._rightmost_slot is None or right_slot > self._rightmost_slot:
+            self._rightmost_slot = right_slot
+
+    def test_and_organize_instructions(self, accepted_error_types: list | None = None) -> None:
+        """Organize the instructions into carriage passes and execute them with kickbacks added before each carriage pass.
+
+        Instructions are organized as they are by the Knitout_Executer, but each completed carriage pass is preceded by the kickbacks that resolve its carrier conflicts.
+        Lines that do not update the machine and instructions that raise an accepted error are commented out in the process and executed instructions, as they are by the Knitout_Executer.
+        Unlike the Knitout_Executer, the header lines are not added to the start of the executed instructions.
+
+        Args:
+            accepted_error_types (list | None, optional): A list of exceptions that instructions may throw that can be resolved by commenting them out. Defaults to None.
         """
+        if accepted_error_types is None:
+            accepted_error_types = []
         self.process: list[Knitout_Line | Carriage_Pass] = []
-        self._kickback_process: list[Knitout_Line | Carriage_Pass] = []
         self.executed_instructions: list[Knitout_Line] = []
-        self._kickback_executed_instructions: list[Knitout_Line] = []
-        super().__init__(instructions, knitting_machine)
-        self.kickback_machine: Knitting_Machine = Knitting_Machine(self.knitting_machine.machine_specification)
-        self._last_carrier_movement: None | Carriage_Pass = None
-        self.add_kickbacks_to_process()
+        self._index_carriers()
+        in_header = not self.knitting_machine.knit_graph.has_loop  # If the prior machine state already had a knit graph, then the header cannot modify the machine state.
+        current_pass = None
+        for instruction in self.instructions:
+            try:
+                if instruction.interrupts_carriage_pass:
+                    in_header = False
+                if isinstance(instruction, Needle_Instruction):
+                    in_header = False
+                    if current_pass is None:
+                        current_pass = Carriage_Pass(instruction, self.knitting_machine.rack, self.knitting_machine.all_needle_rack)
+                    elif not current_pass.add_instruction(instruction, self.knitting_machine.rack, self.knitting_machine.all_needle_rack):
+                        self._add_kickbacks_and_execute(current_pass)
+                        current_pass = Carriage_Pass(instruction, self.knitting_machine.rack, self.knitting_machine.all_needle_rack)
+                elif isinstance(instruction, Knitout_Version_Line):
+                    self._knitout_version = instruction.version
+                elif isinstance(instruction, Knitout_Header_Line):
+                    updated = self.executed_header.update_header(instruction, update_machine=in_header)  # only update the machine_state if in the header section
+                    if updated:
+                        self.knitting_machine: Knitting_Machine = Knitting_Machine(self.executed_header.specification)
+                        self._carrier_slot_index.clear()
+                        self._indexed_carrier_slots.clear()
+                        self._active_carrier_ranks.clear()
+                        self._index_carriers()
+                else:
+                    if instruction.interrupts_carriage_pass and current_pass is not None:  # interrupt the current carriage pass with rack and carrier operations
+                        self._add_kickbacks_and_execute(current_pass)
+                        current_pass = None
+                    self._add_carrier_movement(instruction)
+            except tuple(accepted_error_types) as e:
+                self._index_carriers()  # The failed instruction may have moved some carriers before raising the error.
+                if len(self._hook_steps_after_last_pass) > 0 and self._hook_steps_after_last_pass[-1] == len(self.process):  # The excluded instruction is a hook that is not added to the process.
+                    del self.hook_states[self._hook_steps_after_last_pass.pop()]
+                error_comment = Knitout_Comment_Line(f"Excluded {type(e).__name__}: {e.message}")
+                self.process.append(error_comment)
+                self.executed_instructions.append(error_comment)
+                comment = Knitout_Comment_Line(instruction)
+                self.process.append(comment)
+                self.executed_instructions.append(comment)
+        if current_pass is not None:
+            self._add_kickbacks_and_execute(current_pass)
 
     def _get_carrier_position(self, cid: int) -> None | int:
         """Get the exact position with buffer for the given carrier.
@@ -148,6 +342,9 @@ class Knitout_Executer_With_Kickbacks(Knitout_Executer):
                                     allow_leftward_movement: bool = True, allow_rightward_movement: bool = True) -> list[Kick_Instruction]:
         """Generate kick instructions to move carriers out of a conflict zone.
 
+        The kicks are planned from the layout of the carriers around the conflict zone, relative to the leftmost slot of the zone.
+        Plans are kept in a least-recently-used cache shared by all executers, so repeated carrier layouts are only planned once.
+
         Args:
             leftmost_conflict (int): The left most position where carriers conflict.
             rightmost_conflict (int): The rightmost position where carriers conflict.
@@ -161,76 +358,215 @@ class Knitout_Executer_With_Kickbacks(Knitout_Executer):
         Raises:
             ValueError: If both leftward and rightward movement are disallowed but conflicts are detected.
         """
+        if not (allow_leftward_movement or allow_rightward_movement):
+            conflict_carriers = self._carriers_in_conflict_zone(leftmost_conflict, rightmost_conflict, exempt_carriers)
+            if len(conflict_carriers) > 0:
+                raise ValueError(f"Must have at least leftward or rightward options  to kick {conflict_carriers}")
+            return []
+        # Each group of pushed carriers takes one more slot beside the zone, so carriers more slots away than there are carriers cannot affect the plan.
+        margin = len(self._carrier_slot_index)
+        carrier_system = self.kickback_machine.carrier_system
+        layout = []
+        for carrier_id in self._carrier_ids_in_slot_range(leftmost_conflict - margin, rightmost_conflict + margin):
+            carrier = carrier_system[carrier_id]
+            assert isinstance(carrier, Yarn_Carrier)
+            if carrier not in exempt_carriers:
+                layout.append((self._indexed_carrier_slots[carrier_id] - leftmost_conflict, int(carrier.position) - leftmost_conflict, carrier_id))
+        key = (tuple(layout), rightmost_conflict - leftmost_conflict, allow_leftward_movement, allow_rightward_movement)
+        plan_cache = Knitout_Executer_With_Kickbacks._kick_plan_cache
+        plan = plan_cache.get(key)
+        if plan is None:
+            self._kick_plan_misses += 1
+            plan = self._plan_kicks(*key)
+            plan_cache[key] = plan
+            if len(plan_cache) > self.KICK_PLAN_CACHE_SIZE:
+                plan_cache.popitem(last=False)
+        else:
+            self._kick_plan_hits += 1
+            plan_cache.move_to_end(key)
+
+        comment_carriers: dict[int, set[Yarn_Carrier]] = {}  # The exempt carriers named in the comments of the kicks, keyed by the number of carriers the plan exempted first.
         kicks: list[Kick_Instruction] = []
-        conflict_carriers = self._carriers_in_conflict_zone(leftmost_conflict, rightmost_conflict, exempt_carriers)
-        if len(conflict_carriers) == 0:
-            return []  # No conflicts, so no kicks.
-        elif not (allow_leftward_movement or allow_rightward_movement):
-            raise ValueError(f"Must have at least leftward or rightward options  to kick {conflict_carriers}")
-        exempt_carriers.update(conflict_carriers)
+        for planned_kick in plan.kicks:
+            if planned_kick.exempt_count not in comment_carriers:
+                comment_carriers[planned_kick.exempt_count] = set(exempt_carriers)
+                comment_carriers[planned_kick.exempt_count].update(carrier_system[carrier_id] for carrier_id in plan.exempt_ids[:planned_kick.exempt_count])
+            kick_position = leftmost_conflict + planned_kick.position
+            comment = (f"Move out of conflict zone {leftmost_conflict + planned_kick.zone[0]} to {leftmost_conflict + planned_kick.zone[1]} "
+                       f"of carriers {comment_carriers[planned_kick.exempt_count]}")
+            if kick_position < 0:
+                kicks.append(Negative_Kick_Instruction(kick_position, planned_kick.direction, Yarn_Carrier_Set(list(planned_kick.carrier_ids)), comment=comment))
+            else:
+                kicks.append(Kick_Instruction(kick_position, planned_kick.direction, Yarn_Carrier_Set(list(planned_kick.carrier_ids)), comment=comment))
+        return kicks
+
+    @staticmethod
+    def _carrier_set_order(carrier_ids: Iterable[int]) -> list[int]:
+        """Order carrier ids the way a set of their carriers iterates when the carriers are added to it in the given order.
+
+        Kicks list their carriers in the iteration order of the carrier sets they were grouped in, and that order is written into the DAT carrier pixels.
+        Yarn carriers hash by their id, so a set of ids built in the same order iterates in the same order as the set of carriers.
+        Ids that share a hash slot, such as 2 and 10 in a small set, are ordered by when they were added.
+
+        Args:
+            carrier_ids (Iterable[int]): The ids of the carriers in the order they are added to the set.
+
+        Returns:
+            list[int]: The carrier ids in the iteration order of the set.
+        """
+        carrier_set: set[int] = set()
+        for carrier_id in carrier_ids:
+            carrier_set.add(carrier_id)
+        return list(carrier_set)
+
+    @staticmethod
+    def _plan_kicks(layout: tuple[tuple[int, int, int], ...], zone_width: int, allow_leftward_movement: bool, allow_rightward_movement: bool) -> Kick_Plan:
+        """Plan the kicks that move carriers out of a conflict zone.
+
+        Carriers in the zone are split into those pushed leftward and those pushed rightward, and each pushed group of carriers is given its own slot outside the zone.
+        Carriers in the slots taken by the pushed carriers are pushed further out in the same direction, until a slot range without conflicts is reached.
+        The outermost carriers are kicked first so that no kick passes through a carrier that has not moved yet.
 
+        Args:
+            layout (tuple[tuple[int, int, int], ...]):
+                The conflicting needle slot, position, and id of each carrier that is not exempt, relative to the leftmost slot of the zone.
+                Carriers are in the iteration order of the carrier system's active carriers.
+            zone_width (int): The rightmost slot of the conflict zone, relative to its leftmost slot.
+            allow_leftward_movement (bool): If set to True, kickbacks may send carriers to the left.
+            allow_rightward_movement (bool): If set to True, kickbacks may send carriers to the right.
+
+        Returns:
+            Kick_Plan: The kicks that resolve the conflicts in the zone, relative to the leftmost slot of the zone.
+        """
+        positions = {carrier_id: position for _slot, position, carrier_id in layout}
+        pushed_carriers: set[int] = set()
+        exempt_ids: list[int] = []  # The ids of the pushed carriers in the order they became exempt.
+
+        def _exempt_zone_carriers(leftmost_slot: int, rightmost_slot: int) -> list[int]:
+            """
+            Args:
+                leftmost_slot (int): The leftmost slot of the zone.
+                rightmost_slot (int): The rightmost slot of the zone.
+
+            Returns:
+                list[int]: The ids of the carriers in the zone that were not exempt yet, in carrier set order. These carriers are exempt from later zones.
+            """
+            zone_carriers = Knitout_Executer_With_Kickbacks._carrier_set_order(carrier_id for slot, _position, carrier_id in layout
+                                                                               if leftmost_slot <= slot <= rightmost_slot and carrier_id not in pushed_carriers)
+            pushed_carriers.update(zone_carriers)
+            exempt_ids.extend(zone_carriers)
+            return zone_carriers
+
+        def _push_groups(carrier_ids: list[int]) -> dict[int, tuple[int, ...]]:
+            """
+            Args:
+                carrier_ids (list[int]): The ids of the carriers to push in the same direction, in carrier set order.
+
+            Returns:
+                dict[int, tuple[int, ...]]: The ids of the carriers pushed together, in carrier set order and keyed by their shared position.
+            """
+            groups: dict[int, list[int]] = {}
+            for carrier_id in carrier_ids:
+                groups.setdefault(positions[carrier_id], []).append(carrier_id)
+            return {position: tuple(Knitout_Executer_With_Kickbacks._carrier_set_order(group)) for position, group in groups.items()}
+
+        def _push_out(groups: dict[int, tuple[int, ...]], direction: Carriage_Pass_Direction) -> list[Planned_Kick]:
+            """
+            Args:
+                groups (dict[int, tuple[int, ...]]): The groups of carriers in the conflict zone to push in the given direction, keyed by position.
+                direction (Carriage_Pass_Direction): The direction to push the carriers out of the zone.
+
+            Returns:
+                list[Planned_Kick]: The kicks that push the groups and every carrier in their way out of the conflict zone, outermost first.
+            """
+            zones = [(0, zone_width, groups)]
+            leftmost_slot, rightmost_slot = 0, zone_width
+            while len(groups) > 0:  # Each group takes a slot beside the last zone, so the carriers on those slots form the next zone.
+                if direction is Carriage_Pass_Direction.Leftward:
+                    leftmost_slot, rightmost_slot = leftmost_slot - len(groups), leftmost_slot
+                else:
+                    leftmost_slot, rightmost_slot = rightmost_slot, rightmost_slot + len(groups)
+                groups = _push_groups(_exempt_zone_carriers(leftmost_slot, rightmost_slot))
+                if len(groups) > 0:
+                    zones.append((leftmost_slot, rightmost_slot, groups))
+            exempt_count = len(exempt_ids)
+            planned_kicks: list[Planned_Kick] = []
+            for leftmost_slot, rightmost_slot, zone_groups in reversed(zones):
+                if direction is Carriage_Pass_Direction.Leftward:  # Kick the leftmost group to the farthest slot first.
+                    zone_kicks = [Planned_Kick(leftmost_slot - 1 - push_group, direction, zone_groups[position], (leftmost_slot, rightmost_slot), exempt_count)
+                                  for push_group, position in enumerate(sorted(zone_groups, reverse=True))]
+                else:  # Kick the rightmost group to the farthest slot first.
+                    zone_kicks = [Planned_Kick(rightmost_slot + 1 + push_group, direction, zone_groups[position], (leftmost_slot, rightmost_slot), exempt_count)
+                                  for push_group, position in enumerate(sorted(zone_groups))]
+                planned_kicks.extend(reversed(zone_kicks))
+            return planned_kicks
+
+        conflict_carriers = _exempt_zone_carriers(0, zone_width)
+        if len(conflict_carriers) == 0:
+            return Kick_Plan((), ())
         if allow_leftward_movement and allow_rightward_movement:
-            conflict_split = leftmost_conflict + (rightmost_conflict - leftmost_conflict) // 2
-            leftward_carriers = set(carrier for carrier in conflict_carriers if carrier.position <= conflict_split)  # Carriers that should tend to push leftward
-            rightward_carriers = set(carrier for carrier in conflict_carriers if carrier.position > conflict_split)  # Carriers that should tend to push rightward
+            conflict_split = zone_width // 2
+            leftward_carriers = Knitout_Executer_With_Kickbacks._carrier_set_order([carrier_id for carrier_id in conflict_carriers if positions[carrier_id] <= conflict_split])  # Carriers that should tend to push leftward
+            rightward_carriers = Knitout_Executer_With_Kickbacks._carrier_set_order([carrier_id for carrier_id in conflict_carriers if positions[carrier_id] > conflict_split])  # Carriers that should tend to push rightward
         elif allow_leftward_movement:  # allow only leftward movements
-            leftward_carriers = conflict_carriers
-            rightward_carriers = set()
+            leftward_carriers, rightward_carriers = conflict_carriers, []
         else:  # allow only rightward movements
-            rightward_carriers = conflict_carriers
-            leftward_carriers = set()
-
-        # associate carriers by current position for outward pushing to exterior of carriage pass
-        leftward_positions_to_carriers: dict[int, set[Yarn_Carrier]] = {}
-        for carrier in leftward_carriers:
-            if carrier.position not in leftward_positions_to_carriers:
-                leftward_positions_to_carriers[carrier.position] = set()
-            leftward_positions_to_carriers[carrier.position].add(carrier)
-        rightward_positions_to_carriers: dict[int, set[Yarn_Carrier]] = {}
-        for carrier in rightward_carriers:
-            if carrier.position not in rightward_positions_to_carriers:
-                rightward_positions_to_carriers[carrier.position] = set()
-            rightward_positions_to_carriers[carrier.position].add(carrier)
-
-        # Set leftward kickbacks moving left most to rightmost carrier sets
-        if len(leftward_positions_to_carriers) > 0:
-            kicks = self._kicks_out_of_conflict_zone(leftmost_conflict=leftmost_conflict - len(leftward_positions_to_carriers),
-                                                     rightmost_conflict=leftmost_conflict,
-                                                     exempt_carriers=exempt_carriers, allow_leftward_movement=True, allow_rightward_movement=False)
-            kick_insert_index = len(kicks)
-            for push_group, pos in enumerate(sorted(leftward_positions_to_carriers, reverse=True)):
-                carriers = leftward_positions_to_carriers[pos]
-                kick_position = leftmost_conflict - 1 - push_group
-                if kick_position < 0:
-                    kick = Negative_Kick_Instruction(kick_position, Carriage_Pass_Direction.Leftward, Yarn_Carrier_Set(list(carriers)),
-                                                     comment=f"Move out of conflict zone {leftmost_conflict} to {rightmost_conflict} of carriers {exempt_carriers}")
-                else:
-                    kick = Kick_Instruction(kick_position, Carriage_Pass_Direction.Leftward, Yarn_Carrier_Set(list(carriers)),
-                                            comment=f"Move out of conflict zone {leftmost_conflict} to {rightmost_conflict} of carriers {exempt_carriers}")
-                kicks.insert(kick_insert_index, kick)  # add kick to front of kicks because we want the order to move the leftmost carriers first.
-
-        # Set rightward kickbacks moving right to leftmost carrier sets
-        if len(rightward_positions_to_carriers) > 0:
-            conflict_kicks = self._kicks_out_of_conflict_zone(leftmost_conflict=rightmost_conflict,
-                                                              rightmost_conflict=rightmost_conflict + len(rightward_positions_to_carriers),
-                                                              exempt_carriers=exempt_carriers, allow_leftward_movement=False, allow_rightward_movement=True)
-            kicks.extend(conflict_kicks)
-            kick_insert_index = len(kicks)
-            for push_group, pos in enumerate(sorted(rightward_positions_to_carriers)):
-                carriers = rightward_positions_to_carriers[pos]
-                kick_position = rightmost_conflict + 1+ push_group
-                if kick_position < 0:
-                    kick = Negative_Kick_Instruction(kick_position, Carriage_Pass_Direction.Rightward, Yarn_Carrier_Set(list(carriers)),
-                                                     comment=f"Move out of conflict zone {leftmost_conflict} to {rightmost_conflict} of carriers {exempt_carriers}")
-                else:
-                    kick = Kick_Instruction(kick_position, Carriage_Pass_Direction.Rightward, Yarn_Carrier_Set(list(carriers)),
-                                            comment=f"Move out of conflict zone {leftmost_conflict} to {rightmost_conflict} of carriers {exempt_carriers}")
-                kicks.insert(kick_insert_index, kick)  # add to front of rightmost kicks because we want the order to move the rightmost carriers first.
+            leftward_carriers, rightward_carriers = [], conflict_carriers
+        kicks: list[Planned_Kick] = []
+        if len(leftward_carriers) > 0:
+            kicks.extend(_push_out(_push_groups(leftward_carriers), Carriage_Pass_Direction.Leftward))
+        if len(rightward_carriers) > 0:
+            kicks.extend(_push_out(_push_groups(rightward_carriers), Carriage_Pass_Direction.Rightward))
+        return Kick_Plan(tuple(kicks), tuple(exempt_ids))
 
-        return kicks
+    def _index_carriers(self, carrier_ids: Iterable[int] | None = None) -> None:
+        """Update the carrier slot index with the current conflicting needle slots of the given carriers.
 
-    def _carriers_in_conflict_zone(self, leftmost_conflict: int, rightmost_conflict: int, exempt_carriers: set[Yarn_Carrier]) -> set[Yarn_Carrier]:
+        Args:
+            carrier_ids (Iterable[int] | None, optional): The ids of the carriers that may have moved. Defaults to None, which updates every carrier on the machine.
         """
+        carrier_system = self.kickback_machine.carrier_system
+        if carrier_ids is None:
+            carrier_ids = carrier_system.carrier_ids
+        active_carriers_changed = False
+        for carrier_id in carrier_ids:
+            carrier = carrier_system[carrier_id]
+            assert isinstance(carrier, Yarn_Carrier)
+            if carrier.is_active != (carrier_id in self._active_carrier_ranks):
+                active_carriers_changed = True
+            slot = carrier.conflicting_needle_slot if carrier.position is not None else None
+            indexed_slot = self._indexed_carrier_slots.get(carrier_id)
+            if slot == indexed_slot:
+                continue
+            if indexed_slot is not None:
+                del self._carrier_slot_index[bisect_left(self._carrier_slot_index, (indexed_slot, carrier_id))]
+                del self._indexed_carrier_slots[carrier_id]
+            if slot is not None:
+                insort(self._carrier_slot_index, (slot, carrier_id))
+                self._indexed_carrier_slots[carrier_id] = slot
+        if active_carriers_changed:
+            self._active_carrier_ranks = {carrier.carrier_id: rank for rank, carrier in enumerate(carrier_system.active_carriers)}
+
+    def _carrier_ids_in_slot_range(self, leftmost_slot: int, rightmost_slot: int) -> list[int]:
+        """Find the carriers whose conflicting needle slots are in a range with a range query on the carrier slot index.
+
+        The carriers are ordered as they are found by iterating over the carrier system's active carriers.
+        Sets of carriers built in this order iterate in the same order as sets built by scanning the active carriers, so the carriers of each kick are listed in the same order.
+
+        Args:
+            leftmost_slot (int): The leftmost slot of the range.
+            rightmost_slot (int): The rightmost slot of the range.
+
+        Returns:
+            list[int]: The ids of the carriers in the range, in the iteration order of the active carriers.
+        """
+        start = bisect_left(self._carrier_slot_index, (leftmost_slot,))
+        end = bisect_left(self._carrier_slot_index, (rightmost_slot + 1,))
+        return sorted((carrier_id for _slot, carrier_id in self._carrier_slot_index[start:end]), key=self._active_carrier_ranks.__getitem__)
+
+    def _carriers_in_conflict_zone(self, leftmost_conflict: int, rightmost_conflict: int, exempt_carriers: set[Yarn_Carrier]) -> set[Yarn_Carrier]:
+        """Find the carriers in a conflict zone with a range query on the carrier slot index.
+
         Args:
             leftmost_conflict (int): The leftmost slot of the conflict zone.
             rightmost_conflict (int): The rightmost slot of the conflict zone.
@@ -239,8 +575,13 @@ class Knitout_Executer_With_Kickbacks(Knitout_Executer):
         Returns:
             set[Yarn_Carrier]: The yarn carriers currently positioned within the given conflict zone.
         """
-        return set(c for c in self.kickback_machine.carrier_system.active_carriers
-                   if c not in exempt_carriers and c.position is not None and leftmost_conflict <= c.conflicting_needle_slot <= rightmost_conflict)
+        carrier_system = self.kickback_machine.carrier_system
+        zone_carriers = set()
+        for carrier_id in self._carrier_ids_in_slot_range(leftmost_conflict, rightmost_conflict):
+            carrier = carrier_system[carrier_id]
+            if carrier not in exempt_carriers:
+                zone_carriers.add(carrier)
+        return zone_carriers
 
     def _kickback_to_align_carriers(self, carriage_pass: Carriage_Pass) -> Kick_Instruction | None:
         """Generate kick instructions to align carriers for the next carriage pass.
@@ -317,35 +658,92 @@ class Knitout_Executer_With_Kickbacks(Knitout_Executer):
     def _add_carrier_movement(self, execution: Carriage_Pass | Knitout_Line) -> None:
         """Add a carrier movement operation to the process and update machine state.
 
+        Lines that do not update the machine state are added to the process as no-op comments.
+
         Args:
             execution (Carriage_Pass | Knitout_Line): The instruction or carriage pass to add and execute.
         """
         if isinstance(execution, Carriage_Pass):
             executed_pass = execution.execute(self.kickback_machine)
+            if execution.carrier_set is not None:
+                self._index_carriers(execution.carrier_set.carrier_ids)
             updated = len(executed_pass) > 0
             if updated:
-                self._kickback_executed_instructions.extend(executed_pass)
-                self._kickback_process.append(execution)
+                self.executed_instructions.extend(executed_pass)
+                self.process.append(execution)
+                self._hook_steps_after_last_pass.clear()
+                slots = [instruction.needle.racked_position_on_front(execution.rack) for instruction in execution]
+                self._include_slots(min(slots), max(slots), 0 in slots)
             if execution.xfer_pass:
                 self._last_carrier_movement = None  # Xfers may cause conflicts with the current carrier positions.
             elif execution.carrier_set is not None:
                 self._last_carrier_movement = execution
         else:
+            if isinstance(execution, (Releasehook_Instruction, Outhook_Instruction)):
+                self._record_hook_state(execution)
             updated = execution.execute(self.kickback_machine)
-            if updated or isinstance(execution, Pause_Instruction):
-                self._kickback_executed_instructions.append(execution)
-                self._kickback_process.append(execution)
+            self._index_carriers()
+            if not (updated or isinstance(execution, Pause_Instruction)):
+                if isinstance(execution, (Releasehook_Instruction, Outhook_Instruction)):
+                    del self.hook_states[self._hook_steps_after_last_pass.pop()]
+                execution = Knitout_Comment_Line(execution)  # create a no-op comment for this line because it did not cause an update.
+            self.executed_instructions.append(execution)
+            self.process.append(execution)
+
+    def _record_hook_state(self, hook_instruction: Hook_Instruction) -> None:
+        """Record the machine state needed to raster a hook instruction before it is executed and added to the process.
 
-    def _update_last_carriage_pass(self, updated_carriage_pass: Carriage_Pass) -> None:
+        Args:
+            hook_instruction (Hook_Instruction): The releasehook or outhook instruction that will be added to the process next.
+        """
+        step = len(self.process)
+        self.hook_states[step] = Hook_State(self.kickback_machine.carrier_system[hook_instruction.carrier_id].position,
+                                            self.kickback_machine.carriage.last_direction,
+                                            self.kickback_machine.carrier_system.hook_input_direction)
+        self._hook_steps_after_last_pass.append(step)
+
+    def _add_kick_to_last_carrier_movement(self, add_on: Kick_Instruction) -> None:
+        """Extend the last carrier movement with a kick and execute the kick.
+
+        The kick is executed after any instructions that followed the last carriage pass, but it takes effect at the end of that pass.
+        The hook states recorded after the pass are updated to include the kick's movement of the carriage and carriers.
+
+        Args:
+            add_on (Kick_Instruction): The kick that extends the last carrier movement.
+        """
+        assert isinstance(self._last_carrier_movement, Carriage_Pass)
+        add_on_cp = Carriage_Pass_with_Kick(self._last_carrier_movement, [add_on])
+        add_on.execute(self.kickback_machine)
+        if add_on.carrier_set is not None:
+            self._index_carriers(add_on.carrier_set.carrier_ids)
+        updated_index = self._update_last_carriage_pass(add_on_cp)
+        kick_slot = add_on.needle.racked_position_on_front(add_on_cp.rack)
+        self._include_slots(kick_slot, kick_slot, kick_slot == 0)
+        self._update_last_executed_instruction(add_on)
+        kicked_carriers = set(add_on.carrier_set.carrier_ids) if add_on.carrier_set is not None else set()
+        for step in self._hook_steps_after_last_pass:
+            if step > updated_index:
+                hook_instruction = self.process[step]
+                assert isinstance(hook_instruction, Hook_Instruction)
+                hook_state = self.hook_states[step]._replace(carriage_direction=self.kickback_machine.carriage.last_direction)
+                if hook_instruction.carrier_id in kicked_carriers:
+                    hook_state = hook_state._replace(carrier_position=self.kickback_machine.carrier_system[hook_instruction.carrier_id].position)
+                self.hook_states[step] = hook_state
+
+    def _update_last_carriage_pass(self, updated_carriage_pass: Carriage_Pass) -> int:
         """Update the last carriage pass in the process.
 
         Args:
             updated_carriage_pass (Carriage_Pass): The updated carriage pass to replace the last one.
+
+        Returns:
+            int: The index of the updated carriage pass in the process, or -1 if the process has no carriage pass.
         """
-        for update_cp_index in range(len(self._kickback_process) - 1, -1, -1):  # iterate back through the process until the last carriage pass is found.
-            if isinstance(self._kickback_process[update_cp_index], Carriage_Pass):
-                self._kickback_process[update_cp_index] = updated_carriage_pass
-                return
+        for update_cp_index in range(len(self.process) - 1, -1, -1):  # iterate back through the process until the last carriage pass is found.
+            if isinstance(self.process[update_cp_index], Carriage_Pass):
+                self.process[update_cp_index] = updated_carriage_pass
+                return update_cp_index
+        return -1
 
     def _update_last_executed_instruction(self, added_kick: Kick_Instruction) -> None:
         """Update the executed instructions list by adding a kick instruction.
@@ -353,9 +751,9 @@ class Knitout_Executer_With_Kickbacks(Knitout_Executer):
         Args:
             added_kick (Kick_Instruction): The kick instruction to add to the executed instructions.
         """
-        for update_index in range(len(self._kickback_executed_instructions), -1, -1):
-            if isinstance(self._kickback_executed_instructions[update_index - 1], Needle_Instruction):
-                self._kickback_executed_instructions.insert(update_index, added_kick)
+        for update_index in range(len(self.executed_instructions), -1, -1):
+            if isinstance(self.executed_instructions[update_index - 1], Needle_Instruction):
+                self.executed_instructions.insert(update_index, added_kick)
                 return
 
     def _kick_conflicting_carriers(self, carriage_pass: Carriage_Pass) -> None:
@@ -363,11 +761,7 @@ class Knitout_Executer_With_Kickbacks(Knitout_Executer):
         conflict_kicks = self._kicks_out_of_conflict_zone(leftmost_conflict, rightmost_conflict, exempt_carriers=self.get_carriers(carriage_pass.carrier_set))
         add_on, kicks_before_cp = self._split_kicks_to_extend_last_pass(conflict_kicks)
         if isinstance(add_on, Kick_Instruction):  # there is a kickback that can extend the last carriage pass without causing new conflicts
-            assert isinstance(self._last_carrier_movement, Carriage_Pass)
-            add_on_cp = Carriage_Pass_with_Kick(self._last_carrier_movement, [add_on])
-            add_on.execute(self.kickback_machine)
-            self._update_last_carriage_pass(add_on_cp)
-            self._update_last_executed_instruction(add_on)
+            self._add_kick_to_last_carrier_movement(add_on)
         for kick in kicks_before_cp:
             kick_cp = Carriage_Pass(kick, rack=0, all_needle_rack=False)
             self._add_carrier_movement(kick_cp)
@@ -377,43 +771,17 @@ class Knitout_Executer_With_Kickbacks(Knitout_Executer):
         if isinstance(alignment_kick, Kick_Instruction):
             add_on, kicks_before_cp = self._split_kicks_to_extend_last_pass([alignment_kick])
             if isinstance(add_on, Kick_Instruction):  # there is a kickback that can extend the last carriage pass without causing new conflicts
-                assert isinstance(self._last_carrier_movement, Carriage_Pass)
-                add_on_cp = Carriage_Pass_with_Kick(self._last_carrier_movement, [add_on])
-                add_on.execute(self.kickback_machine)
-                self._update_last_carriage_pass(add_on_cp)
-                self._update_last_executed_instruction(add_on)
+                self._add_kick_to_last_carrier_movement(add_on)
             for kick in kicks_before_cp:
                 kick_cp = Carriage_Pass(kick, rack=0, all_needle_rack=False)
                 self._add_carrier_movement(kick_cp)
 
-    def add_kickbacks_to_process(self) -> None:
-        """Rerun the executor's process but add kickback logic to form a new kickback program.
-
-        Processes the original instruction list and automatically injects kick instructions to prevent carrier conflicts.
-        Manages carrier state tracking, conflict detection, and kickback generation throughout the execution process.
-        """
-        for instruction in self.process:
-            if isinstance(instruction, Knitout_Line):
-                self._add_carrier_movement(instruction)
-            else:  # Carriage pass that may need kickbacks before proceeding.
-                assert isinstance(instruction, Carriage_Pass), f"Expected Carriage pass, got {instruction}"
-                carriage_pass = instruction
-                self._kick_conflicting_carriers(carriage_pass)
-                self._kick_to_align_carriers(carriage_pass)
-                self._add_carrier_movement(carriage_pass)
-        self.process = self._kickback_process
-        self.executed_instructions = self._kickback_executed_instructions
-        self.knitting_machine = self.kickback_machine
-        self._carriage_passes = [cp for cp in self.process if isinstance(cp, Carriage_Pass)]
-        self._left_most_position = None
-        self._right_most_position = None
-        for cp in self._carriage_passes:
-            left, right = cp.carriage_pass_range()
-            if self._left_most_position is None:
-                self._left_most_position = left
-            elif left is not None:
-                self._left_most_position = min(self._left_most_position, left)
-            if self._right_most_position is None:
-                self._right_most_position = right
-            elif right is not None:
-                self._right_most_position = max(self._right_most_position, right)
+    def _add_kickbacks_and_execute(self, carriage_pass: Carriage_Pass) -> None:
+        """Add the kickbacks needed before a carriage pass to the process, then add and execute the carriage pass.
+
+        Args:
+            carriage_pass (Carriage_Pass): The completed carriage pass to execute.
+        """
+        self._kick_conflicting_carriers(carriage_pass)
+        self._kick_to_align_carriers(carriage_pass)
+        self._add_carrier_movement(carriage_pass)
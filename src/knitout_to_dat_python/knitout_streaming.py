@@ -0,0 +1,56 @@
+"""Module containing the generator stages that stream a knitout program into the knitout-to-DAT conversion.
+
+Knitout files are parsed one line at a time, so neither the text of the file nor a list of its parsed lines is held while the program is executed.
+"""
+from collections.abc import Iterable, Iterator
+
+import parglare.exceptions
+from knitout_interpreter.knitout_language.Knitout_Parser import Knitout_Parser
+from knitout_interpreter.knitout_operations.Knitout_Line import Knitout_Line
+
+
+def iter_knitout_lines(knitout: str, knitout_in_file: bool = True) -> Iterator[Knitout_Line]:
+    """Parse a knitout program lazily, one line at a time.
+
+    Produces the same knitout lines as knitout_interpreter's parse_knitout.
+
+    Args:
+        knitout (str): Path to the knitout file or the knitout program as a string.
+        knitout_in_file (bool, optional): Whether knitout is a file path (True) or the content of the program (False). Defaults to True.
+
+    Yields:
+        Knitout_Line: Each parsed line of the knitout program, in program order. Blank lines are skipped.
+
+    Raises:
+        parglare.exceptions.ParseError: If a line of the knitout program cannot be parsed. The error is noted with the line number and text of the line in the program.
+    """
+    if knitout_in_file:
+        with open(knitout, "r") as knitout_file:
+            yield from _parse_knitout_lines(knitout_file)
+    else:
+        yield from _parse_knitout_lines(knitout.splitlines())
+
+
+def _parse_knitout_lines(lines: Iterable[str]) -> Iterator[Knitout_Line]:
+    """Parse each line of a knitout program with a single parser.
+
+    Each line is parsed as a single line pattern by the parser's parse_knitout_to_instructions without resetting the parser between lines.
+    Parsing errors are noted with the line number in the program, because the parser only reports the index of the line in the single line pattern.
+
+    Args:
+        lines (Iterable[str]): The lines of the knitout program.
+
+    Yields:
+        Knitout_Line: Each parsed line of the knitout program, in program order. Blank lines are skipped.
+
+    Raises:
+        parglare.exceptions.ParseError: If a line of the knitout program cannot be parsed.
+    """
+    parser = Knitout_Parser()
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            codes = parser.parse_knitout_to_instructions(line, pattern_is_file=False, reset_parser=False)
+        except parglare.exceptions.ParseError as e:
+            e.add_note(f"Knitout Parsing Error at line {line_number}: {line.rstrip()}")
+            raise
+        yield from codes
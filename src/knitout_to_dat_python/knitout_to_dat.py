@@ -3,6 +3,8 @@
 This module provides high-level utility functions for converting between knitout and DAT file formats.
 It serves as the primary interface for users of the knitout-to-dat-python library, offering simple function calls for both forward and reverse conversion operations.
 """
+from typing import BinaryIO
+
 from knitout_to_dat_python.dat_file_structure.Dat_to_Knitout_Converter import (
     Dat_to_Knitout_Converter,
 )
@@ -11,7 +13,7 @@ from knitout_to_dat_python.dat_file_structure.knitout_to_dat_converter import (
 )
 
 
-def knitout_to_dat(knitout_program: str, dat_filename: str | None = None, knitout_in_file: bool = True) -> str:
+def knitout_to_dat(knitout_program: str, dat_filename: str | None = None, knitout_in_file: bool = True, write_index: bool = False, stream: bool = False) -> str:
     """Convert a knitout program into a Shima Seiki DAT file.
 
     This is the main utility function of this package. It converts the given knitout program into a Shima Seiki DAT file suitable for use with knitting machines.
@@ -21,6 +23,8 @@ def knitout_to_dat(knitout_program: str, dat_filename: str | None = None, knitou
         knitout_program (str): The string containing the knitout program or a path to the file containing the knitout program.
         dat_filename (str | None, optional): The string containing the name of the output dat file. If None, defaults to the same name as the knitout file with .dat extension. Defaults to None.
         knitout_in_file (bool, optional): If true, looks for the knitout program inside a given knitout file. Defaults to True.
+        write_index (bool, optional): If true, also writes a row index sidecar next to the dat file for fast random access to its rows. Defaults to False.
+        stream (bool, optional): If true, raster rows are written to the dat file as they are generated instead of building the raster in memory first. Defaults to False.
 
     Returns:
         str: The name of the dat file that contains the resulting dat program.
@@ -33,10 +37,25 @@ def knitout_to_dat(knitout_program: str, dat_filename: str | None = None, knitou
             raise ValueError('A knitout file must be specified if dat_filename is not specified')
         dat_filename = knitout_program.split('.')[0] + '.dat'
     converter = Knitout_to_Dat_Converter(knitout_program, dat_filename, knitout_in_file=knitout_in_file)
-    converter.process_knitout_to_dat()
+    converter.process_knitout_to_dat(write_index=write_index, stream=stream)
     return dat_filename
 
 
+def knitout_to_dat_bytes(knitout_program: str, knitout_in_file: bool = True) -> bytes:
+    """Convert a knitout program into the content of a Shima Seiki DAT file without writing it to disk.
+
+    Args:
+        knitout_program (str): The string containing the knitout program or a path to the file containing the knitout program.
+        knitout_in_file (bool, optional): If true, looks for the knitout program inside a given knitout file. Defaults to True.
+
+    Returns:
+        bytes: The content of the resulting dat file.
+    """
+    converter = Knitout_to_Dat_Converter(knitout_program, knitout_in_file=knitout_in_file)
+    converter.create_raster_from_knitout()
+    return converter.get_dat_file_bytes()
+
+
 def dat_to_knitout(dat_file: str, knitout_file: str | None = None) -> str:
     """Convert a DAT file into a knitout file.
 
@@ -55,3 +74,15 @@ def dat_to_knitout(dat_file: str, knitout_file: str | None = None) -> str:
     converter = Dat_to_Knitout_Converter(dat_file)
     converter.write_knitout(knitout_file)
     return knitout_file
+
+
+def dat_bytes_to_knitout(dat_content: bytes | bytearray | memoryview | BinaryIO) -> str:
+    """Convert the content of a DAT file into a knitout program without reading or writing files.
+
+    Args:
+        dat_content (bytes | bytearray | memoryview | BinaryIO): The content of the dat file as a bytes-like object or a binary file-like object.
+
+    Returns:
+        str: The knitout program of the corresponding instructions.
+    """
+    return Dat_to_Knitout_Converter(dat_content).get_knitout()
@@ -0,0 +1,56 @@
+"""Test cases for the startup and ending rows of DAT rasters."""
+import unittest
+from unittest import mock
+
+from knitout_to_dat_python.dat_file_structure.dat_run_length_encoding import (
+    run_length_encode_rows,
+)
+from knitout_to_dat_python.dat_file_structure.knitout_to_dat_converter import (
+    Knitout_to_Dat_Converter,
+)
+from tests.resources.load_test_resources import load_test_resource
+
+
+class TestBookendRows(unittest.TestCase):
+    """Test class for rendering and caching the startup and ending rows."""
+
+    def test_cached_rows_match_carriage_passes(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        Knitout_to_Dat_Converter._bookend_row_cache.clear()
+        for pattern_buffer, option_buffer in [(4, 10), (2, 5)]:
+            startup_rows, end_rows = converter._get_bookend_rows(pattern_buffer, option_buffer)
+            for bookend_rows, carriage_passes in [(startup_rows, converter._get_startup_rasters()), (end_rows, converter._get_end_rasters())]:
+                expected_rows = [cp.get_raster_row(converter.knitting_width, option_buffer, pattern_buffer) for cp in carriage_passes]
+                self.assertEqual([list(row) for row, _encoded in bookend_rows], expected_rows)
+                for row, encoded in bookend_rows:
+                    self.assertEqual(encoded, run_length_encode_rows([row], len(row)))
+
+    def test_rows_are_rendered_once_per_width(self):
+        Knitout_to_Dat_Converter._bookend_row_cache.clear()
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        converter.create_raster_from_knitout()
+        expected_raster = list(converter._raster_data)
+        second_converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        with mock.patch.object(Knitout_to_Dat_Converter, '_get_startup_rasters') as get_startup_rasters:
+            second_converter.create_raster_from_knitout()
+            get_startup_rasters.assert_not_called()
+        self.assertEqual(list(second_converter._raster_data), expected_raster)
+        self.assertEqual(len(Knitout_to_Dat_Converter._bookend_row_cache), 1)
+
+    def test_synthesized_rows_match_reference_passes(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        for knitting_width in [1, 2, 3, 60, 541]:
+            with mock.patch.object(Knitout_to_Dat_Converter, 'knitting_width', new_callable=mock.PropertyMock, return_value=knitting_width):
+                for pattern_buffer, option_buffer in [(4, 10), (0, 0), (7, 3)]:
+                    startup_rows, end_rows = converter._synthesize_bookend_rows(pattern_buffer, option_buffer)
+                    for synthesized_rows, carriage_passes in [(startup_rows, converter._get_startup_rasters()), (end_rows, converter._get_end_rasters())]:
+                        self.assertEqual(synthesized_rows, [cp.get_raster_row(knitting_width, option_buffer, pattern_buffer) for cp in carriage_passes])
+
+    def test_non_uniform_bookend_pass_is_rejected(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        startup_rasters = converter._get_startup_rasters(converter.BOOKEND_REFERENCE_WIDTH)
+        startup_rasters[0].slot_colors[1] = startup_rasters[1].slot_colors[0]  # A knit on one slot of the miss pass.
+        with mock.patch.object(Knitout_to_Dat_Converter, 'knitting_width', new_callable=mock.PropertyMock, return_value=converter.BOOKEND_REFERENCE_WIDTH + 1), \
+                mock.patch.object(Knitout_to_Dat_Converter, '_get_startup_rasters', return_value=startup_rasters):
+            with self.assertRaises(ValueError):
+                converter._synthesize_bookend_rows()
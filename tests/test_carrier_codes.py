@@ -0,0 +1,77 @@
+"""Test cases for encoding and decoding the carrier sets of DAT files."""
+import itertools
+import unittest
+import warnings
+
+from virtual_knitting_machine.machine_components.yarn_management.Yarn_Carrier_Set import (
+    Yarn_Carrier_Set,
+)
+
+from knitout_to_dat_python.dat_file_structure.dat_codes.option_value_colors import (
+    CARRIER_SET_CODES,
+    carriers_to_int,
+    pixel_to_carriers,
+)
+
+
+def legacy_carriers_to_int(carrier_set: Yarn_Carrier_Set | None) -> int:
+    """Reference implementation of carriers_to_int that concatenates the carrier ids as strings."""
+    if carrier_set is None or len(carrier_set) == 0:
+        return 255
+    if len(carrier_set.carrier_ids) == 2:
+        if carrier_set.carrier_ids[0] == 10:
+            return int(f"10{carrier_set.carrier_ids[1]}")
+        elif carrier_set.carrier_ids[1] == 10 and carrier_set.carrier_ids[0] != 1:
+            return int(f"{carrier_set.carrier_ids[0]}0")
+        else:
+            return int(f"{carrier_set.carrier_ids[0]}{carrier_set.carrier_ids[1]}")
+    return carrier_set.carrier_ids[0]
+
+
+def legacy_pixel_to_carriers(pixel_value: int) -> list[int] | None:
+    """Reference implementation of pixel_to_carriers that matches the digits of the pixel value."""
+    if pixel_value == 0 or pixel_value == 255:
+        return None
+    if 1 <= pixel_value <= 10:
+        return [pixel_value]
+    pixel_str = str(pixel_value)
+    if pixel_str.startswith('10') and len(pixel_str) == 3 and 1 <= int(pixel_str[2]) <= 9:
+        return [10, int(pixel_str[2])]
+    if pixel_str.endswith('0') and len(pixel_str) == 2 and 2 <= int(pixel_str[0]) <= 9:
+        return [int(pixel_str[0]), 10]
+    if len(pixel_str) == 2 and 1 <= int(pixel_str[0]) <= 9 and 1 <= int(pixel_str[1]) <= 9:
+        return list(dict.fromkeys([int(pixel_str[0]), int(pixel_str[1])]))
+    raise ValueError(f"Could not decode carrier value {pixel_value} to carrier set")
+
+
+class TestCarrierCodes(unittest.TestCase):
+    """Test class for the carrier code tables."""
+
+    def test_every_carrier_set_matches_reference(self):
+        self.assertEqual(carriers_to_int(None), legacy_carriers_to_int(None))
+        self.assertEqual(carriers_to_int(Yarn_Carrier_Set([])), legacy_carriers_to_int(Yarn_Carrier_Set([])))
+        for carrier_count in range(1, 4):
+            for carrier_ids in itertools.permutations(range(1, 11), carrier_count):
+                carrier_set = Yarn_Carrier_Set(list(carrier_ids))
+                self.assertEqual(carriers_to_int(carrier_set), legacy_carriers_to_int(carrier_set), carrier_ids)
+
+    def test_every_pixel_matches_reference(self):
+        for pixel_value in range(-1, 1200):
+            if pixel_value == 110:  # Carriers 1 and 10 are written as 110, which could not be read before.
+                continue
+            try:
+                expected = legacy_pixel_to_carriers(pixel_value)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    pixel_to_carriers(pixel_value)
+                continue
+            carrier_set = pixel_to_carriers(pixel_value)
+            self.assertEqual(None if carrier_set is None else carrier_set.carrier_ids, expected, pixel_value)
+
+    def test_carrier_sets_round_trip(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for carrier_ids, code in CARRIER_SET_CODES.items():
+                self.assertLess(code, 255)
+                self.assertEqual(pixel_to_carriers(code), Yarn_Carrier_Set(list(carrier_ids)))
+        self.assertIs(pixel_to_carriers(37), pixel_to_carriers(37))
@@ -0,0 +1,42 @@
+"""Test cases for the Compact_Raster_Pass class."""
+import unittest
+
+from knitout_to_dat_python.dat_file_structure.knitout_to_dat_converter import (
+    Knitout_to_Dat_Converter,
+)
+from knitout_to_dat_python.dat_file_structure.raster_carriage_passes.Compact_Raster_Pass import (
+    Compact_Raster_Pass,
+)
+from tests.resources.load_test_resources import load_test_resource
+
+
+class TestCompactRasterPass(unittest.TestCase):
+    """Test class for converting and rendering compact raster passes."""
+
+    def test_rows_match_raster_passes(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        pattern_width = converter.knitting_width
+        carriage_passes = converter._get_startup_rasters() + converter._get_pattern_rasters() + converter._get_end_rasters()
+        for cp in carriage_passes:
+            compact_pass = Compact_Raster_Pass.from_raster_pass(cp)
+            self.assertEqual((compact_pass.min_slot, compact_pass.max_slot), (cp.min_slot, cp.max_slot) if cp.slot_colors else (None, None))
+            self.assertEqual(compact_pass.operation_count, len(cp.slot_colors))
+            for option_space, pattern_space in [(10, 4), (0, 0), (3, 7)]:
+                for offset_slots in [0, -1]:
+                    self.assertEqual(compact_pass.get_raster_row(pattern_width, option_space, pattern_space, offset_slots),
+                                     cp.get_raster_row(pattern_width, option_space, pattern_space, offset_slots))
+
+    def test_sparse_and_clipped_slots(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        cp = converter._get_startup_rasters()[0]
+        pattern_width = 12
+        operation_color = next(iter(cp.slot_colors.values()))
+        for slot_colors in [{}, {0: operation_color}, {-3: operation_color, 5: operation_color, 20: operation_color}, {s: operation_color for s in range(-1, 13)}]:
+            cp.slot_colors = slot_colors
+            compact_pass = Compact_Raster_Pass.from_raster_pass(cp)
+            for slot in range(-4, 22):
+                self.assertIs(compact_pass.slot_color(slot), slot_colors.get(slot))
+            for offset_slots in [0, -1, 2]:
+                self.assertEqual(compact_pass.get_raster_row(pattern_width, offset_slots=offset_slots), cp.get_raster_row(pattern_width, offset_slots=offset_slots))
+        with self.assertRaises(AttributeError):
+            compact_pass.pause = True
@@ -0,0 +1,134 @@
+"""Test cases for random access reading of DAT files."""
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from knitout_to_dat_python.dat_file_structure import dat_file_reader
+from knitout_to_dat_python.dat_file_structure.dat_file_reader import Dat_File_Reader
+from knitout_to_dat_python.dat_file_structure.dat_row_index import row_index_filename
+from knitout_to_dat_python.dat_file_structure.dat_run_length_encoding import (
+    run_length_decode_rows,
+    run_length_encode_rows,
+)
+from knitout_to_dat_python.knitout_to_dat import knitout_to_dat
+from tests.resources.load_test_resources import load_test_resource
+from tests.test_dat_run_length_encoding import random_raster
+
+
+def dat_file_bytes(encoded: bytes, width: int, height: int, magic: int = 1000) -> bytes:
+    """
+    Args:
+        encoded: The run-length encoded raster data.
+        width: The width of the raster.
+        height: The height of the raster.
+        magic: The magic number to write in the header.
+
+    Returns:
+        The bytes of a DAT file with the given raster data and an empty palette.
+    """
+    prefix = bytearray(Dat_File_Reader.DATA_OFFSET)
+    struct.pack_into('<HHHHH', prefix, 0, 0, 0, width - 1, height - 1, magic)
+    struct.pack_into('<H', prefix, 0x10, magic)
+    return bytes(prefix) + encoded
+
+
+class TestDatFileReader(unittest.TestCase):
+    """Test class for the Dat_File_Reader."""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def write_dat(self, encoded: bytes, width: int, height: int, magic: int = 1000) -> str:
+        filename = os.path.join(self._directory.name, "test.dat")
+        with open(filename, 'wb') as f:
+            f.write(dat_file_bytes(encoded, width, height, magic))
+        return filename
+
+    def assert_rows_match_full_decode(self, encoded: bytes, width: int, height: int) -> None:
+        expected = run_length_decode_rows(encoded, width)
+        with Dat_File_Reader(self.write_dat(encoded, width, height)) as reader:
+            self.assertEqual(reader.read_rows(), expected)
+            self.assertEqual(reader.row_count, len(expected))
+            for i, row in enumerate(expected):
+                self.assertEqual(reader.read_row(i), row)
+            self.assertEqual(reader.read_rows(1, len(expected) - 1), expected[1:-1])
+            self.assertEqual(reader.read_rows(), expected)
+
+    def test_random_access_rows(self):
+        raster = random_raster(300, 40, [0, 1, 2, 51], seed=3)
+        self.assert_rows_match_full_decode(run_length_encode_rows(raster, 300), 300, 40)
+
+    def test_runs_crossing_rows(self):
+        encoded = bytes([1, 7, 2, 0, 3, 5, 4, 255, 5, 1])  # Runs that span several rows and an empty run at a row boundary.
+        self.assert_rows_match_full_decode(encoded, 4, 67)
+        self.assert_rows_match_full_decode(encoded + b"\x09", 4, 67)  # Odd trailing byte is ignored.
+
+    def test_negative_and_out_of_range_rows(self):
+        raster = [[1] * 5, [2] * 5, [3] * 5]
+        with Dat_File_Reader(self.write_dat(run_length_encode_rows(raster, 5), 5, 3)) as reader:
+            self.assertEqual(reader.read_row(-1), raster[-1])
+            with self.assertRaises(IndexError):
+                reader.read_row(3)
+            self.assertEqual(reader.read_rows(2, 10), raster[2:])
+
+    def test_invalid_magic_numbers(self):
+        with self.assertRaises(ValueError):
+            Dat_File_Reader(self.write_dat(b"", 5, 3, magic=7))
+
+    def test_row_index_sidecar(self):
+        raster = random_raster(300, 40, [0, 1, 2, 51], seed=4)
+        filename = self.write_dat(run_length_encode_rows(raster, 300), 300, 40)
+        with Dat_File_Reader(filename) as reader:
+            self.assertEqual(reader.write_row_index(), row_index_filename(filename))
+        with mock.patch.object(dat_file_reader, "run_length_row_index") as scan:
+            with Dat_File_Reader(filename) as reader:
+                self.assertEqual(reader.read_row(17), raster[17])
+            scan.assert_not_called()
+
+    def test_stale_row_index_sidecar(self):
+        raster = random_raster(300, 40, [0, 1, 2, 51], seed=5)
+        filename = self.write_dat(run_length_encode_rows(raster, 300), 300, 40)
+        with Dat_File_Reader(filename) as reader:
+            reader.write_row_index()
+        raster[3] = [9] * 300
+        self.write_dat(run_length_encode_rows(raster, 300), 300, 40)
+        with Dat_File_Reader(filename) as reader:
+            self.assertEqual(reader.read_rows(2, 5), raster[2:5])
+
+    def test_row_index_sidecar_verification(self):
+        encoded = run_length_encode_rows(random_raster(300, 8000, [0, 1, 2, 51], seed=6), 300)
+        filename = self.write_dat(encoded, 300, 8000)
+        with Dat_File_Reader(filename) as reader:
+            reader.write_row_index()
+        middle_pair = (len(encoded) // 4) * 2
+        with open(filename, 'r+b') as f:  # Recolor a run in the middle of the raster in place, without changing the size of the file.
+            f.seek(Dat_File_Reader.DATA_OFFSET + middle_pair)
+            f.write(bytes([77]))
+        with open(filename, 'rb') as f:
+            expected = run_length_decode_rows(f.read()[Dat_File_Reader.DATA_OFFSET:], 300)
+        with mock.patch.object(dat_file_reader, "run_length_row_index", wraps=dat_file_reader.run_length_row_index) as scan:
+            with Dat_File_Reader(filename) as reader:
+                self.assertEqual(reader.read_rows(4000, 4010), expected[4000:4010])
+            scan.assert_called_once()  # The stale sidecar is rejected.
+            with Dat_File_Reader(filename, verify_row_index=False) as reader:  # The change is outside the sampled bytes, so only the full digest detects it.
+                self.assertEqual(reader.read_rows(4000, 4010), expected[4000:4010])
+            scan.assert_called_once()
+            with open(filename, 'ab') as f:
+                f.write(bytes([5, 0]))  # A different file size invalidates the sidecar.
+            with Dat_File_Reader(filename, verify_row_index=False) as reader:
+                self.assertEqual(reader.read_rows(4000, 4010), expected[4000:4010])
+            self.assertEqual(scan.call_count, 2)
+
+    def test_knitout_to_dat_row_index(self):
+        filename = knitout_to_dat(load_test_resource("seed_jacquard.k"), os.path.join(self._directory.name, "seed_jacquard.dat"), write_index=True)
+        self.assertTrue(os.path.isfile(row_index_filename(filename)))
+        with Dat_File_Reader(filename, use_row_index=False) as reader:
+            expected = reader.read_rows()
+        with mock.patch.object(dat_file_reader, "run_length_row_index") as scan:
+            with Dat_File_Reader(filename) as reader:
+                self.assertEqual(reader.row_count, reader.height)
+                self.assertEqual([reader.read_row(i) for i in range(reader.row_count)], expected)
+            scan.assert_not_called()
@@ -0,0 +1,68 @@
+"""Test cases for the streaming Dat_File_Writer."""
+import io
+import os
+import tempfile
+import unittest
+
+from knitout_to_dat_python.dat_file_structure.dat_file_reader import Dat_File_Reader
+from knitout_to_dat_python.dat_file_structure.dat_file_writer import Dat_File_Writer
+from knitout_to_dat_python.dat_file_structure.dat_row_index import row_index_filename
+from knitout_to_dat_python.knitout_to_dat import knitout_to_dat
+from tests.resources.load_test_resources import load_test_resource
+from tests.test_dat_file_reader import dat_file_bytes
+from tests.test_dat_run_length_encoding import legacy_run_length_encode, random_raster
+
+
+class TestDatFileWriter(unittest.TestCase):
+    """Test class for the Dat_File_Writer."""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def test_streamed_rows_match_encoded_raster(self):
+        rows = random_raster(300, 40, [0, 1, 2, 51], seed=8) * 3
+        expected = dat_file_bytes(bytes(legacy_run_length_encode(rows)), 300, len(rows))
+        prefix = dat_file_bytes(b"", 1, 1)
+        stream = io.BytesIO(b"leading bytes")
+        stream.seek(0, io.SEEK_END)
+        with Dat_File_Writer(stream, 300, prefix) as writer:
+            writer.extend_rows(rows)
+        self.assertEqual(stream.getvalue(), b"leading bytes" + expected)
+
+        filename = os.path.join(self._directory.name, "streamed.dat")
+        with Dat_File_Writer(filename, 300, prefix, write_index=True) as writer:
+            writer.extend_rows(rows)
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+        with Dat_File_Reader(filename) as reader:
+            self.assertEqual(reader.read_row(50), rows[50])
+
+    def test_empty_writer(self):
+        with self.assertRaises(ValueError):
+            with Dat_File_Writer(io.BytesIO(), 10, dat_file_bytes(b"", 1, 1)):
+                pass
+
+    def test_exception_discards_partial_file(self):
+        filename = os.path.join(self._directory.name, "partial.dat")
+        with self.assertRaises(KeyError):
+            with Dat_File_Writer(filename, 10, dat_file_bytes(b"", 1, 1), write_index=True) as writer:
+                writer.append_empty_rows(3)
+                raise KeyError("interrupted")
+        self.assertFalse(os.path.exists(filename))
+        self.assertFalse(os.path.exists(row_index_filename(filename)))
+
+        stream = io.BytesIO(b"leading bytes")
+        stream.seek(0, io.SEEK_END)
+        with self.assertRaises(KeyError):
+            with Dat_File_Writer(stream, 10, dat_file_bytes(b"", 1, 1)):
+                raise KeyError("interrupted")
+        self.assertEqual(stream.getvalue(), b"leading bytes")
+
+    def test_streamed_knitout_to_dat(self):
+        knitout_file = load_test_resource("seed_jacquard.k")
+        dat_file = knitout_to_dat(knitout_file, os.path.join(self._directory.name, "seed_jacquard.dat"), write_index=True)
+        streamed_file = knitout_to_dat(knitout_file, os.path.join(self._directory.name, "seed_jacquard_streamed.dat"), write_index=True, stream=True)
+        for filename in [lambda name: name, row_index_filename]:
+            with open(filename(dat_file), 'rb') as f, open(filename(streamed_file), 'rb') as streamed:
+                self.assertEqual(f.read(), streamed.read())
@@ -0,0 +1,50 @@
+"""Test cases for the Dat_Raster class."""
+import unittest
+
+from knitout_to_dat_python.dat_file_structure.dat_raster import Dat_Raster
+from knitout_to_dat_python.dat_file_structure.dat_run_length_encoding import (
+    NUMPY_AVAILABLE,
+)
+from tests.test_dat_run_length_encoding import legacy_run_length_encode, random_raster
+
+
+class TestDatRaster(unittest.TestCase):
+    """Test class for the Dat_Raster."""
+
+    def build_rasters(self, width: int, rows: list[list[int]]) -> list[Dat_Raster]:
+        rasters = [Dat_Raster(width, initial_capacity=1, use_numpy=False)]
+        if NUMPY_AVAILABLE:
+            rasters.append(Dat_Raster(width, initial_capacity=1))
+        for raster in rasters:
+            raster.append_empty_rows(2)
+            raster.extend_rows(rows)
+            raster.append_empty_rows(3, color=7)
+        return rasters
+
+    def test_rows_and_encoding(self):
+        rows = random_raster(300, 50, [0, 1, 2, 51], seed=6)
+        expected_rows = [[0] * 300] * 2 + rows + [[7] * 300] * 3
+        for raster in self.build_rasters(300, rows):
+            self.assertEqual(raster.height, len(expected_rows))
+            self.assertEqual(list(raster), expected_rows)
+            self.assertEqual(raster.get_row(-1), expected_rows[-1])
+            self.assertEqual(raster.tobytes(), bytes(pixel for row in expected_rows for pixel in row))
+            self.assertEqual(raster.run_length_encode(), bytes(legacy_run_length_encode(expected_rows)))
+
+    def test_row_width_mismatch(self):
+        for raster in self.build_rasters(4, []):
+            with self.assertRaises(AssertionError):
+                raster.append_row([1, 2, 3])
+            with self.assertRaises(IndexError):
+                raster.get_row(raster.height)
+
+    def test_repeated_rows_are_interned(self):
+        rows = random_raster(300, 5, [0, 1, 2, 51], seed=7) * 20
+        unique_row_count = len({tuple(row) for row in rows + [[0] * 300, [7] * 300]})
+        for raster in self.build_rasters(300, rows):
+            self.assertEqual(raster.height, 105)
+            self.assertEqual(raster.unique_row_count, unique_row_count)
+            self.assertEqual(raster.run_length_encode(), bytes(legacy_run_length_encode(list(raster))))
+            raster.append_row([9] * 300)  # Rows added after encoding are encoded on the next call.
+            self.assertEqual(raster.unique_row_count, unique_row_count + 1)
+            self.assertEqual(raster.run_length_encode(), bytes(legacy_run_length_encode(list(raster))))
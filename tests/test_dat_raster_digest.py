@@ -0,0 +1,39 @@
+"""Test cases for the Dat_Raster_Digest class."""
+import unittest
+
+from knitout_to_dat_python.dat_file_structure.dat_raster_digest import (
+    Dat_Raster_Digest,
+)
+from knitout_to_dat_python.dat_file_structure.knitout_to_dat_converter import (
+    Knitout_to_Dat_Converter,
+)
+from tests.resources.load_test_resources import load_test_resource
+
+
+class TestDatRasterDigest(unittest.TestCase):
+    """Test class for the Dat_Raster_Digest."""
+
+    def test_digest_matches_in_memory_raster(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        converter.create_raster_from_knitout()
+        expected = Dat_Raster_Digest(converter.dat_width)
+        expected.extend_rows(converter._raster_data)
+        self.assertEqual(converter.raster_digest(), expected.hexdigest())
+        self.assertNotEqual(converter.raster_digest(pattern_vertical_buffer=6), expected.hexdigest())
+
+    def test_digest_depends_on_rows_and_width(self):
+        digest = Dat_Raster_Digest(3)
+        digest.append_empty_rows(2)
+        digest.append_row([1, 2, 3])
+        self.assertEqual(digest.height, 3)
+        same = Dat_Raster_Digest(3)
+        same.extend_rows([[0, 0, 0], [0, 0, 0], [1, 2, 3]])
+        self.assertEqual(digest.hexdigest(), same.hexdigest())
+        reordered = Dat_Raster_Digest(3)
+        reordered.extend_rows([[0, 0, 0], [1, 2, 3], [0, 0, 0]])
+        self.assertNotEqual(digest.hexdigest(), reordered.hexdigest())
+        wider = Dat_Raster_Digest(9)
+        wider.append_row([0, 0, 0, 0, 0, 0, 1, 2, 3])
+        self.assertNotEqual(digest.hexdigest(), wider.hexdigest())
+        with self.assertRaises(AssertionError):
+            digest.append_row([1, 2])
@@ -0,0 +1,156 @@
+"""Test cases for the run-length encoding and decoding of DAT raster data."""
+import random
+import unittest
+
+from knitout_to_dat_python.dat_file_structure.dat_run_length_encoding import (
+    NUMPY_AVAILABLE,
+    run_length_decode_rows,
+    run_length_decode_rows_numpy,
+    run_length_decode_rows_python,
+    run_length_encode_rows,
+    run_length_encode_rows_numpy,
+    run_length_encode_rows_parallel,
+    run_length_encode_rows_python,
+    run_length_row_index,
+)
+
+
+def legacy_run_length_encode(raster: list[list[int]]) -> list[int]:
+    """
+    The original per-pixel run-length encoder of the Knitout_to_Dat_Converter, used as a reference for parity.
+    Args:
+        raster: The rows of pixels to encode.
+
+    Returns:
+        The list of alternating color indices and run lengths.
+    """
+    index_length_pairs = []
+    width = len(raster[0])
+    for row in raster:
+        current_color = row[0]
+        run_length = 0
+        for x in range(width):
+            pixel = row[x]
+            if pixel == current_color and run_length < 255:
+                run_length += 1
+            else:
+                index_length_pairs.extend([current_color, run_length])
+                current_color = pixel
+                run_length = 1
+            if x == width - 1:
+                index_length_pairs.extend([current_color, run_length])
+    return index_length_pairs
+
+
+def legacy_run_length_decode(encoded: bytes, width: int) -> list[list[int]]:
+    """
+    The original per-pixel run-length decoder of the Dat_to_Knitout_Converter, used as a reference for parity.
+    Args:
+        encoded: The alternating color indices and run lengths to decode.
+        width: The width of the raster.
+
+    Returns:
+        The decoded rows of pixels, including any partial last row.
+    """
+    rows = []
+    current_row: list[int] = []
+    i = 0
+    while i + 1 < len(encoded):
+        for _ in range(encoded[i + 1]):
+            current_row.append(encoded[i])
+            if len(current_row) == width:
+                rows.append(current_row)
+                current_row = []
+        i += 2
+    if current_row:
+        rows.append(current_row)
+    return rows
+
+
+def random_raster(width: int, height: int, colors: list[int], seed: int = 0) -> list[list[int]]:
+    """
+    Args:
+        width: The width of the raster.
+        height: The height of the raster.
+        colors: The colors to pick pixels from.
+        seed: The random seed.
+
+    Returns:
+        A raster of random length runs of the given colors.
+    """
+    generator = random.Random(seed)
+    raster = []
+    for _ in range(height):
+        row: list[int] = []
+        while len(row) < width:
+            row.extend([generator.choice(colors)] * generator.randint(1, 600))
+        raster.append(row[:width])
+    return raster
+
+
+class TestDatRunLengthEncoding(unittest.TestCase):
+    """Test class for the DAT run-length encoders."""
+
+    def assert_encoders_match_legacy(self, raster: list[list[int]]) -> None:
+        expected = bytes(legacy_run_length_encode(raster))
+        self.assertEqual(run_length_encode_rows_python(raster), expected)
+        self.assertEqual(run_length_encode_rows(raster, len(raster[0])), expected)
+        if NUMPY_AVAILABLE:
+            self.assertEqual(run_length_encode_rows_numpy(raster, len(raster[0])), expected)
+            self.assertEqual(run_length_encode_rows_numpy([bytes(row) for row in raster], len(raster[0])), expected)
+
+    def test_random_rasters(self):
+        for seed, width in enumerate([1, 7, 254, 255, 256, 510, 511, 1200]):
+            self.assert_encoders_match_legacy(random_raster(width, 25, [0, 1, 13, 51, 52, 255], seed=seed))
+
+    def test_long_uniform_rows(self):
+        for width in [255, 256, 509, 510, 765, 1000]:
+            self.assert_encoders_match_legacy([[0] * width, [3] * width, [0] * (width - 1) + [1]])
+
+    def test_runs_do_not_cross_rows(self):
+        raster = [[7] * 10 for _ in range(30)]
+        self.assertEqual(run_length_encode_rows_python(raster), bytes([7, 10] * 30))
+        self.assert_encoders_match_legacy(raster)
+
+    def test_parallel_chunks(self):
+        raster = random_raster(300, 50, [0, 1, 13, 51, 52, 255], seed=9)
+        expected = bytes(legacy_run_length_encode(raster))
+        self.assertEqual(run_length_encode_rows_parallel(raster, 300, max_workers=2, chunk_rows=7, use_numpy=False), expected)
+        self.assertEqual(run_length_encode_rows_parallel(raster, 300, max_workers=2, chunk_rows=7), expected)
+        self.assertEqual(run_length_encode_rows_parallel(raster, 300, chunk_rows=50), expected)  # A single chunk is encoded without workers.
+
+    def test_out_of_range_pixels(self):
+        with self.assertRaises(ValueError):
+            run_length_encode_rows_python([[0, 256]])
+        if NUMPY_AVAILABLE:
+            with self.assertRaises(ValueError):
+                run_length_encode_rows_numpy([[0, 256]], 2)
+
+    def assert_decoders_match_legacy(self, encoded: bytes, width: int) -> None:
+        expected = legacy_run_length_decode(encoded, width)
+        self.assertEqual(run_length_decode_rows_python(encoded, width), expected)
+        self.assertEqual(run_length_decode_rows(encoded, width), expected)
+        if NUMPY_AVAILABLE:
+            self.assertEqual(run_length_decode_rows_numpy(encoded, width), expected)
+
+    def test_decode_round_trip(self):
+        for seed, width in enumerate([1, 7, 255, 256, 1200]):
+            raster = random_raster(width, 25, [0, 1, 13, 51, 52, 255], seed=seed)
+            encoded = run_length_encode_rows(raster, width)
+            self.assertEqual(run_length_decode_rows(encoded, width), raster)
+            self.assert_decoders_match_legacy(encoded, width)
+
+    def test_decode_malformed_data(self):
+        encoded = run_length_encode_rows([[1, 1, 2, 2], [3, 3, 3, 3]], 4)
+        self.assert_decoders_match_legacy(encoded + b"\x05", 4)  # Odd trailing byte is ignored.
+        self.assert_decoders_match_legacy(encoded[:-2], 4)  # Truncated data leaves a partial row.
+        self.assert_decoders_match_legacy(encoded + bytes([6, 2]), 4)  # Extra pixels form a partial row.
+        self.assert_decoders_match_legacy(encoded + bytes([6, 0]), 4)  # Empty runs are skipped.
+        self.assert_decoders_match_legacy(b"", 4)
+
+    def test_row_index(self):
+        encoded = bytes([1, 7, 2, 0, 3, 5, 4, 9, 5, 1])  # Runs that span rows and an empty run at a row boundary.
+        expected = ([0, 0, 4, 6, 6, 6], [0, 4, 1, 0, 4, 8])
+        self.assertEqual(run_length_row_index(encoded, 4, use_numpy=False), expected)
+        self.assertEqual(run_length_row_index(encoded, 4), expected)
+        self.assertEqual(run_length_row_index(encoded + b"\x03", 4), expected)  # Odd trailing byte is ignored.
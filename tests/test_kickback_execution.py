@@ -1,11 +1,24 @@
 """Test suite for adding kickbacks to a knitout execution - converted to unittest."""
+import random
 import unittest
 import warnings
+from unittest import mock
 
+from knitout_interpreter.knitout_execution import Knitout_Executer
 from knitout_interpreter.knitout_execution_structures.Carriage_Pass import Carriage_Pass
 from knitout_interpreter.knitout_language.Knitout_Parser import parse_knitout
+from knitout_interpreter.knitout_operations.carrier_instructions import (
+    Outhook_Instruction,
+    Releasehook_Instruction,
+)
 from knitout_interpreter.knitout_operations.kick_instruction import Kick_Instruction
 from virtual_knitting_machine.Knitting_Machine import Knitting_Machine
+from virtual_knitting_machine.knitting_machine_exceptions.racking_errors import (
+    Max_Rack_Exception,
+)
+from virtual_knitting_machine.Knitting_Machine_Specification import (
+    Knitting_Machine_Specification,
+)
 from virtual_knitting_machine.knitting_machine_warnings.Yarn_Carrier_System_Warning import (
     Long_Float_Warning,
 )
@@ -14,8 +27,50 @@ from virtual_knitting_machine.machine_components.carriage_system.Carriage_Pass_D
 )
 
 from knitout_to_dat_python.kickback_injection.kickback_execution import (
+    Hook_State,
     Knitout_Executer_With_Kickbacks,
 )
+from tests.resources.load_test_resources import load_test_resource
+
+
+def legacy_kicks_out_of_conflict_zone(carrier_system, leftmost_conflict: int, rightmost_conflict: int, exempt_carriers: set,
+                                      allow_leftward_movement: bool = True, allow_rightward_movement: bool = True) -> list[tuple[int, Carriage_Pass_Direction, list[int]]]:
+    """Reference implementation of the recursive kickback planner that scans the active carriers for every conflict zone.
+
+    Returns:
+        list[tuple[int, Carriage_Pass_Direction, list[int]]]: The position, direction, and carrier ids of each kick, in the order they are executed.
+    """
+    conflict_carriers = set(c for c in carrier_system.active_carriers
+                            if c not in exempt_carriers and c.position is not None and leftmost_conflict <= c.conflicting_needle_slot <= rightmost_conflict)
+    if len(conflict_carriers) == 0:
+        return []
+    exempt_carriers.update(conflict_carriers)
+    if allow_leftward_movement and allow_rightward_movement:
+        conflict_split = leftmost_conflict + (rightmost_conflict - leftmost_conflict) // 2
+        leftward_carriers = set(carrier for carrier in conflict_carriers if carrier.position <= conflict_split)
+        rightward_carriers = set(carrier for carrier in conflict_carriers if carrier.position > conflict_split)
+    elif allow_leftward_movement:
+        leftward_carriers, rightward_carriers = conflict_carriers, set()
+    else:
+        leftward_carriers, rightward_carriers = set(), conflict_carriers
+    leftward_groups: dict[int, set] = {}
+    for carrier in leftward_carriers:
+        leftward_groups.setdefault(carrier.position, set()).add(carrier)
+    rightward_groups: dict[int, set] = {}
+    for carrier in rightward_carriers:
+        rightward_groups.setdefault(carrier.position, set()).add(carrier)
+    kicks: list[tuple[int, Carriage_Pass_Direction, list[int]]] = []
+    if len(leftward_groups) > 0:
+        kicks = legacy_kicks_out_of_conflict_zone(carrier_system, leftmost_conflict - len(leftward_groups), leftmost_conflict, exempt_carriers, True, False)
+        kick_insert_index = len(kicks)
+        for push_group, position in enumerate(sorted(leftward_groups, reverse=True)):
+            kicks.insert(kick_insert_index, (leftmost_conflict - 1 - push_group, Carriage_Pass_Direction.Leftward, [int(c) for c in leftward_groups[position]]))
+    if len(rightward_groups) > 0:
+        kicks.extend(legacy_kicks_out_of_conflict_zone(carrier_system, rightmost_conflict, rightmost_conflict + len(rightward_groups), exempt_carriers, False, True))
+        kick_insert_index = len(kicks)
+        for push_group, position in enumerate(sorted(rightward_groups)):
+            kicks.insert(kick_insert_index, (rightmost_conflict + 1 + push_group, Carriage_Pass_Direction.Rightward, [int(c) for c in rightward_groups[position]]))
+    return kicks
 
 
 class TestKickbackExecution(unittest.TestCase):
@@ -404,3 +459,170 @@ class TestKickbackExecution(unittest.TestCase):
         executer = self.get_kickback_executer(k)
         kicks = self.get_kicks(executer)
         self.assertEqual(len(kicks), 2, f"Expected 2 kicks. Got {kicks}")
+
+    def test_hook_states_match_replayed_process(self) -> None:
+        """Test that the hook states recorded during execution match a replay of the process with its kickbacks on a new machine."""
+        for knitout_file in ["seed_jacquard.k", "jacquard_seed.k", "jacquard_merge.k"]:
+            executer = self.get_kickback_executer(load_test_resource(knitout_file), pattern_is_file=True)
+            replay_machine = Knitting_Machine(executer.knitting_machine.machine_specification)
+            hook_steps = []
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                for step, execution in enumerate(executer.process):
+                    if isinstance(execution, (Releasehook_Instruction, Outhook_Instruction)):
+                        hook_steps.append(step)
+                        expected_state = Hook_State(replay_machine.carrier_system[execution.carrier_id].position, replay_machine.carriage.last_direction,
+                                                    replay_machine.carrier_system.hook_input_direction)
+                        self.assertIsInstance(executer.hook_states[step], Hook_State)
+                        self.assertEqual(executer.hook_states[step], expected_state, f"Hook state of {execution} in {knitout_file}")
+                    execution.execute(replay_machine)
+            self.assertEqual(sorted(executer.hook_states), hook_steps)
+
+    def test_accepted_errors_match_knitout_executer(self) -> None:
+        """Test that comments, no-op lines, and instructions excluded by an accepted error are recorded in the process and executed instructions as they are by the Knitout_Executer."""
+        knitout = """;!knitout-2
+;;Carriers: 1 2 3 4 5 6 7 8 9 10
+inhook 1
+tuck - f4 1
+tuck - f2 1
+; a comment
+rack 10
+rack 0
+knit + f2 1
+knit + f4 1
+releasehook 1
+outhook 1
+"""
+        baseline = Knitout_Executer(parse_knitout(knitout, pattern_is_file=False), Knitting_Machine(), accepted_error_types=[Max_Rack_Exception])
+        executer = Knitout_Executer_With_Kickbacks(parse_knitout(knitout, pattern_is_file=False), Knitting_Machine(), accepted_error_types=[Max_Rack_Exception])
+        self.assertIn(";Excluded Max_Rack_Exception", "".join(str(line) for line in executer.process))
+        self.assertEqual([str(line) for line in executer.process], [str(line) for line in baseline.process])
+        header_length = len(baseline.executed_header.get_header_lines(baseline.knitout_version))  # The Knitout_Executer adds the header to the start of the executed instructions.
+        self.assertEqual([str(line) for line in executer.executed_instructions], [str(line) for line in baseline.executed_instructions[header_length:]])
+        self.assertEqual([str(executer.process[step]) for step in sorted(executer.hook_states)], ["releasehook 1\n", "outhook 1\n"])
+
+    def test_slot_range_matches_process(self) -> None:
+        """Test that the slot range tracked as passes are added matches the range of the carriage passes in the final process."""
+        for knitout_file in ["seed_jacquard.k", "jacquard_seed.k", "jacquard_merge.k"]:
+            executer = self.get_kickback_executer(load_test_resource(knitout_file), pattern_is_file=True)
+            pass_ranges = [cp.carriage_pass_range() for cp in executer.process if isinstance(cp, Carriage_Pass)]
+            self.assertEqual(executer.leftmost_slot, min(left for left, _right in pass_ranges), knitout_file)
+            self.assertEqual(executer.rightmost_slot, max(right for _left, right in pass_ranges), knitout_file)
+
+    def test_slot_range_on_wide_bed(self) -> None:
+        """Test that the slot range is tracked on needles beyond slot 1000 of a wide needle bed."""
+        knitout = """;!knitout-2
+;;Carriers: 1 2 3 4 5 6 7 8 9 10
+inhook 3
+tuck - f1210 3
+tuck - f1208 3
+knit + f1208 3
+knit + f1210 3
+releasehook 3
+outhook 3
+"""
+        executer = Knitout_Executer_With_Kickbacks(parse_knitout(knitout, pattern_is_file=False), Knitting_Machine(Knitting_Machine_Specification(needle_count=1600)))
+        self.assertEqual((executer.leftmost_slot, executer.rightmost_slot), (1208, 1210))
+        empty_executer = self.get_kickback_executer(";!knitout-2\n;;Carriers: 1 2 3 4 5 6 7 8 9 10\n")
+        self.assertIsNone(empty_executer.leftmost_slot)
+        self.assertIsNone(empty_executer.rightmost_slot)
+
+    def test_carrier_slot_index_matches_carriers(self) -> None:
+        """Test that the carrier slot index follows the carriers and answers conflict zone queries like a scan of the active carriers."""
+        for knitout_file in ["seed_jacquard.k", "jacquard_seed.k", "jacquard_merge.k"]:
+            with open(load_test_resource(knitout_file)) as knitout:  # Keep the carriers in so that they are still indexed at the end of the program.
+                knitout_lines = [line for line in knitout if not line.startswith(("outhook", "out "))]
+            executer = self.get_kickback_executer("".join(knitout_lines))
+            carrier_system = executer.kickback_machine.carrier_system
+            positioned_carriers = [c for c in carrier_system.active_carriers if c.position is not None]
+            self.assertGreater(len(positioned_carriers), 1, knitout_file)
+            self.assertEqual(executer._carrier_slot_index, sorted((c.conflicting_needle_slot, c.carrier_id) for c in positioned_carriers), knitout_file)
+            exempt_carriers = set(positioned_carriers[:1])
+            for leftmost_conflict, rightmost_conflict in [(-5, 0), (0, 10), (5, 40), (-10, 600)]:
+                expected_carriers = {c for c in positioned_carriers if c not in exempt_carriers and leftmost_conflict <= c.conflicting_needle_slot <= rightmost_conflict}
+                self.assertEqual(executer._carriers_in_conflict_zone(leftmost_conflict, rightmost_conflict, exempt_carriers), expected_carriers)
+
+    def test_kick_plans_are_reused(self) -> None:
+        """Test that a carrier layout shifted along the bed reuses its kick plan, shifted to the new conflict zone."""
+        Knitout_Executer_With_Kickbacks._kick_plan_cache.clear()
+        executer = self.get_kickback_executer(";!knitout-2\n;;Carriers: 1 2 3 4 5 6 7 8 9 10\n")
+        carrier_system = executer.kickback_machine.carrier_system
+        for carrier_id in [1, 2, 3]:
+            carrier_system[carrier_id].is_active = True
+        plans = []
+        for shift in [0, 40]:
+            for carrier_id, position in [(1, 12), (2, 12), (3, 18)]:
+                carrier_system.position_carrier(carrier_id, position + shift, Carriage_Pass_Direction.Leftward)
+            executer._index_carriers()
+            kicks = executer._kicks_out_of_conflict_zone(10 + shift, 20 + shift, exempt_carriers=set())
+            plans.append([(kick.position - shift, kick.direction, sorted(kick.carrier_set.carrier_ids)) for kick in kicks])
+        self.assertEqual(plans[0], [(9, Carriage_Pass_Direction.Leftward, [1, 2]), (21, Carriage_Pass_Direction.Rightward, [3])])
+        self.assertEqual(plans[1], plans[0])
+        self.assertEqual((executer.kick_plan_cache_hits, executer.kick_plan_cache_misses), (1, 1))
+
+    def test_kick_plan_cache_is_bounded(self) -> None:
+        """Test that repeated conversions take their kick plans from the cache and that the cache evicts its least recently used plans."""
+        Knitout_Executer_With_Kickbacks._kick_plan_cache.clear()
+        first_executer = self.get_kickback_executer(load_test_resource("jacquard_seed.k"), pattern_is_file=True)
+        self.assertGreater(first_executer.kick_plan_cache_misses, 0)
+        second_executer = self.get_kickback_executer(load_test_resource("jacquard_seed.k"), pattern_is_file=True)
+        self.assertEqual(second_executer.kick_plan_cache_misses, 0)
+        self.assertEqual(second_executer.kick_plan_cache_hits, first_executer.kick_plan_cache_hits + first_executer.kick_plan_cache_misses)
+        self.assertEqual([str(line) for line in second_executer.process], [str(line) for line in first_executer.process])
+        Knitout_Executer_With_Kickbacks._kick_plan_cache.clear()
+        with mock.patch.object(Knitout_Executer_With_Kickbacks, 'KICK_PLAN_CACHE_SIZE', 2):
+            bounded_executer = self.get_kickback_executer(load_test_resource("jacquard_seed.k"), pattern_is_file=True)
+        self.assertGreater(bounded_executer.kick_plan_cache_misses, 2)
+        self.assertEqual(len(Knitout_Executer_With_Kickbacks._kick_plan_cache), 2)
+        self.assertEqual([str(line) for line in bounded_executer.process], [str(line) for line in first_executer.process])
+
+    def test_colliding_carriers_keep_kick_order(self) -> None:
+        """Test that carriers whose ids collide in small sets are kicked in the order found by scanning the active carriers, not the order of their slots."""
+        k = r"""
+        inhook 2;
+        tuck - f12 2;
+        tuck - f10 2;
+        releasehook 2;
+        inhook 10;
+        tuck - f20 10;
+        tuck - f18 10;
+        tuck - f16 10;
+        tuck - f14 10;
+        releasehook 10;
+        knit + f14 2;
+        xfer f13 b13;
+        xfer f14 b14;
+        xfer f15 b15;
+        xfer f16 b16;
+        outhook 2;
+        outhook 10;
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            executer = self.get_kickback_executer(k)
+            kicks = self.get_kicks(executer)
+        self.assertEqual(len(kicks), 1, f"Expected exactly 1 kick to clear the transfers. Got {kicks}")
+        self.assertEqual(kicks[0].carrier_set.carrier_ids, [2, 10])
+
+    def test_kick_plans_match_legacy_planner(self) -> None:
+        """Test that planned kicks, including the order of their carriers, match the recursive planner that scanned the active carriers."""
+        Knitout_Executer_With_Kickbacks._kick_plan_cache.clear()
+        executer = self.get_kickback_executer(";!knitout-2\n;;Carriers: 1 2 3 4 5 6 7 8 9 10\n")
+        carrier_system = executer.kickback_machine.carrier_system
+        rng = random.Random(7)
+        for _trial in range(2000):
+            for carrier in carrier_system.carriers:
+                carrier.is_active = False
+            carrier_count = rng.randint(1, 4) if rng.random() < 0.7 else rng.randint(5, 10)  # Small sets are where carrier ids collide.
+            for carrier_id in rng.sample(range(1, 11), carrier_count):
+                carrier_system[carrier_id].is_active = True
+                carrier_system.position_carrier(carrier_id, rng.randint(8, 18), rng.choice([Carriage_Pass_Direction.Leftward, Carriage_Pass_Direction.Rightward]))
+            executer._index_carriers()
+            leftmost_conflict = rng.randint(8, 16)
+            rightmost_conflict = leftmost_conflict + rng.randint(0, 6)
+            exempt_carriers = set(carrier_system[carrier_id] for carrier_id in rng.sample(range(1, 11), rng.randint(0, 2)))
+            allowed_directions = rng.choice([(True, True), (True, True), (True, False), (False, True)])
+            kicks = executer._kicks_out_of_conflict_zone(leftmost_conflict, rightmost_conflict, set(exempt_carriers), *allowed_directions)
+            self.assertEqual([(kick.position, kick.direction, kick.carrier_set.carrier_ids) for kick in kicks],
+                             legacy_kicks_out_of_conflict_zone(carrier_system, leftmost_conflict, rightmost_conflict, set(exempt_carriers), *allowed_directions))
+        self.assertGreater(executer.kick_plan_cache_hits, 0)
@@ -0,0 +1,38 @@
+"""Test cases for the streaming knitout parsing stage."""
+import unittest
+
+import parglare.exceptions
+from knitout_interpreter.knitout_language.Knitout_Parser import parse_knitout
+from virtual_knitting_machine.Knitting_Machine import Knitting_Machine
+
+from knitout_to_dat_python.kickback_injection.kickback_execution import (
+    Knitout_Executer_With_Kickbacks,
+)
+from knitout_to_dat_python.knitout_streaming import iter_knitout_lines
+from tests.resources.load_test_resources import load_test_resource
+
+
+class TestKnitoutStreaming(unittest.TestCase):
+    """Test class for parsing knitout programs lazily."""
+
+    def test_lazy_parsing_matches_parse_knitout(self):
+        knitout_file = load_test_resource("seed_jacquard.k")
+        expected = [str(line) for line in parse_knitout(knitout_file, pattern_is_file=True)]
+        lines = iter_knitout_lines(knitout_file)
+        self.assertEqual(str(next(lines)), expected[0])
+        self.assertEqual([expected[0]] + [str(line) for line in lines], expected)
+        with open(knitout_file) as f:
+            knitout_program = f.read()
+        self.assertEqual([str(line) for line in iter_knitout_lines(knitout_program, knitout_in_file=False)], expected)
+
+    def test_parse_error_reports_program_line(self):
+        knitout_program = ";!knitout-2\n;;Carriers: 1 2 3 4 5 6 7 8 9 10\n\ninhook 3\nknit + f1 3\nknit sideways f2 3\n"
+        with self.assertRaises(parglare.exceptions.ParseError) as context:
+            list(iter_knitout_lines(knitout_program, knitout_in_file=False))
+        self.assertEqual(context.exception.__notes__, ["Knitout Parsing Error at line 6: knit sideways f2 3"])
+
+    def test_streamed_instructions_are_consumed_once(self):
+        knitout_file = load_test_resource("seed_jacquard.k")
+        executer = Knitout_Executer_With_Kickbacks(iter_knitout_lines(knitout_file), Knitting_Machine())
+        self.assertEqual(list(executer.instructions), [])
+        self.assertEqual(len(executer.executed_instructions), len(Knitout_Executer_With_Kickbacks(parse_knitout(knitout_file, pattern_is_file=True), Knitting_Machine()).executed_instructions))
@@ -0,0 +1,39 @@
+"""Test cases for converting between knitout and DAT content in memory."""
+import io
+import os
+import tempfile
+import unittest
+
+from knitout_to_dat_python.knitout_to_dat import (
+    dat_bytes_to_knitout,
+    dat_to_knitout,
+    knitout_to_dat,
+    knitout_to_dat_bytes,
+)
+from tests.resources.load_test_resources import load_test_resource
+
+
+class TestKnitoutToDatBytes(unittest.TestCase):
+    """Test class for the in-memory conversion functions."""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def test_in_memory_matches_files(self):
+        knitout_file = load_test_resource("seed_jacquard.k")
+        dat_file = knitout_to_dat(knitout_file, os.path.join(self._directory.name, "seed_jacquard.dat"))
+        with open(dat_file, 'rb') as f:
+            expected_dat = f.read()
+        with open(knitout_file) as f:
+            knitout_program = f.read()
+        dat_content = knitout_to_dat_bytes(knitout_program, knitout_in_file=False)
+        self.assertEqual(dat_content, expected_dat)
+        self.assertEqual(knitout_to_dat_bytes(knitout_file), expected_dat)
+
+        knitout_file = dat_to_knitout(dat_file, os.path.join(self._directory.name, "seed_jacquard_from_dat.k"))
+        with open(knitout_file) as f:
+            expected_knitout = f.read()
+        self.assertEqual(dat_bytes_to_knitout(dat_content), expected_knitout)
+        self.assertEqual(dat_bytes_to_knitout(memoryview(dat_content)), expected_knitout)
+        self.assertEqual(dat_bytes_to_knitout(io.BytesIO(dat_content)), expected_knitout)
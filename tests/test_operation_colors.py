@@ -0,0 +1,64 @@
+"""Test cases for the lookup tables of Operation_Color."""
+import unittest
+
+from knitout_interpreter.knitout_operations.kick_instruction import Kick_Instruction
+from knitout_interpreter.knitout_operations.needle_instructions import (
+    Knit_Instruction,
+    Miss_Instruction,
+    Split_Instruction,
+    Tuck_Instruction,
+    Xfer_Instruction,
+)
+from virtual_knitting_machine.machine_components.carriage_system.Carriage_Pass_Direction import (
+    Carriage_Pass_Direction,
+)
+
+from knitout_to_dat_python.dat_file_structure.dat_codes.operation_colors import (
+    OPERATION_COLOR_BY_CODE,
+    Operation_Color,
+)
+from knitout_to_dat_python.knitout_streaming import iter_knitout_lines
+
+FRONT_COLORS = [Operation_Color.KNIT_FRONT, Operation_Color.TUCK_FRONT, Operation_Color.MISS_FRONT, Operation_Color.SPLIT_TO_BACK, Operation_Color.XFER_TO_BACK]
+BACK_COLORS = [Operation_Color.KNIT_BACK, Operation_Color.TUCK_BACK, Operation_Color.MISS_BACK, Operation_Color.SPLIT_TO_FRONT, Operation_Color.XFER_TO_FRONT]
+ALL_NEEDLE_COLORS = {(Operation_Color.KNIT_FRONT, Operation_Color.KNIT_BACK): Operation_Color.KNIT_FRONT_KNIT_BACK,
+                     (Operation_Color.KNIT_FRONT, Operation_Color.TUCK_BACK): Operation_Color.KNIT_FRONT_TUCK_BACK,
+                     (Operation_Color.TUCK_FRONT, Operation_Color.KNIT_BACK): Operation_Color.TUCK_FRONT_KNIT_BACK,
+                     (Operation_Color.TUCK_FRONT, Operation_Color.TUCK_BACK): Operation_Color.TUCK_FRONT_TUCK_BACK}
+OPERATION_TYPES = {Operation_Color.SOFT_MISS: Kick_Instruction, Operation_Color.MISS_FRONT: Miss_Instruction, Operation_Color.MISS_BACK: Miss_Instruction,
+                   Operation_Color.TUCK_FRONT: Tuck_Instruction, Operation_Color.TUCK_BACK: Tuck_Instruction,
+                   Operation_Color.KNIT_FRONT: Knit_Instruction, Operation_Color.KNIT_BACK: Knit_Instruction,
+                   Operation_Color.XFER_TO_BACK: Xfer_Instruction, Operation_Color.XFER_TO_FRONT: Xfer_Instruction,
+                   Operation_Color.SPLIT_TO_BACK: Split_Instruction, Operation_Color.SPLIT_TO_FRONT: Split_Instruction}
+
+
+class TestOperationColors(unittest.TestCase):
+    """Test class for the Operation_Color metadata and all needle merging."""
+
+    def test_metadata_of_every_color(self):
+        for color in Operation_Color:
+            self.assertIs(OPERATION_COLOR_BY_CODE[int(color)], color)
+            self.assertEqual(color.is_front, color in FRONT_COLORS)
+            self.assertEqual(color.is_back, color in BACK_COLORS)
+            self.assertEqual(color.can_convert_to_all_needle, color in [c for pair in ALL_NEEDLE_COLORS for c in pair])
+            front_type, back_type = color.operation_types
+            if color in OPERATION_TYPES:
+                self.assertEqual((front_type, back_type), (OPERATION_TYPES[color], None))
+            else:
+                merged_front, merged_back = next(pair for pair, all_needle in ALL_NEEDLE_COLORS.items() if all_needle is color)
+                self.assertEqual((front_type, back_type), (OPERATION_TYPES[merged_front], OPERATION_TYPES[merged_back]))
+
+    def test_all_needle_merge_of_every_pair(self):
+        for color in Operation_Color:
+            for other_color in Operation_Color:
+                expected = ALL_NEEDLE_COLORS.get((color, other_color), ALL_NEEDLE_COLORS.get((other_color, color)))
+                self.assertIs(color.get_all_needle(other_color), expected)
+                self.assertEqual(color.can_be_opposite(other_color), expected is not None)
+
+    def test_colors_of_needle_instructions(self):
+        program = "knit + f3 1\nknit - b3 1\ntuck + f2 1\ntuck - b2 1\nmiss + f1 1\nmiss - b1 1\nsplit + f4 b4 1\nsplit - b4 f4 1\nxfer f5 b5\nxfer b5 f5\n"
+        expected_colors = [Operation_Color.KNIT_FRONT, Operation_Color.KNIT_BACK, Operation_Color.TUCK_FRONT, Operation_Color.TUCK_BACK,
+                           Operation_Color.MISS_FRONT, Operation_Color.MISS_BACK, Operation_Color.SPLIT_TO_BACK, Operation_Color.SPLIT_TO_FRONT,
+                           Operation_Color.XFER_TO_BACK, Operation_Color.XFER_TO_FRONT]
+        self.assertEqual([Operation_Color.get_operation_color(instruction) for instruction in iter_knitout_lines(program, knitout_in_file=False)], expected_colors)
+        self.assertIs(Operation_Color.get_operation_color(Kick_Instruction(3, Carriage_Pass_Direction.Leftward)), Operation_Color.SOFT_MISS)
@@ -0,0 +1,114 @@
+"""Test cases for rendering Raster_Carriage_Pass rows."""
+import unittest
+from unittest import mock
+
+from knitout_to_dat_python.dat_file_structure.dat_codes.dat_file_color_codes import (
+    OPTION_LINE_COUNT,
+    STOPPING_MARK,
+)
+from knitout_to_dat_python.dat_file_structure.dat_codes.option_lines import (
+    Left_Option_Lines,
+    Right_Option_Lines,
+)
+from knitout_to_dat_python.dat_file_structure.knitout_to_dat_converter import (
+    Knitout_to_Dat_Converter,
+)
+from knitout_to_dat_python.dat_file_structure.raster_carriage_passes.Raster_Carriage_Pass import (
+    Raster_Carriage_Pass,
+)
+from tests.resources.load_test_resources import load_test_resource
+
+
+def legacy_raster_row(cp: Raster_Carriage_Pass, pattern_width: int, option_space: int = 10, pattern_space: int = 4, offset_slots: int = 0) -> list[int]:
+    """Reference implementation of Raster_Carriage_Pass.get_raster_row that builds every section of the row pixel by pixel."""
+    left_options = []
+    for option_index in range(1, OPTION_LINE_COUNT + 1):
+        left_options.extend([option_index, 0])
+    for option_line, option_color in cp.left_option_line_settings.items():
+        position = (int(option_line) - 1) * 2
+        left_options[position if option_line is Left_Option_Lines.Direction_Specification else position + 1] = option_color
+    raster_row = [0] * option_space
+    raster_row.extend(reversed(left_options))
+
+    raster_row.extend([0] * pattern_space)
+    left_stop_mark, right_stop_mark = (min(cp.slot_colors) - 1, max(cp.slot_colors) + 1) if cp.slot_colors else (0, 0)
+    for slot_index in range(-1, pattern_width + 1):
+        if slot_index == left_stop_mark + offset_slots or slot_index == right_stop_mark + offset_slots:
+            raster_row.append(STOPPING_MARK)
+        elif (slot_index - offset_slots) in cp.slot_colors:
+            raster_row.append(int(cp.slot_colors[slot_index - offset_slots]))
+        else:
+            raster_row.append(0)
+    raster_row.extend([0] * pattern_space)
+
+    right_options = []
+    for option_index in range(1, OPTION_LINE_COUNT + 1):
+        right_options.extend([option_index, 0])
+    for option_line, option_color in cp.right_option_line_settings.items():
+        position = (int(option_line) - 1) * 2
+        right_options[position if option_line is Right_Option_Lines.Direction_Specification else position + 1] = option_color
+    raster_row.extend(right_options)
+    raster_row.extend([0] * option_space)
+    return raster_row
+
+
+class TestRasterCarriagePass(unittest.TestCase):
+    """Test class for rendering the raster rows of carriage passes."""
+
+    def test_raster_rows_match_reference(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        pattern_width = converter.knitting_width
+        carriage_passes = converter._get_startup_rasters() + converter._get_pattern_rasters() + converter._get_end_rasters()
+        for option_space, pattern_space in [(10, 4), (0, 0), (3, 7)]:
+            for offset_slots in [0, -1]:
+                for cp in carriage_passes:
+                    self.assertEqual(cp.get_raster_row(pattern_width, option_space, pattern_space, offset_slots),
+                                     legacy_raster_row(cp, pattern_width, option_space, pattern_space, offset_slots))
+
+    def test_hook_passes_on_slot_0_keep_pattern_offset(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("racked_hooks.k"))
+        pattern_rasters = converter._get_pattern_rasters()
+        self.assertEqual(converter.leftmost_slot, 1)
+        self.assertTrue(any(0 in cp.slot_colors for cp in pattern_rasters))
+        self.assertEqual(converter.pattern_slot_offset, 0)
+
+    def test_pattern_slot_offset_matches_slots_of_rasters(self):
+        for resource in ["racked_hooks.k", "seed_jacquard.k", "jacquard_seed.k", "jacquard_merge.k"]:
+            converter = Knitout_to_Dat_Converter(load_test_resource(resource))
+            slot_0 = min(converter.leftmost_slot, 0)
+            slot_shift = -slot_0
+            uses_slot_0 = any(slot_0 in cp.slot_colors for cp in converter._get_pattern_rasters())
+            self.assertEqual(converter.pattern_slot_offset, slot_shift if uses_slot_0 else slot_shift - 1, resource)
+
+    def test_pattern_slot_offset_is_known_before_rendering(self):
+        for rack, bed, first_needle, expected_offset in [(0, "f", 1, -1), (-1, "b", 0, 1), (1, "b", 0, 0)]:
+            knitout = ";!knitout-2\n;;Machine: SWG091N2\n;;Gauge: 15\n;;Carriers: 1 2 3 4 5 6 7 8 9 10\n;;Position: Left\n"
+            knitout += f"rack {rack}\ninhook 3\n"
+            knitout += "".join(f"knit - {bed}{n} 3\n" for n in range(6, first_needle - 1, -1))
+            knitout += "releasehook 3\n"
+            knitout += "".join(f"knit + {bed}{n} 3\n" for n in range(first_needle, 7))
+            knitout += "".join(f"knit - {bed}{n} 3\n" for n in range(6, first_needle - 1, -1))
+            knitout += "outhook 3\n"
+            converter = Knitout_to_Dat_Converter(knitout, knitout_in_file=False)
+            with mock.patch.object(converter, "_iter_pattern_rasters", wraps=converter._iter_pattern_rasters) as iter_pattern_rasters:
+                self.assertEqual(converter.pattern_slot_offset, expected_offset)
+                iter_pattern_rasters.assert_not_called()
+                converter.create_raster_from_knitout()
+            iter_pattern_rasters.assert_called_once()
+
+    def test_rows_do_not_share_the_template(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        cp = converter._get_startup_rasters()[0]
+        row = cp.get_raster_row(converter.knitting_width)
+        row[0] = 99
+        self.assertEqual(cp.get_raster_row(converter.knitting_width), legacy_raster_row(cp, converter.knitting_width))
+
+    def test_slots_outside_pattern_and_empty_passes(self):
+        converter = Knitout_to_Dat_Converter(load_test_resource("seed_jacquard.k"))
+        cp = converter._get_startup_rasters()[0]
+        pattern_width = 12
+        operation_color = next(iter(cp.slot_colors.values()))
+        for slot_colors in [{}, {0: operation_color}, {-3: operation_color, 5: operation_color, 20: operation_color}, {s: operation_color for s in range(-1, 13)}]:
+            cp.slot_colors = slot_colors
+            for offset_slots in [0, -1, 2]:
+                self.assertEqual(cp.get_raster_row(pattern_width, offset_slots=offset_slots), legacy_raster_row(cp, pattern_width, offset_slots=offset_slots))